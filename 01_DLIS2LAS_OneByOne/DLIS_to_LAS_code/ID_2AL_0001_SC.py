@@ -144,6 +144,7 @@ def load_and_combine_dlis(dlis_path, output_path):
     # 3. Determina intervalo de profundidade global com conversão de unidades
     global_min = float('inf')
     global_max = float('-inf')
+    spacing_volume = {}
     
     # Primeiro passada: encontra os valores mínimos/máximos já convertidos para metros
     for lf in all_files:
@@ -160,9 +161,19 @@ def load_and_combine_dlis(dlis_path, output_path):
                 
                 global_min = min(global_min, frame_min)
                 global_max = max(global_max, frame_max)
+                
+                # Espaçamento nativo do frame (em metros), somando o volume de dados de cada um
+                if frame.spacing:
+                    spacing = abs(frame.spacing)
+                    if depth_channel.units and 'ft' in depth_channel.units.lower():
+                        spacing = spacing * 0.3048  # 0.5 ft = 0.1524 m
+                    spacing = round(spacing, 6)
+                    volume = abs(frame_max - frame_min) * len(frame.channels)
+                    spacing_volume[spacing] = spacing_volume.get(spacing, 0) + volume
     
-    # Define o espaçamento baseado nas unidades predominantes (0.2m ou 0.5ft convertido)
-    step = 0.2  # AJUSTAR PARA O SEU CASO!!!!!!!!
+    # Define o espaçamento pelo frame.spacing que concentra a maior parte dos dados
+    # (frames curtos de calibração não ditam o passo); 0.2 m se nenhum frame informar
+    step = max(spacing_volume, key=spacing_volume.get) if spacing_volume else 0.2
     depth_global = np.arange(global_min, global_max + step, step)
     las.append_curve('DEPT', depth_global, unit='m', descr='Depth')
     
@@ -191,20 +202,26 @@ def load_and_combine_dlis(dlis_path, output_path):
             if not depth_channel:
                 continue
                 
+            # Lê todas as curvas do frame de uma só vez (array estruturado). O primeiro
+            # campo é FRAMENO e os demais seguem a ordem de frame.channels, então cada
+            # canal é só uma visão (sem cópia) desse array
+            curves = frame.curves(strict=False)
+            channel_fields = curves.dtype.names[1:]
+            
             # Verifica se precisa converter de pés para metros
             convert_to_meters = depth_channel.units and 'ft' in depth_channel.units.lower()
-            depth_values = depth_channel.curves()
+            depth_values = curves[channel_fields[frame.channels.index(depth_channel)]]
             if convert_to_meters:
                 depth_values = depth_values * 0.3048  # Converte valores de profundidade
             
-            for channel in frame.channels:
+            for channel, field in zip(frame.channels, channel_fields):
                 channel_name = channel.name
                 # Aplica mesmo filtro que na coleta
                 if (not channel_name.startswith('INDEX') and 
                     not channel_name == 'DUMM' and 
                     not channel_name.startswith('DUMM_')):
                     
-                    channel_data = channel.curves()
+                    channel_data = curves[field]
                     # Interpola para o grid global de profundidade (já em metros)
                     all_channels[channel_name] = np.interp(
                         depth_global,
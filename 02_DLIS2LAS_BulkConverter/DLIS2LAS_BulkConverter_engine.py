@@ -0,0 +1,962 @@
+# -*- coding: utf-8 -*-
+"""
+Motor único de conversão em lote DLIS → LAS para toda a bacia.
+
+Varre de uma só vez todas as subpastas de estado em DLIS_input/ (PR, SP, SC,
+MS, RS, ...), aplica a regra de nomenclatura de cada estado registrada em
+DLIS2LAS_formatters e envia todos os arquivos para uma única fila de trabalho
+ordenada por tamanho (maiores primeiro), evitando que um arquivo grande fique
+por último com o restante dos processos ocioso.
+
+Cada arquivo é convertido em um processo isolado, com limite de tempo e de
+memória (DLIS2LAS_isolation): arquivos que travam ou derrubam o processo vão
+para a quarentena e o lote continua.
+
+Os scripts DLIS2LAS_BulkConverter_code_<UF>.py continuam funcionando e
+delegam para este motor, restritos ao seu estado.
+"""
+
+import os
+from dlisio import dlis
+import numpy as np
+
+from DLIS2LAS_arrays import (channel_shape, close_array_sidecars, existing_sidecars, is_array_channel,
+                             open_array_sidecars, sidecar_params, sidecar_path)
+from DLIS2LAS_cache import (config_hash, file_fingerprint, cache_key, is_cached_by_stat, load_manifest,
+                            record_conversion, save_manifest, valid_keys_by_output)
+from DLIS2LAS_formatters import get_formatter
+from DLIS2LAS_isolation import (load_quarantine, quarantine_file, quarantine_reason, run_isolated,
+                                save_quarantine)
+from DLIS2LAS_laswriter import write_las, write_las_header, write_las_rows
+from DLIS2LAS_parallel import SharedArrays, run_frame_workers
+from DLIS2LAS_parquet import open_parquet_writer, parquet_schema, write_parquet, write_parquet_rows
+from DLIS2LAS_prefetch import ScratchPrefetcher
+from DLIS2LAS_profiling import NULL_PROFILER, StageProfiler, make_profiler
+from DLIS2LAS_resampling import (DLIS_ABSENT_VALUE, frame_resampler, mask_absent, order_frames, splice_ranked,
+                                  splice_window, unowned_rank)
+from DLIS2LAS_streaming import frame_rows_for, read_frame_column, read_frame_rows
+from DLIS2LAS_units import apply_factors, column_factors, depth_scale, output_unit
+
+# =============================================================================
+# CONFIGURAÇÕES GLOBAIS
+# =============================================================================
+
+BASE_PATH = "C:/Users/Theresa/OneDrive/PESQUISA/LabMeg_Exxon/PMP_BC_WELL_LOGGING/02_DLIS2LAS_BulkConverter/"
+DLIS_ROOT_DIR = os.path.join(BASE_PATH, "DLIS_input")
+LAS_OUTPUT_DIR = os.path.join(BASE_PATH, "LAS_output")
+
+# Número de processos paralelos na conversão em lote (1 = sequencial, None = todos os núcleos)
+N_WORKERS = os.cpu_count()
+
+# Processos por arquivo que decodificam e reamostram os frames (logical files,
+# passadas) de um mesmo DLIS ao mesmo tempo, emendando em memória compartilhada.
+# Só no modo em memória (CHUNK_ROWS = None). 1 = um frame por vez; None = todos
+# os núcleos. Cada worker abre (indexa) o DLIS de novo, então compensa em
+# arquivos com muitos frames grandes. O lote pode chegar a N_WORKERS x
+# FRAME_WORKERS processos: reduza N_WORKERS na mesma proporção
+FRAME_WORKERS = 1
+
+# Prioridade quando passadas (logical files/frames) cobrem a mesma profundidade:
+# 'first' (primeira lida), 'last' (última lida) ou 'longest' (maior extensão)
+SPLICE_PRIORITY = 'first'
+
+# Modo streaming: número de linhas do grid de profundidade processadas por bloco.
+# None converte o arquivo inteiro em memória; um inteiro limita o pico de memória
+# a aproximadamente CHUNK_ROWS x número de canais (ex.: 5000 para arquivos muito grandes)
+CHUNK_ROWS = None
+
+# Formato de saída: 'las' (texto, etapa 03_LAS2IntegratedDF) ou 'parquet'
+# (colunar e tipado, sem formatação de texto; requer pyarrow)
+OUTPUT_FORMAT = 'las'
+OUTPUT_EXTENSIONS = {'las': '.las', 'parquet': '.parquet'}
+
+# Passo do grid de profundidade de saída (m). None usa, em cada poço, o
+# espaçamento nativo (frame.spacing) que concentra a maior parte dos dados;
+# frames mais finos que o passo são reduzidos por blocos
+DEPTH_STEP = None
+DEFAULT_DEPTH_STEP = 0.2  # quando nenhum frame informa o espaçamento
+
+# Redução por blocos dos frames mais finos que o passo: 'mean', 'median' ou
+# None (sempre interpolação linear ponto a ponto)
+DOWNSAMPLE_STATISTIC = 'mean'
+
+# Maior lacuna de profundidade (m) preenchida por interpolação; None preenche todas
+MAX_GAP = 1.0
+
+# Parâmetros do logical file que declaram o valor ausente (além do -999.25)
+ABSENT_VALUE_PARAMETERS = ('ABSENT_VALUE', 'ABSV', 'NULL')
+
+# Modo compacto: curvas em float32 nos buffers da conversão, nos .npy e no
+# Parquet, com a profundidade sempre em float64. Os perfis têm cerca de 4
+# algarismos significativos, então float32 (~7) não perde informação e a
+# memória e o disco das curvas caem pela metade
+COMPACT_FLOAT32 = False
+
+# Limites de cada conversão isolada: tempo em segundos e memória em MB (o de
+# memória só vale em Linux/macOS). None desativa o limite. Arquivos que estouram
+# os limites ou derrubam o processo vão para a quarentena na pasta de saída
+FILE_TIMEOUT = 3600
+MEMORY_LIMIT_MB = 16384
+
+# Tenta de novo arquivos em quarentena mesmo sem terem mudado
+RETRY_QUARANTINED = False
+
+# Dry run: em vez de converter, só lê os cabeçalhos dos frames e estima grid,
+# tamanho da saída, pico de memória e nome de cada LAS (ver DLIS2LAS_planner)
+DRY_RUN = False
+
+# Leitura antecipada: enquanto os arquivos atuais são convertidos, os próximos
+# PREFETCH_DEPTH arquivos da fila são copiados em segundo plano para uma pasta
+# local (PREFETCH_DIR; None = pasta temporária do sistema), de onde a conversão
+# lê. Evita que cada conversão espere o drive de rede/OneDrive. 0 desativa
+PREFETCH_DEPTH = 2
+PREFETCH_DIR = None
+
+# Perfil por etapa (tempo, bytes lidos, amostras, pico de memória) de cada
+# arquivo, anexado como linhas JSON a este arquivo. None desativa
+# (ex.: os.path.join(LAS_OUTPUT_DIR, "dlis2las_profile.jsonl"))
+PROFILE_PATH = None
+
+# Mede também o pico de memória por etapa (tracemalloc); deixa a gravação do
+# LAS mais lenta, então compare tempos só entre execuções com a mesma opção
+PROFILE_MEMORY = True
+
+# Cache de conversão: pula arquivos DLIS cujo conteúdo e configuração do
+# conversor não mudaram desde a última conversão (manifesto na pasta de saída)
+USE_CACHE = True
+
+# Código do conversor incluído no hash da configuração: alterar filtros de
+# canais, regras de unidade ou a gravação invalida o cache automaticamente
+CONVERTER_SOURCES = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+    for name in ('DLIS2LAS_BulkConverter_engine.py', 'DLIS2LAS_arrays.py', 'DLIS2LAS_formatters.py',
+                 'DLIS2LAS_laswriter.py', 'DLIS2LAS_parquet.py', 'DLIS2LAS_resampling.py',
+                 'DLIS2LAS_streaming.py', 'DLIS2LAS_units.py')
+]
+
+# =============================================================================
+# DESCOBERTA E AGENDAMENTO DOS ARQUIVOS
+# =============================================================================
+
+def discover_dlis_files(dlis_root, states=None):
+    """
+    Varre as subpastas de estado de dlis_root e monta a fila de conversão.
+    
+    Parâmetros:
+        dlis_root (str): Pasta com uma subpasta por estado (DLIS_input/)
+        states (list): Siglas a processar; None processa todas as subpastas
+    
+    Retorno:
+        list: Um dicionário por arquivo ('state', 'dlis_file', 'dlis_path',
+            'size'), ordenado do maior para o menor arquivo
+    """
+    wanted = {s.upper() for s in states} if states else None
+    jobs = []
+    
+    for state_entry in os.scandir(dlis_root):
+        if not state_entry.is_dir():
+            continue
+        state = state_entry.name.upper()
+        if wanted is not None and state not in wanted:
+            continue
+        if get_formatter(state) is None:
+            print(f"⚠️ Sem regra de nomenclatura para o estado {state} - pasta ignorada")
+            continue
+        
+        for entry in os.scandir(state_entry.path):
+            if entry.is_file() and entry.name.endswith(".dlis"):
+                jobs.append({
+                    'state': state,
+                    'dlis_file': os.path.splitext(entry.name)[0],
+                    'dlis_path': entry.path,
+                    'size': entry.stat().st_size,
+                })
+    
+    # Maiores primeiro: o pool consome a fila na ordem de submissão
+    jobs.sort(key=lambda job: job['size'], reverse=True)
+    return jobs
+
+# =============================================================================
+# PROCESSAMENTO EM LOTE
+# =============================================================================
+
+def output_path_for(job, las_output_dir, output_format):
+    """Caminho de saída de um arquivo da fila, com a regra de nomenclatura do estado"""
+    las_file_name = get_formatter(job['state'])(job['dlis_file'])
+    return os.path.join(las_output_dir, las_file_name + OUTPUT_EXTENSIONS[output_format])
+
+def converter_config(output_format):
+    """Parâmetros do conversor que alteram a saída (entram no hash do cache)"""
+    return {
+        'depth_step': DEPTH_STEP,
+        'default_depth_step': DEFAULT_DEPTH_STEP,
+        'downsample_statistic': DOWNSAMPLE_STATISTIC,
+        'max_gap': MAX_GAP,
+        'splice_priority': SPLICE_PRIORITY,
+        'compact_float32': COMPACT_FLOAT32,
+        'output_format': output_format,
+    }
+
+def job_result(job, **fields):
+    """Dicionário de resultado de um arquivo da fila, usado no resumo final"""
+    result = {
+        'state': job['state'],
+        'dlis_file': job['dlis_file'],
+        'dlis_path': job['dlis_path'],
+        'las_path': None,
+        'error': None,
+        'cached': False,
+        'quarantined': False,
+        'source': None,
+        'sidecars': None,
+    }
+    result.update(fields)
+    return result
+
+def convert_dlis_file(job, las_output_dir=LAS_OUTPUT_DIR, output_format=OUTPUT_FORMAT, config_key=None,
+                      profile_path=PROFILE_PATH):
+    """
+    Converte um único arquivo DLIS da fila.
+    
+    Executada dentro do processo isolado de cada arquivo: exceções Python viram
+    o campo 'error' do resultado. Só MemoryError é propagada, para que o
+    processo isolado a trate como estouro do limite de memória (quarentena).
+    
+    Com config_key (cache ativo) o hash do DLIS é calculado aqui, no processo
+    isolado, e a conversão é pulada se a chave já estiver em job['cache_keys'].
+    Se o prefetch já copiou o arquivo para a pasta local, a leitura é feita
+    da cópia (job['read_path']).
+    """
+    dlis_file_name = job['dlis_file']
+    read_path = job.get('read_path', job['dlis_path'])
+    result = job_result(job)
+    
+    try:
+        print(f"\n{'='*60}")
+        print(f"Processando arquivo: {dlis_file_name} ({job['state']})")
+        print(f"{'='*60}")
+        
+        # Monta caminho de saída com a regra do estado
+        las_path = output_path_for(job, las_output_dir, output_format)
+        result['las_path'] = las_path
+        
+        # Conteúdo idêntico ao já convertido (ex.: arquivo copiado de novo): nada a fazer
+        if config_key is not None:
+            result['source'] = file_fingerprint(job['dlis_path'], read_path)
+            if cache_key(result['source']['hash'], config_key) in job.get('cache_keys', ()):
+                print(f"♻️ Conteúdo inalterado, saída mantida: {las_path}")
+                result['cached'] = True
+                return result
+        
+        # Processa o arquivo DLIS individual
+        result['sidecars'] = process_single_dlis(read_path, las_path, output_format=output_format,
+                                                 profile_path=profile_path)
+        
+    except MemoryError:
+        raise
+    except Exception as e:
+        print(f"\n⚠️ Erro ao processar {dlis_file_name}: {e}")
+        result['error'] = str(e)
+    
+    return result
+
+def print_summary(results):
+    """Exibe o resumo final da conversão em lote, por estado"""
+    errors = [r for r in results if r['error'] is not None]
+    
+    print(f"\n{'='*60}")
+    print("RESUMO DA CONVERSÃO")
+    print(f"{'='*60}")
+    for state in sorted({r['state'] for r in results}):
+        state_results = [r for r in results if r['state'] == state]
+        state_errors = sum(1 for r in state_results if r['error'] is not None)
+        print(f"• {state}: {len(state_results) - state_errors}/{len(state_results)} convertidos")
+    print(f"• Convertidos com sucesso: {len(results) - len(errors)}")
+    print(f"• Reaproveitados do cache: {sum(1 for r in results if r['cached'])}")
+    print(f"• Com erro: {len(errors)}")
+    for r in errors:
+        print(f"  - {r['dlis_file']}: {r['error']}")
+    
+    quarantined = [r for r in results if r['quarantined']]
+    if quarantined:
+        print(f"• Em quarentena: {len(quarantined)}")
+        for r in quarantined:
+            print(f"  - {r['dlis_path']}")
+
+def process_all_dlis_files(dlis_root=DLIS_ROOT_DIR, las_output_dir=LAS_OUTPUT_DIR,
+                           states=None, n_workers=N_WORKERS, output_format=OUTPUT_FORMAT, use_cache=USE_CACHE,
+                           profile_path=PROFILE_PATH):
+    """
+    Processa todos os arquivos DLIS de todos os estados em uma única fila
+    
+    Parâmetros:
+        dlis_root (str): Pasta com uma subpasta por estado
+        las_output_dir (str): Pasta de saída dos arquivos LAS
+        states (list): Siglas a processar; None processa todas as subpastas
+        n_workers (int): Número de processos paralelos. Com 1 os arquivos são
+            convertidos em sequência (cada um no seu processo isolado); None
+            usa todos os núcleos.
+        output_format (str): 'las' ou 'parquet' (ver OUTPUT_FORMAT)
+        use_cache (bool): Pula arquivos já convertidos com o mesmo conteúdo e a
+            mesma configuração (ver USE_CACHE)
+        profile_path (str): Arquivo .jsonl que recebe o perfil por etapa de
+            cada arquivo convertido (ver PROFILE_PATH)
+    
+    Retorno:
+        list: Um dicionário por arquivo com 'state', 'dlis_file', 'las_path',
+            'error', 'cached' e 'quarantined' (ver job_result)
+    """
+    # Cria diretório de saída se não existir
+    os.makedirs(las_output_dir, exist_ok=True)
+    
+    # Fila única com os arquivos de todos os estados, maiores primeiro
+    jobs = discover_dlis_files(dlis_root, states)
+    
+    print(f"\nEncontrados {len(jobs)} arquivos DLIS para processar:")
+    for i, job in enumerate(jobs, 1):
+        print(f"{i}. [{job['state']}] {job['dlis_file']} ({job['size'] / 1e6:.1f} MB)")
+    
+    results = []
+    
+    # Arquivos em quarentena (inalterados desde a falha) não voltam para a fila
+    quarantine = load_quarantine(las_output_dir)
+    if not RETRY_QUARANTINED:
+        pending = []
+        for job in jobs:
+            reason = quarantine_reason(quarantine, job)
+            if reason is None:
+                pending.append(job)
+            else:
+                results.append(job_result(job, error=f"em quarentena: {reason}", quarantined=True))
+        if len(pending) < len(jobs):
+            print(f"\n☣️ {len(jobs) - len(pending)} arquivos em quarentena ignorados")
+        jobs = pending
+    
+    config_key = None
+    if use_cache:
+        # Pré-checagem por tamanho/mtime: arquivos inalterados nem entram na fila
+        manifest = load_manifest(las_output_dir)
+        config_key = config_hash(converter_config(output_format), CONVERTER_SOURCES)
+        output_keys = valid_keys_by_output(manifest)
+        
+        pending = []
+        for job in jobs:
+            try:
+                las_path = output_path_for(job, las_output_dir, output_format)
+            except Exception:
+                # Nome fora da regra do estado: o erro é reportado na conversão
+                pending.append(job)
+                continue
+            job['cache_keys'] = output_keys.get(las_path, [])
+            if is_cached_by_stat(manifest, job['dlis_path'], config_key, job['cache_keys']):
+                results.append(job_result(job, las_path=las_path, cached=True))
+            else:
+                pending.append(job)
+        
+        print(f"\n♻️ {len(jobs) - len(pending)} arquivos inalterados desde a última conversão")
+        jobs = pending
+    
+    try:
+        results += run_jobs(jobs, las_output_dir, output_format, config_key, n_workers, quarantine, profile_path)
+    finally:
+        save_quarantine(las_output_dir, quarantine)
+        if use_cache:
+            for r in results:
+                if r['error'] is None and r['source'] is not None:
+                    record_conversion(manifest, r['dlis_path'], r['source'], config_key, r['las_path'],
+                                      r['sidecars'])
+            save_manifest(las_output_dir, manifest)
+    
+    print_summary(results)
+    return results
+
+def run_jobs(jobs, las_output_dir, output_format, config_key, n_workers, quarantine, profile_path=None):
+    """
+    Converte os arquivos da fila, cada um em um processo isolado
+    
+    Arquivos cujo processo estoura o tempo ou a memória, ou morre sem
+    responder (falha em código nativo), entram na quarentena e têm a saída
+    parcial removida (incluindo os .npy dos canais multidimensionais); os demais seguem normalmente. Com PREFETCH_DEPTH os
+    próximos arquivos da fila são copiados para a pasta local em segundo plano.
+    """
+    results = []
+    args = (las_output_dir, output_format, config_key, profile_path)
+    prefetcher = ScratchPrefetcher(jobs, PREFETCH_DEPTH, PREFETCH_DIR) if PREFETCH_DEPTH and jobs else None
+    try:
+        for job, result, failure in run_isolated(convert_dlis_file, prefetcher or jobs, args, n_workers,
+                                                 FILE_TIMEOUT, MEMORY_LIMIT_MB):
+            if prefetcher is not None:
+                prefetcher.release(job)
+            if failure is not None:
+                print(f"\n☣️ {job['dlis_file']} em quarentena: {failure}")
+                quarantine_file(quarantine, job, failure)
+                las_path = output_path_for(job, las_output_dir, output_format)
+                for path in [las_path] + existing_sidecars(las_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+                result = job_result(job, las_path=las_path, error=failure, quarantined=True)
+            elif result['error'] is None:
+                quarantine.pop(job['dlis_path'], None)
+            results.append(result)
+    finally:
+        if prefetcher is not None:
+            prefetcher.close()
+    return results
+
+# =============================================================================
+# FUNÇÕES AUXILIARES DA CONVERSÃO
+# =============================================================================
+
+def get_depth_channel(frame):
+    """Retorna o canal de índice (profundidade) do frame ou None"""
+    return next((ch for ch in frame.channels if ch.name == frame.index), None)
+
+def is_data_channel(channel_name):
+    """Canais exportados para o LAS (exclui DUMM e canais de índice)"""
+    return (not channel_name.startswith('INDEX')) and (not channel_name == 'DUMM')
+
+def absent_values(frame):
+    """
+    Valores ausentes dos canais do frame: -999.25 e os declarados nos
+    parâmetros do logical file (ver ABSENT_VALUE_PARAMETERS)
+    """
+    values = {DLIS_ABSENT_VALUE}
+    for parameter in frame.logicalfile.parameters:
+        if parameter.name.upper() in ABSENT_VALUE_PARAMETERS:
+            for value in np.ravel(parameter.values):
+                if isinstance(value, (int, float, np.number)):
+                    values.add(float(value))
+    return tuple(values)
+
+def frame_spacing(frame, depth_channel, depth_values=None):
+    """
+    Espaçamento nativo do frame em metros.
+    
+    Usa frame.spacing do cabeçalho; se ausente e depth_values (já em metros)
+    for informado, usa a mediana da distância entre amostras.
+    """
+    if frame.spacing:
+        return abs(float(frame.spacing)) * depth_scale(depth_channel)
+    if depth_values is not None and len(depth_values) > 1:
+        return float(np.median(np.abs(np.diff(depth_values))))
+    return None
+
+def native_step(all_files):
+    """
+    Passo de saída do poço a partir do espaçamento nativo dos frames (só cabeçalhos)
+    
+    Prevalece o espaçamento com maior volume de dados (extensão do frame x
+    número de canais): frames curtos de calibração não ditam o passo, e frames
+    mais finos que ele (ex.: imagens) são reduzidos por blocos.
+    """
+    volume = {}
+    for lf in all_files:
+        for frame in lf.frames:
+            depth_channel = get_depth_channel(frame)
+            spacing = frame_spacing(frame, depth_channel) if depth_channel else None
+            if spacing:
+                # Arredonda para eliminar ruído da conversão pés -> metros (0.5 ft = 0.1524 m)
+                spacing = round(spacing, 6)
+                extent = abs(frame.index_max - frame.index_min) if frame.index_max is not None else 0
+                extent *= depth_scale(depth_channel)
+                volume[spacing] = volume.get(spacing, 0) + extent * len(frame.channels)
+    return max(volume, key=volume.get) if volume else DEFAULT_DEPTH_STEP
+
+def well_header(origin):
+    """Metadados básicos do poço para a seção ~Well do LAS"""
+    return {
+        'WELL': origin.well_name,
+        'FLD': origin.field_name or '',
+        'COMP': origin.company or '',
+    }
+
+def depth_range(all_files):
+    """Intervalo de profundidade global (em metros) lido só dos cabeçalhos dos frames"""
+    global_min = float('inf')
+    global_max = float('-inf')
+    
+    for lf in all_files:
+        for frame in lf.frames:
+            depth_channel = get_depth_channel(frame)
+            if depth_channel:
+                scale = depth_scale(depth_channel)
+                frame_min = frame.index_min * scale
+                frame_max = frame.index_max * scale
+                
+                global_min = min(global_min, frame_min)
+                global_max = max(global_max, frame_max)
+    
+    return global_min, global_max
+
+def collect_channel_units(all_files):
+    """
+    Canais escalares únicos a exportar, na ordem de leitura, com a unidade de saída
+    
+    A unidade de saída é a alvo do canal padronizado (DLIS2LAS_units.TARGET_UNITS)
+    ou, sem alvo, a da primeira ocorrência do canal.
+    """
+    channel_units = {}
+    for lf in all_files:
+        for frame in lf.frames:
+            for channel in frame.channels:
+                if is_data_channel(channel.name) and not is_array_channel(channel) \
+                        and channel.name not in channel_units:
+                    channel_units[channel.name] = output_unit(channel.name, channel.units)
+    return channel_units
+
+def collect_array_channels(all_files):
+    """
+    Canais multidimensionais únicos (formas de onda, imagens), exportados para .npy
+    
+    Retorno:
+        dict: Canal -> {'unit': unidade, 'shape': forma de cada amostra}, com a
+            forma da primeira ocorrência do canal
+    """
+    array_channels = {}
+    for lf in all_files:
+        for frame in lf.frames:
+            for channel in frame.channels:
+                if is_data_channel(channel.name) and is_array_channel(channel) \
+                        and channel.name not in array_channels:
+                    array_channels[channel.name] = {
+                        'unit': output_unit(channel.name, channel.units),
+                        'shape': channel_shape(channel),
+                    }
+    return array_channels
+
+def split_frame_channels(frame, channel_fields, sidecars):
+    """
+    Separa os canais exportados de um frame entre escalares (LAS) e arrays (.npy)
+    
+    Arrays com forma diferente da registrada no .npy do canal são ignorados.
+    
+    Retorno:
+        tuple: (escalares, arrays) - listas de (nome do canal, campo do frame)
+    """
+    scalars = []
+    arrays = []
+    for channel, field in zip(frame.channels, channel_fields):
+        if not is_data_channel(channel.name):
+            continue
+        if not is_array_channel(channel):
+            scalars.append((channel.name, field))
+        elif channel.name in sidecars and sidecars[channel.name].shape[1] == np.prod(channel_shape(channel)):
+            arrays.append((channel.name, field))
+        else:
+            print(f"⚠️ Canal {channel.name} ignorado no frame {frame.name}: forma {channel_shape(channel)} diferente do .npy")
+    return scalars, arrays
+
+def frame_factors(frame, channel_names, output_units):
+    """
+    Fatores que levam os canais do frame para as unidades de saída
+    
+    Calculados uma vez por frame e aplicados à matriz de dados inteira
+    (DLIS2LAS_units.apply_factors); None se nenhum canal precisar de conversão.
+    """
+    frame_units = {channel.name: channel.units for channel in frame.channels}
+    return column_factors([frame_units[name] for name in channel_names],
+                          [output_units[name] for name in channel_names])
+
+def ordered_frames(all_files, splice_priority):
+    """Frames de todos os logical files na ordem de emenda (ver order_frames)"""
+    return order_frames([frame for lf in all_files for frame in lf.frames], splice_priority)
+
+def frame_workload(frame):
+    """
+    Estimativa do trabalho de um frame lida só do cabeçalho: número de
+    amostras (extensão / espaçamento) x valores por amostra de todos os canais
+    """
+    depth_channel = get_depth_channel(frame)
+    if not depth_channel or frame.index_max is None:
+        return 0.0
+    extent = abs(frame.index_max - frame.index_min) * depth_scale(depth_channel)
+    n_values = sum(int(np.prod(channel_shape(channel))) for channel in frame.channels)
+    return extent / (frame_spacing(frame, depth_channel) or 1.0) * n_values
+
+# =============================================================================
+# FUNÇÃO DE PROCESSAMENTO INDIVIDUAL
+# =============================================================================
+
+def process_single_dlis(dlis_path, las_path, splice_priority=SPLICE_PRIORITY, chunk_rows=CHUNK_ROWS,
+                        output_format=OUTPUT_FORMAT, depth_step=DEPTH_STEP, profile_path=PROFILE_PATH,
+                        compact=COMPACT_FLOAT32, frame_workers=FRAME_WORKERS):
+    """
+    Processa um único arquivo DLIS e salva como LAS (ou Parquet)
+    
+    Parâmetros:
+        dlis_path (str): Caminho do arquivo DLIS de entrada
+        las_path (str): Caminho do arquivo de saída (LAS ou Parquet)
+        splice_priority (str): Regra de prioridade entre passadas sobrepostas
+            ('first', 'last' ou 'longest')
+        chunk_rows (int): Se informado, converte em modo streaming, processando
+            o grid em blocos com esse número de linhas (memória limitada)
+        output_format (str): 'las' ou 'parquet' (ver OUTPUT_FORMAT)
+        depth_step (float): Passo do grid em metros; None usa o espaçamento
+            nativo dos frames (ver DEPTH_STEP)
+        profile_path (str): Se informado, anexa a esse .jsonl as medições de
+            cada etapa da conversão (ver PROFILE_PATH)
+        compact (bool): Curvas em float32, profundidade em float64 (ver
+            COMPACT_FLOAT32); no LAS os valores saem arredondados a float32
+        frame_workers (int): Processos que convertem os frames do arquivo em
+            paralelo no modo em memória (ver FRAME_WORKERS)
+    
+    Retorno:
+        list: Caminhos dos .npy gravados para os canais multidimensionais
+    """
+    if output_format not in OUTPUT_EXTENSIONS:
+        raise ValueError(f"Formato de saída inválido: {output_format} (use {tuple(OUTPUT_EXTENSIONS)})")
+    profiler = make_profiler(dlis_path, las_path, profile_path, PROFILE_MEMORY)
+    value_dtype = np.float32 if compact else np.float64
+    
+    # 1. Carrega todos os Logical Files
+    with profiler.stage('load') as stage:
+        f, *tail = dlis.load(dlis_path)
+        all_files = [f] + tail
+        stage['bytes_read'] += os.path.getsize(dlis_path)
+    
+    # 2. Extrai metadados básicos
+    well = well_header(f.origins[0])
+    
+    # 3. Determina intervalo de profundidade global com conversão de unidades
+    with profiler.stage('depth_range') as stage:
+        global_min, global_max = depth_range(all_files)
+        step = depth_step or native_step(all_files)
+        depth_global = np.arange(global_min, global_max + step, step)
+        stage['samples'] += len(depth_global)
+    
+    # 4. Coleta todos os canais únicos (excluindo DUMM e canais de índice);
+    # canais multidimensionais vão para arquivos .npy referenciados no ~Params
+    with profiler.stage('collect_channels'):
+        channel_units = collect_channel_units(all_files)
+        curves = [('DEPT', 'm', 'Depth')] + [(name, unit, name) for name, unit in channel_units.items()]
+        array_channels = collect_array_channels(all_files)
+        sidecars = open_array_sidecars(las_path, array_channels, len(depth_global), value_dtype)
+        params = sidecar_params(las_path, array_channels)
+        output_units = dict(channel_units, **{name: info['unit'] for name, info in array_channels.items()})
+        frames = ordered_frames(all_files, splice_priority)
+    
+    if output_format == 'parquet':
+        schema = parquet_schema(curves, f.origins[0], params, compact)
+    
+    if chunk_rows:
+        # 5-7. Modo streaming: lê, reamostra e grava a saída bloco a bloco do grid
+        stream_args = (frames, depth_global, channel_units, output_units, sidecars, splice_priority, chunk_rows)
+        if output_format == 'parquet':
+            with open_parquet_writer(las_path, schema) as writer:
+                stream_single_dlis(*stream_args, lambda block: write_parquet_rows(writer, block),
+                                   value_dtype=value_dtype, profiler=profiler)
+        else:
+            with open(las_path, 'w') as file_object:
+                write_las_header(file_object, well, curves, depth_global, params)
+                stream_single_dlis(*stream_args, lambda block: write_las_rows(file_object, block),
+                                   value_dtype=value_dtype, profiler=profiler)
+    else:
+        # 5-7. Modo em memória: monta todas as curvas e grava a saída de uma vez
+        all_channels = {'DEPT': depth_global}
+        for channel_name in channel_units:
+            all_channels[channel_name] = np.full(len(depth_global), np.nan, dtype=value_dtype)
+        if frame_workers != 1 and len(frames) > 1:
+            fill_channels_parallel(dlis_path, las_path, frames, depth_global, all_channels, output_units,
+                                   sidecars, splice_priority, frame_workers, profiler=profiler)
+        else:
+            fill_channels(frames, depth_global, all_channels, output_units, sidecars, splice_priority,
+                          profiler=profiler)
+        
+        with profiler.stage('write') as stage:
+            if output_format == 'parquet':
+                write_parquet(las_path, schema, list(all_channels.values()))
+            else:
+                write_las(las_path, well, curves, list(all_channels.values()), params)
+            stage['samples'] += len(depth_global) * len(all_channels)
+    
+    close_array_sidecars(sidecars)
+    profiler.write(profile_path)
+    
+    print(f"✅ Arquivo {output_format.upper()} salvo em: {las_path}")
+    print(f"   Intervalo de profundidade: {global_min:.2f} - {global_max:.2f} m (passo {step:g} m)")
+    print(f"   Canais incluídos: {['DEPT'] + list(channel_units)}")
+    if array_channels:
+        print(f"   Canais multidimensionais (.npy): {list(array_channels)}")
+    return [sidecar_path(las_path, name) for name in array_channels]
+
+def resample_frame(frame, depth_global, output_units, sidecars, statistic=DOWNSAMPLE_STATISTIC, max_gap=MAX_GAP,
+                   profiler=NULL_PROFILER):
+    """
+    Decodifica um frame e reamostra os seus canais para o grid global, sem emendar
+    
+    Frames mais finos que o grid são reduzidos por blocos (statistic), os demais
+    interpolados sem atravessar lacunas maiores que max_gap. Os valores
+    ausentes viram NaN e os dados são convertidos para output_units
+    (canal -> unidade) antes da reamostragem.
+    
+    Retorno:
+        list: Tuplas (destino, canal, janela, valores), com destino 'curves'
+            para os canais escalares e 'arrays' para os multidimensionais
+            (blocos 2-D dos .npy); vazia se o frame não tiver canal de índice
+    """
+    depth_channel = get_depth_channel(frame)
+    if not depth_channel:
+        return []
+    
+    # Decodifica o frame inteiro uma única vez (array estruturado). O primeiro
+    # campo é FRAMENO e os demais seguem a ordem de frame.channels, então cada
+    # canal é só uma visão (sem cópia) desse array
+    with profiler.stage('decode') as stage:
+        curves = frame.curves(strict=False)
+        stage['bytes_read'] += curves.nbytes
+    channel_fields = curves.dtype.names[1:]
+    
+    depth_values = curves[channel_fields[frame.channels.index(depth_channel)]]
+    scale = depth_scale(depth_channel)
+    if scale != 1.0:
+        depth_values = depth_values * scale
+    
+    scalars, arrays = split_frame_channels(frame, channel_fields, sidecars)
+    factors = frame_factors(frame, [name for name, _ in scalars], output_units)
+    absent = absent_values(frame)
+    resample = frame_resampler(depth_global, frame_spacing(frame, depth_channel, depth_values),
+                               statistic, max_gap)
+    resampled = []
+    
+    if scalars:
+        # Reamostra todos os canais do frame de uma vez, só na janela coberta por ele
+        with profiler.stage('resample') as stage:
+            data = mask_absent(np.stack([curves[field] for _, field in scalars], axis=1), absent)
+            data = apply_factors(data, factors)
+            window, values = resample(depth_global, depth_values, data)
+            stage['samples'] += values.size
+        for i, (channel_name, _) in enumerate(scalars):
+            resampled.append(('curves', channel_name, window, values[:, i]))
+    
+    # Cada canal multidimensional é um bloco (n_amostras, n_valores) reamostrado em profundidade
+    for channel_name, field in arrays:
+        with profiler.stage('resample_arrays') as stage:
+            data = mask_absent(curves[field].reshape(len(curves), -1), absent)
+            data = apply_factors(data, frame_factors(frame, [channel_name], output_units))
+            window, values = resample(depth_global, depth_values, data)
+            stage['samples'] += values.size
+        resampled.append(('arrays', channel_name, window, values))
+    
+    return resampled
+
+def fill_channels(frames, depth_global, all_channels, output_units, sidecars, splice_priority,
+                  statistic=DOWNSAMPLE_STATISTIC, max_gap=MAX_GAP, profiler=NULL_PROFILER):
+    """
+    Preenche as curvas do grid global com os dados de cada frame (modo em memória)
+    
+    Cada frame só é reamostrado (resample_frame) e gravado na janela do grid
+    que cobre, seguindo a regra de prioridade quando passadas se sobrepõem.
+    Canais multidimensionais são emendados nos .npy (sidecars).
+    """
+    targets = {'curves': all_channels, 'arrays': sidecars}
+    for frame in frames:
+        resampled = resample_frame(frame, depth_global, output_units, sidecars, statistic, max_gap, profiler)
+        with profiler.stage('splice'):
+            for kind, channel_name, window, values in resampled:
+                splice_window(targets[kind][channel_name], window, values, splice_priority)
+
+def fill_channels_parallel(dlis_path, las_path, frames, depth_global, all_channels, output_units, sidecars,
+                           splice_priority, n_workers, statistic=DOWNSAMPLE_STATISTIC, max_gap=MAX_GAP,
+                           profiler=NULL_PROFILER):
+    """
+    Como fill_channels, com os frames do arquivo convertidos em n_workers processos
+    
+    As curvas ficam em memória compartilhada durante a conversão e os canais
+    multidimensionais são emendados direto nos .npy (memmap aberto em cada
+    worker). Os frames são distribuídos dos maiores para os menores
+    (frame_workload) e a emenda guarda o frame dono de cada amostra
+    (splice_ranked), então a saída é a mesma de fill_channels.
+    
+    Parâmetros:
+        dlis_path (str): DLIS aberto de novo por cada worker
+        las_path (str): Saída, usada para localizar os .npy dos sidecars
+        frames (list): Frames na ordem de emenda (ordered_frames)
+        n_workers (int): Processos; None usa todos os núcleos
+    """
+    order = sorted((rank for rank, frame in enumerate(frames) if get_depth_channel(frame)),
+                   key=lambda rank: frame_workload(frames[rank]), reverse=True)
+    rank_dtype = np.int16 if len(frames) < np.iinfo(np.int16).max else np.int32
+    unowned = unowned_rank(splice_priority, rank_dtype)
+    
+    # O NaN inicial dos .npy precisa estar no disco antes dos workers abrirem os arquivos
+    close_array_sidecars(sidecars)
+    
+    curves = SharedArrays.create({
+        name: (values.shape, values.dtype, np.nan) for name, values in all_channels.items() if name != 'DEPT'
+    })
+    try:
+        owner_specs = {('curves', name): (values.shape, rank_dtype, unowned) for name, values in curves.arrays.items()}
+        owner_specs.update({('arrays', name): (values.shape, rank_dtype, unowned) for name, values in sidecars.items()})
+        owners = SharedArrays.create(owner_specs)
+        try:
+            args = (dlis_path, las_path, depth_global, output_units, curves.layout, owners.layout, splice_priority,
+                    statistic, max_gap, profiler is not NULL_PROFILER)
+            with profiler.stage('frame_workers'):
+                worker_stages = run_frame_workers(fill_frames_worker, args, order, n_workers)
+            for name, values in curves.arrays.items():
+                all_channels[name][:] = values
+        finally:
+            owners.release()
+    finally:
+        curves.release()
+    
+    for stages in worker_stages:
+        profiler.merge(stages)
+
+def fill_frames_worker(tasks, lock, dlis_path, las_path, depth_global, output_units, curves_layout, owners_layout,
+                       splice_priority, statistic, max_gap, profile):
+    """
+    Worker de fill_channels_parallel: converte os frames da fila e os emenda
+    nos arrays compartilhados
+    
+    Retorno:
+        dict: Etapas medidas neste processo (vazio sem perfil), somadas depois
+            ao perfil do arquivo
+    """
+    profiler = StageProfiler(dlis_path, trace_memory=False) if profile else NULL_PROFILER
+    with profiler.stage('worker_load'):
+        f, *tail = dlis.load(dlis_path)
+        frames = ordered_frames([f] + tail, splice_priority)
+    
+    curves = SharedArrays.attach(curves_layout)
+    owners = SharedArrays.attach(owners_layout)
+    sidecars = {
+        name: np.load(sidecar_path(las_path, name), mmap_mode='r+').reshape(len(depth_global), -1)
+        for kind, name in owners_layout if kind == 'arrays'
+    }
+    targets = {'curves': curves.arrays, 'arrays': sidecars}
+    
+    for rank in tasks:
+        resampled = resample_frame(frames[rank], depth_global, output_units, sidecars, statistic, max_gap, profiler)
+        # Só a emenda é serializada entre os workers
+        with profiler.stage('splice'), lock:
+            for kind, channel_name, window, values in resampled:
+                splice_ranked(targets[kind][channel_name], owners[(kind, channel_name)], window, values, rank,
+                              splice_priority)
+    
+    close_array_sidecars(sidecars)
+    curves.release()
+    owners.release()
+    return profiler.stages if profile else {}
+
+def stream_single_dlis(frames, depth_global, channel_units, output_units, sidecars, splice_priority, chunk_rows,
+                       write_rows, statistic=DOWNSAMPLE_STATISTIC, max_gap=MAX_GAP, value_dtype=np.float64,
+                       profiler=NULL_PROFILER):
+    """
+    Converte em modo streaming, com memória limitada pelo tamanho do bloco
+    
+    Antes do laço só a coluna de profundidade de cada frame é decodificada.
+    Depois, para cada bloco de chunk_rows linhas do grid, apenas as linhas dos
+    frames que cobrem o bloco são lidas, têm os valores ausentes trocados por
+    NaN, são convertidas para output_units, reamostradas e entregues a
+    write_rows (LAS ou Parquet), sem nunca montar as curvas completas em
+    memória. Com value_dtype float32 as curvas do bloco
+    são arredondadas a float32 (a coluna DEPT não), como no modo em memória.
+    """
+    # Coluna de saída de cada canal (a coluna 0 é DEPT)
+    column_index = {name: i + 1 for i, name in enumerate(channel_units)}
+    
+    # Plano de leitura de cada frame: profundidade (em metros), campos e colunas de saída
+    frame_plans = []
+    for frame in frames:
+        depth_channel = get_depth_channel(frame)
+        if not depth_channel:
+            continue
+        
+        channel_fields = frame.dtype(strict=False).names[1:]
+        scalars, arrays = split_frame_channels(frame, channel_fields, sidecars)
+        if not scalars and not arrays:
+            continue
+        
+        with profiler.stage('decode_depth') as stage:
+            depth_values = read_frame_column(frame, depth_channel)
+            stage['bytes_read'] += depth_values.nbytes
+        scale = depth_scale(depth_channel)
+        if scale != 1.0:
+            depth_values = depth_values * scale
+        
+        frame_plans.append({
+            'frame': frame,
+            'depth': depth_values,
+            'resample': frame_resampler(depth_global, frame_spacing(frame, depth_channel, depth_values),
+                                        statistic, max_gap),
+            'fields': [field for _, field in scalars],
+            'columns': [column_index[name] for name, _ in scalars],
+            'factors': frame_factors(frame, [name for name, _ in scalars], output_units),
+            'absent': absent_values(frame),
+            'arrays': [(name, field, frame_factors(frame, [name], output_units)) for name, field in arrays],
+        })
+    
+    # Meio passo de margem: a redução por blocos usa as amostras de toda a célula
+    margin = (depth_global[1] - depth_global[0]) / 2 if len(depth_global) > 1 else 0.0
+    
+    # Os blocos são entregues a write_rows na ordem do grid
+    for start in range(0, len(depth_global), chunk_rows):
+        grid = depth_global[start:start + chunk_rows]
+        block = np.full((len(grid), len(channel_units) + 1), np.nan)
+        block[:, 0] = grid
+        
+        for plan in frame_plans:
+            rows = frame_rows_for(plan['depth'], grid, margin)
+            if rows is None:
+                continue
+            
+            first_row, last_row = rows
+            with profiler.stage('decode') as stage:
+                curves = read_frame_rows(plan['frame'], first_row, last_row)
+                stage['bytes_read'] += curves.nbytes
+            depth_values = plan['depth'][first_row:last_row]
+            if plan['fields']:
+                with profiler.stage('resample') as stage:
+                    data = mask_absent(np.stack([curves[field] for field in plan['fields']], axis=1),
+                                       plan['absent'])
+                    data = apply_factors(data, plan['factors'])
+                    window, values = plan['resample'](grid, depth_values, data)
+                    stage['samples'] += values.size
+                with profiler.stage('splice'):
+                    for i, column in enumerate(plan['columns']):
+                        splice_window(block[:, column], window, values[:, i], splice_priority)
+            
+            # Arrays vão direto para o trecho do .npy correspondente ao bloco
+            for channel_name, field, factors in plan['arrays']:
+                with profiler.stage('resample_arrays') as stage:
+                    data = mask_absent(curves[field].reshape(len(curves), -1), plan['absent'])
+                    data = apply_factors(data, factors)
+                    window, values = plan['resample'](grid, depth_values, data)
+                    stage['samples'] += values.size
+                with profiler.stage('splice'):
+                    splice_window(sidecars[channel_name][start:start + len(grid)], window, values,
+                                  splice_priority)
+        
+        if value_dtype != np.float64:
+            block[:, 1:] = block[:, 1:].astype(value_dtype)
+        
+        with profiler.stage('write') as stage:
+            write_rows(block)
+            stage['samples'] += block.size
+
+# =============================================================================
+# EXECUÇÃO PRINCIPAL
+# =============================================================================
+
+if __name__ == "__main__" and DRY_RUN:
+    from DLIS2LAS_planner import PLAN_PATH, plan_dlis_files
+    
+    print("\nPLANEJANDO CONVERSÃO DE ARQUIVOS DLIS (DRY RUN, TODOS OS ESTADOS)")
+    print(f"Diretório de entrada: {DLIS_ROOT_DIR}")
+    print(f"Plano: {PLAN_PATH}")
+    
+    plan_dlis_files()
+    
+    print("\nPLANEJAMENTO CONCLUÍDO!")
+
+elif __name__ == "__main__":
+    print("\nINICIANDO PROCESSAMENTO EM LOTE DE ARQUIVOS DLIS (TODOS OS ESTADOS)")
+    print(f"Diretório de entrada: {DLIS_ROOT_DIR}")
+    print(f"Diretório de saída: {LAS_OUTPUT_DIR}")
+    print(f"Processos paralelos: {N_WORKERS}")
+    print(f"Formato de saída: {OUTPUT_FORMAT}")
+    
+    process_all_dlis_files()
+    
+    print("\nPROCESSAMENTO CONCLUÍDO!")
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Canais multidimensionais (arrays) do DLIS gravados em arquivos .npy ao lado do LAS.
+
+Formas de onda, imagens e patins de dipmeter têm vários valores por amostra
+(channel.dimension != [1]) e não cabem numa coluna do ~ASCII. Cada um desses
+canais é reamostrado em profundidade como um bloco 2-D (n_amostras, n_valores)
+e gravado em <nome_do_LAS>.<CANAL>.npy, com uma linha por linha do LAS (mesmo
+grid de DEPT). O ~Params do LAS traz um item por canal apontando para o arquivo.
+
+Os arquivos são abertos como memmap (np.lib.format.open_memmap), então a emenda
+das passadas escreve direto no disco sem montar o array completo em memória.
+"""
+
+import glob
+import os
+import re
+
+import numpy as np
+
+# =============================================================================
+# CANAIS MULTIDIMENSIONAIS
+# =============================================================================
+
+def channel_shape(channel):
+    """Forma de cada amostra do canal (tupla vazia para canais escalares)"""
+    dimension = tuple(int(size) for size in (channel.dimension or []))
+    if int(np.prod(dimension)) <= 1:
+        return ()
+    return dimension
+
+def is_array_channel(channel):
+    """Indica se o canal tem mais de um valor por amostra"""
+    return channel_shape(channel) != ()
+
+def sidecar_path(las_path, channel_name):
+    """Caminho do .npy de um canal: <nome_do_LAS>.<CANAL>.npy"""
+    safe_name = re.sub(r'[^\w.-]', '_', channel_name)
+    return f"{os.path.splitext(las_path)[0]}.{safe_name}.npy"
+
+def existing_sidecars(las_path):
+    """
+    Arquivos .npy já gravados ao lado de uma saída (<nome_do_LAS>.*.npy).
+
+    Usado quando os canais do arquivo não são conhecidos, por exemplo para
+    apagar a saída parcial de um processo que morreu no meio da conversão.
+    """
+    return glob.glob(f"{glob.escape(os.path.splitext(las_path)[0])}.*.npy")
+
+def open_array_sidecars(las_path, array_channels, n_rows, dtype=np.float64):
+    """
+    Cria os arquivos .npy dos canais multidimensionais, preenchidos com NaN.
+
+    Parâmetros:
+        las_path (str): Caminho do arquivo LAS de saída
+        array_channels (dict): Canal -> {'unit': unidade, 'shape': forma da amostra}
+        n_rows (int): Número de linhas do grid de profundidade
+        dtype: Tipo dos valores gravados (float32 no modo compacto)
+
+    Retorno:
+        dict: Canal -> memmap 2-D (n_rows, n_valores) gravado no .npy, cuja
+            forma no arquivo é (n_rows, *shape)
+    """
+    sidecars = {}
+    for name, info in array_channels.items():
+        array = np.lib.format.open_memmap(
+            sidecar_path(las_path, name), mode='w+', dtype=dtype, shape=(n_rows,) + info['shape']
+        )
+        array[:] = np.nan
+        sidecars[name] = array.reshape(n_rows, -1)
+    return sidecars
+
+def close_array_sidecars(sidecars):
+    """Descarrega no disco os memmaps abertos por open_array_sidecars"""
+    for array in sidecars.values():
+        array.flush()
+
+def sidecar_params(las_path, array_channels):
+    """
+    Itens do ~Params que referenciam os .npy dos canais multidimensionais.
+
+    Retorno:
+        list: Tuplas (mnemônico, unidade, valor, descrição) com o nome do
+            arquivo como valor e a forma da amostra na descrição
+    """
+    params = []
+    for name, info in array_channels.items():
+        shape = ' x '.join(str(size) for size in info['shape'])
+        params.append((
+            name,
+            info['unit'],
+            os.path.basename(sidecar_path(las_path, name)),
+            f"Array channel [{shape}] per DEPT row (.npy sidecar)",
+        ))
+    return params
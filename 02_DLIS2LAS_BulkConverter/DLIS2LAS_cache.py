@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Cache de conversão: evita reconverter arquivos DLIS que não mudaram.
+
+Um manifesto JSON na pasta de saída guarda, para cada conversão bem-sucedida,
+a chave <hash do conteúdo do DLIS>:<hash da configuração do conversor> e o
+arquivo gerado, com os .npy dos canais multidimensionais. Um arquivo é pulado
+quando a sua chave já aponta para uma saída válida (a saída e todos os .npy
+ainda existem com o mesmo tamanho).
+
+Para não ler o DLIS inteiro a cada execução, o manifesto também guarda
+tamanho e mtime de cada entrada: se não mudaram desde o último hash, o hash
+registrado é reutilizado e a decisão é O(1), feita no processo principal.
+Só os arquivos novos ou alterados são lidos para calcular o hash, dentro do
+processo do pool que vai convertê-los.
+"""
+
+import hashlib
+import json
+import os
+
+# Nome do manifesto, gravado dentro da pasta de saída
+CACHE_MANIFEST_NAME = '.dlis2las_cache.json'
+
+# Bloco de leitura para o cálculo do hash
+HASH_BLOCK_SIZE = 1 << 20
+
+# =============================================================================
+# HASHES
+# =============================================================================
+
+def file_hash(path):
+    """Hash SHA-256 do conteúdo do arquivo, lido em blocos"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file_object:
+        for chunk in iter(lambda: file_object.read(HASH_BLOCK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def file_fingerprint(path, read_path=None):
+    """
+    Tamanho, mtime e hash do conteúdo de um arquivo.
+
+    O stat é lido antes do hash: se o arquivo mudar durante a leitura, a
+    próxima execução verá um mtime diferente e calculará o hash de novo.
+    Com read_path (cópia local do prefetch) o hash é lido da cópia e o
+    tamanho/mtime continuam sendo os do arquivo original.
+    """
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': file_hash(read_path or path)}
+
+def config_hash(config, source_paths=()):
+    """
+    Hash da configuração do conversor.
+
+    Parâmetros:
+        config (dict): Parâmetros que alteram a saída (passo, regras de emenda, formato...)
+        source_paths (list): Arquivos de código do conversor; qualquer mudança
+            neles (filtros de canais, regras de unidade) invalida o cache
+    """
+    digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8'))
+    for path in source_paths:
+        digest.update(os.path.basename(path).encode('utf-8'))
+        digest.update(file_hash(path).encode('utf-8'))
+    return digest.hexdigest()
+
+def cache_key(content_hash, config_key):
+    """Chave do manifesto: conteúdo do DLIS + configuração do conversor"""
+    return f"{content_hash}:{config_key}"
+
+# =============================================================================
+# MANIFESTO
+# =============================================================================
+
+def manifest_path(output_dir):
+    """Caminho do manifesto dentro da pasta de saída"""
+    return os.path.join(output_dir, CACHE_MANIFEST_NAME)
+
+def load_manifest(output_dir):
+    """
+    Lê o manifesto da pasta de saída.
+
+    Retorno:
+        dict: 'sources' (DLIS -> tamanho, mtime e hash) e 'outputs' (chave ->
+            arquivo gerado, seu tamanho e os .npy com seus tamanhos); vazio se
+            não existir ou estiver corrompido
+    """
+    try:
+        with open(manifest_path(output_dir), 'r', encoding='utf-8') as file_object:
+            manifest = json.load(file_object)
+        return {'sources': dict(manifest['sources']), 'outputs': dict(manifest['outputs'])}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {'sources': {}, 'outputs': {}}
+
+def save_manifest(output_dir, manifest):
+    """Grava o manifesto de forma atômica (arquivo temporário + os.replace)"""
+    path = manifest_path(output_dir)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as file_object:
+        json.dump(manifest, file_object, indent=1, sort_keys=True)
+    os.replace(temp_path, path)
+
+def output_is_valid(record):
+    """Indica se a saída registrada e todos os seus .npy ainda existem com o mesmo tamanho"""
+    try:
+        files = dict(record['sidecars'], **{record['output']: record['size']})
+        return all(os.path.getsize(path) == size for path, size in files.items())
+    except (OSError, KeyError, TypeError):
+        return False
+
+def valid_keys_by_output(manifest):
+    """
+    Chaves do manifesto agrupadas pelo arquivo de saída, só as ainda válidas.
+
+    Retorno:
+        dict: Caminho de saída -> lista de chaves que o geraram
+    """
+    keys = {}
+    for key, record in manifest['outputs'].items():
+        if output_is_valid(record):
+            keys.setdefault(record['output'], []).append(key)
+    return keys
+
+def is_cached_by_stat(manifest, dlis_path, config_key, output_keys):
+    """
+    Pré-checagem O(1) sem ler o DLIS: tamanho e mtime iguais aos do último hash.
+
+    Parâmetros:
+        manifest (dict): Manifesto carregado por load_manifest
+        dlis_path (str): Arquivo DLIS de entrada
+        config_key (str): Hash da configuração do conversor
+        output_keys (list): Chaves válidas do arquivo de saída esperado
+            (ver valid_keys_by_output)
+    """
+    source = manifest['sources'].get(dlis_path)
+    if source is None:
+        return False
+    stat = os.stat(dlis_path)
+    if stat.st_size != source['size'] or stat.st_mtime_ns != source['mtime_ns']:
+        return False
+    return cache_key(source['hash'], config_key) in output_keys
+
+def record_conversion(manifest, dlis_path, fingerprint, config_key, output_path, sidecar_paths=None):
+    """
+    Registra no manifesto uma conversão bem-sucedida (ou confirmada pelo hash).
+
+    Parâmetros:
+        sidecar_paths (list): .npy gravados com a saída; None (conversão
+            confirmada pelo hash, nada regravado) mantém os do registro anterior
+    """
+    # A saída foi regravada: chaves antigas que apontavam para ela deixam de valer
+    old_keys = [key for key, record in manifest['outputs'].items() if record['output'] == output_path]
+    if sidecar_paths is None:
+        sidecar_paths = [path for key in old_keys for path in manifest['outputs'][key].get('sidecars', {})]
+    for key in old_keys:
+        del manifest['outputs'][key]
+
+    manifest['sources'][dlis_path] = fingerprint
+    manifest['outputs'][cache_key(fingerprint['hash'], config_key)] = {
+        'output': output_path,
+        'size': os.path.getsize(output_path),
+        'sidecars': {path: os.path.getsize(path) for path in sidecar_paths},
+    }
@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""
+Catálogo SQLite da estrutura de todos os arquivos DLIS da bacia.
+
+Os scripts de 01_DLIS2LAS_OneByOne só imprimem lf.describe() e os detalhes
+de frames/canais na tela, então descobrir quais poços têm uma ferramenta ou
+um canal exige reabrir todos os DLIS. Este script percorre as mesmas pastas
+de estado do motor de conversão, em paralelo, lendo apenas os metadados
+(dlis.load indexa os registros, mas nenhum frame é decodificado), e grava
+tudo em tabelas SQLite indexadas:
+
+    files          - um registro por arquivo DLIS (estado, tamanho, mtime, erro)
+    logical_files  - logical files de cada arquivo, com os campos do origin
+    frames         - index_type, index_min/max, spacing, direction de cada frame
+    channels       - nome, unidade, dimensão e ferramenta de cada canal
+    tools          - ferramentas registradas em cada logical file
+
+A atualização é incremental: arquivos com o mesmo tamanho e mtime já
+catalogados não são relidos. Cada arquivo é lido em um processo isolado, com
+os mesmos limites de tempo e memória da conversão (FILE_TIMEOUT,
+MEMORY_LIMIT_MB); falhas ficam registradas em files.error.
+
+Exemplo de consulta (poços com o canal NPHI):
+    SELECT DISTINCT l.well_name FROM channels c
+    JOIN logical_files l ON l.file_id = c.file_id AND l.lf_index = c.lf_index
+    WHERE c.name = 'NPHI'
+"""
+
+import json
+import os
+import sqlite3
+from dlisio import dlis
+
+from DLIS2LAS_BulkConverter_engine import (BASE_PATH, DLIS_ROOT_DIR, FILE_TIMEOUT, MEMORY_LIMIT_MB, N_WORKERS,
+                                           discover_dlis_files)
+from DLIS2LAS_isolation import run_isolated
+from DLIS2LAS_parquet import origin_metadata
+
+# =============================================================================
+# CONFIGURAÇÕES GLOBAIS
+# =============================================================================
+
+CATALOG_PATH = os.path.join(BASE_PATH, "dlis_catalog.sqlite")
+
+# Colunas do origin copiadas para logical_files (ver DLIS2LAS_parquet.ORIGIN_ATTRIBUTES)
+ORIGIN_COLUMNS = ['well_name', 'well_id', 'field_name', 'company', 'producer_name',
+                  'product', 'file_set_name', 'creation_time']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    file_id INTEGER PRIMARY KEY,
+    dlis_path TEXT UNIQUE NOT NULL,
+    state TEXT,
+    dlis_file TEXT,
+    size INTEGER,
+    mtime_ns INTEGER,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS logical_files (
+    file_id INTEGER NOT NULL,
+    lf_index INTEGER NOT NULL,
+    fileheader_id TEXT,
+    well_name TEXT,
+    well_id TEXT,
+    field_name TEXT,
+    company TEXT,
+    producer_name TEXT,
+    product TEXT,
+    file_set_name TEXT,
+    creation_time TEXT,
+    PRIMARY KEY (file_id, lf_index)
+);
+CREATE TABLE IF NOT EXISTS frames (
+    file_id INTEGER NOT NULL,
+    lf_index INTEGER NOT NULL,
+    frame_name TEXT,
+    index_type TEXT,
+    index_units TEXT,
+    index_min REAL,
+    index_max REAL,
+    spacing REAL,
+    direction TEXT,
+    n_channels INTEGER
+);
+CREATE TABLE IF NOT EXISTS channels (
+    file_id INTEGER NOT NULL,
+    lf_index INTEGER NOT NULL,
+    frame_name TEXT,
+    name TEXT,
+    long_name TEXT,
+    units TEXT,
+    dimension TEXT,
+    n_values INTEGER,
+    tool TEXT
+);
+CREATE TABLE IF NOT EXISTS tools (
+    file_id INTEGER NOT NULL,
+    lf_index INTEGER NOT NULL,
+    name TEXT,
+    generic_name TEXT,
+    trademark_name TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_files_state ON files(state);
+CREATE INDEX IF NOT EXISTS idx_lf_well ON logical_files(well_name);
+CREATE INDEX IF NOT EXISTS idx_frames_file ON frames(file_id);
+CREATE INDEX IF NOT EXISTS idx_frames_index_type ON frames(index_type);
+CREATE INDEX IF NOT EXISTS idx_channels_name ON channels(name);
+CREATE INDEX IF NOT EXISTS idx_channels_file ON channels(file_id);
+CREATE INDEX IF NOT EXISTS idx_tools_name ON tools(name);
+"""
+
+# Tabelas com linhas por arquivo (apagadas quando o arquivo é recatalogado)
+DETAIL_TABLES = ['logical_files', 'frames', 'channels', 'tools']
+
+# =============================================================================
+# LEITURA DOS METADADOS (PROCESSOS DO POOL)
+# =============================================================================
+
+def _number(value):
+    """Converte valores numéricos do dlisio (inclusive tipos NumPy) para float"""
+    return None if value is None else float(value)
+
+def empty_structure(job, error=None):
+    """Resultado sem linhas de detalhe (início da leitura ou falha do processo)"""
+    result = dict(job, error=error, **{table: [] for table in DETAIL_TABLES})
+    result['mtime_ns'] = os.stat(job['dlis_path']).st_mtime_ns
+    return result
+
+def read_dlis_structure(job):
+    """
+    Lê só os metadados de um arquivo DLIS, sem decodificar frames.
+
+    Executada dentro do processo isolado de cada arquivo: nunca propaga exceções.
+
+    Retorno:
+        dict: O job com 'error' e as linhas de cada tabela de detalhe
+            ('logical_files', 'frames', 'channels', 'tools'), sem file_id
+    """
+    result = empty_structure(job)
+
+    try:
+        with dlis.load(job['dlis_path']) as files:
+            for lf_index, lf in enumerate(files):
+                origin = origin_metadata(lf.origins[0]) if lf.origins else {}
+                fileheader_id = lf.fileheader.id if lf.fileheader else None
+                result['logical_files'].append(
+                    (lf_index, fileheader_id) + tuple(origin.get(column) for column in ORIGIN_COLUMNS)
+                )
+
+                for frame in lf.frames:
+                    index_channel = next((ch for ch in frame.channels if ch.name == frame.index), None)
+                    result['frames'].append((
+                        lf_index, frame.name, frame.index_type,
+                        index_channel.units if index_channel else None,
+                        _number(frame.index_min), _number(frame.index_max),
+                        _number(frame.spacing), frame.direction, len(frame.channels),
+                    ))
+                    for channel in frame.channels:
+                        dimension = [int(size) for size in (channel.dimension or [])]
+                        n_values = 1
+                        for size in dimension:
+                            n_values *= size
+                        result['channels'].append((
+                            lf_index, frame.name, channel.name, channel.long_name,
+                            channel.units, json.dumps(dimension), n_values,
+                            channel.source.name if channel.source is not None else None,
+                        ))
+
+                for tool in lf.tools:
+                    result['tools'].append((lf_index, tool.name, tool.generic_name, tool.trademark_name))
+
+    except Exception as e:
+        result['error'] = str(e)
+
+    return result
+
+# =============================================================================
+# GRAVAÇÃO NO SQLITE (PROCESSO PRINCIPAL)
+# =============================================================================
+
+def open_catalog(catalog_path=CATALOG_PATH):
+    """Abre (ou cria) o catálogo SQLite com as tabelas e índices"""
+    connection = sqlite3.connect(catalog_path)
+    connection.executescript(SCHEMA)
+    return connection
+
+def store_structure(connection, result):
+    """Substitui no catálogo as linhas de um arquivo pelas recém-lidas"""
+    row = connection.execute("SELECT file_id FROM files WHERE dlis_path = ?", (result['dlis_path'],)).fetchone()
+    if row is not None:
+        file_id = row[0]
+        for table in DETAIL_TABLES:
+            connection.execute(f"DELETE FROM {table} WHERE file_id = ?", (file_id,))
+        connection.execute(
+            "UPDATE files SET state = ?, dlis_file = ?, size = ?, mtime_ns = ?, error = ? WHERE file_id = ?",
+            (result['state'], result['dlis_file'], result['size'], result['mtime_ns'], result['error'], file_id)
+        )
+    else:
+        file_id = connection.execute(
+            "INSERT INTO files (dlis_path, state, dlis_file, size, mtime_ns, error) VALUES (?, ?, ?, ?, ?, ?)",
+            (result['dlis_path'], result['state'], result['dlis_file'], result['size'],
+             result['mtime_ns'], result['error'])
+        ).lastrowid
+
+    for table in DETAIL_TABLES:
+        rows = [(file_id,) + values for values in result[table]]
+        if rows:
+            placeholders = ', '.join('?' * len(rows[0]))
+            connection.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+
+def build_catalog(dlis_root=DLIS_ROOT_DIR, catalog_path=CATALOG_PATH, states=None, n_workers=N_WORKERS):
+    """
+    Cataloga todos os arquivos DLIS de dlis_root em paralelo
+
+    Parâmetros:
+        dlis_root (str): Pasta com uma subpasta por estado
+        catalog_path (str): Arquivo SQLite do catálogo
+        states (list): Siglas a processar; None processa todas as subpastas
+        n_workers (int): Número de processos simultâneos (1 = sequencial)
+
+    Retorno:
+        dict: Contagem de arquivos 'lidos', 'inalterados', 'removidos' e 'com_erro'
+    """
+    jobs = discover_dlis_files(dlis_root, states)
+    connection = open_catalog(catalog_path)
+
+    # Arquivos já catalogados com o mesmo tamanho e mtime não são relidos
+    known = {path: (size, mtime_ns) for path, size, mtime_ns
+             in connection.execute("SELECT dlis_path, size, mtime_ns FROM files WHERE error IS NULL")}
+    pending = []
+    for job in jobs:
+        stat = os.stat(job['dlis_path'])
+        if known.get(job['dlis_path']) != (stat.st_size, stat.st_mtime_ns):
+            pending.append(job)
+
+    # Arquivos que saíram das pastas de entrada; com states, vale o conjunto
+    # pedido (um estado cuja pasta esvaziou também perde as suas linhas)
+    current = {job['dlis_path'] for job in jobs}
+    scanned_states = {state.upper() for state in states} if states else None
+    removed = []
+    for file_id, path, state in connection.execute("SELECT file_id, dlis_path, state FROM files").fetchall():
+        if path not in current and (scanned_states is None or state in scanned_states):
+            removed.append(file_id)
+    with connection:
+        for file_id in removed:
+            for table in DETAIL_TABLES + ['files']:
+                connection.execute(f"DELETE FROM {table} WHERE file_id = ?", (file_id,))
+
+    print(f"\nCatalogando {len(pending)} de {len(jobs)} arquivos DLIS ({len(jobs) - len(pending)} inalterados)")
+
+    errors = 0
+    try:
+        with connection:
+            for job, result, failure in run_isolated(read_dlis_structure, pending, (), n_workers,
+                                                     FILE_TIMEOUT, MEMORY_LIMIT_MB):
+                if failure is not None:
+                    result = empty_structure(job, failure)
+                store_structure(connection, result)
+                if result['error'] is not None:
+                    errors += 1
+                    print(f"⚠️ Erro ao catalogar {result['dlis_file']}: {result['error']}")
+    finally:
+        connection.close()
+
+    return {'lidos': len(pending), 'inalterados': len(jobs) - len(pending),
+            'removidos': len(removed), 'com_erro': errors}
+
+# =============================================================================
+# CONSULTAS
+# =============================================================================
+
+def query_catalog(sql, params=(), catalog_path=CATALOG_PATH):
+    """Executa uma consulta no catálogo e devolve as linhas"""
+    connection = sqlite3.connect(catalog_path)
+    try:
+        return connection.execute(sql, params).fetchall()
+    finally:
+        connection.close()
+
+def wells_with_channel(channel_name, catalog_path=CATALOG_PATH):
+    """Poços (estado, arquivo, poço) que têm o canal informado"""
+    return query_catalog(
+        """
+        SELECT DISTINCT f.state, f.dlis_file, l.well_name FROM channels c
+        JOIN files f ON f.file_id = c.file_id
+        JOIN logical_files l ON l.file_id = c.file_id AND l.lf_index = c.lf_index
+        WHERE c.name = ? ORDER BY f.state, f.dlis_file
+        """,
+        (channel_name,), catalog_path
+    )
+
+def wells_with_tool(tool_name, catalog_path=CATALOG_PATH):
+    """Poços (estado, arquivo, poço) em que a ferramenta informada foi registrada"""
+    return query_catalog(
+        """
+        SELECT DISTINCT f.state, f.dlis_file, l.well_name FROM tools t
+        JOIN files f ON f.file_id = t.file_id
+        JOIN logical_files l ON l.file_id = t.file_id AND l.lf_index = t.lf_index
+        WHERE t.name = ? OR t.generic_name = ? ORDER BY f.state, f.dlis_file
+        """,
+        (tool_name, tool_name), catalog_path
+    )
+
+# =============================================================================
+# EXECUÇÃO PRINCIPAL
+# =============================================================================
+
+if __name__ == "__main__":
+    print("\nCATALOGANDO ESTRUTURA DOS ARQUIVOS DLIS")
+    print(f"Diretório de entrada: {DLIS_ROOT_DIR}")
+    print(f"Catálogo: {CATALOG_PATH}")
+
+    summary = build_catalog()
+
+    print(f"\n• Lidos: {summary['lidos']}")
+    print(f"• Inalterados: {summary['inalterados']}")
+    print(f"• Removidos do catálogo: {summary['removidos']}")
+    print(f"• Com erro: {summary['com_erro']}")
+
+    for state, n_files, n_frames, n_channels in query_catalog(
+        """
+        SELECT f.state, COUNT(DISTINCT f.file_id), COUNT(DISTINCT fr.rowid), COUNT(DISTINCT c.name)
+        FROM files f LEFT JOIN frames fr ON fr.file_id = f.file_id
+        LEFT JOIN channels c ON c.file_id = f.file_id GROUP BY f.state
+        """
+    ):
+        print(f"• {state}: {n_files} arquivos, {n_frames} frames, {n_channels} canais distintos")
+
+    print("\nCATÁLOGO CONCLUÍDO!")
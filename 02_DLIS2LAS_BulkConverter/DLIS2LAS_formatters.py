@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Regras de nomenclatura dos arquivos LAS de saída, uma por estado.
+
+Cada função recebe o nome base do arquivo DLIS (sem extensão) e devolve o
+nome simplificado do LAS (ex.: 1MR__0001A_PR_1MR__0001A_PR → 1_MR_1_A_PR).
+As regras ficam registradas em FORMATTERS pela sigla do estado, que é também
+o nome da subpasta em DLIS_input/. Para incluir um novo estado basta criar a
+função e decorá-la com @register_formatter('UF').
+"""
+
+# =============================================================================
+# REGISTRO DE FORMATADORES
+# =============================================================================
+
+FORMATTERS = {}
+
+def register_formatter(state):
+    """Registra a função decorada como formatador do estado informado"""
+    def decorator(func):
+        FORMATTERS[state.upper()] = func
+        return func
+    return decorator
+
+def get_formatter(state):
+    """Retorna o formatador do estado ou None se o estado não tiver regra registrada"""
+    return FORMATTERS.get(state.upper())
+
+# =============================================================================
+# FORMATADORES POR ESTADO
+# =============================================================================
+
+@register_formatter('MS')
+def format_simple_MS(name):
+    """Regra de nomenclatura dos poços de MS"""
+ 
+    base_name = name.split('_')[0] + '_' + name.split('_')[1] + '_' + name.split('_')[2]
+    
+    # Padrão 1: Nomes com 3 letras (1MB__0001__SC)
+    if len(base_name.split('__')[0]) == 3:  
+        parts = base_name.split('__')
+        num_letras = parts[0]          
+        numero = parts[1]              
+    # Padrão 2: Nomes com 4 letras (1RCH_0001__SC)
+    else:
+        parts = base_name.split('_')
+        num_letras = parts[0]        
+        numero = parts[1]             
+    
+    prefix_num = ''.join([c for c in num_letras if c.isdigit()])
+    prefix_let = ''.join([c for c in num_letras if c.isalpha()])
+    
+    # Extrai apenas a parte numérica
+    well_number = ''.join([c for c in numero if c.isdigit()]) or '1'
+    
+    return f"{prefix_num}_{prefix_let}_{int(well_number)}_MS"
+
+
+@register_formatter('PR')
+def format_simple_PR(name):
+    """Regra de nomenclatura dos poços de PR"""
+    # Primeiro extrai a parte relevante do nome (1MR__0001A_PR)
+    base_part = name.split('_PR_')[0] if '_PR_' in name else name.split('__')[0] + '__' + name.split('__')[1]
+    
+    # Separa a parte do prefixo (1MR) e número (0001A)
+    if '__' in base_part:
+        prefix_part, number_part = base_part.split('__')[:2]
+    else:
+        prefix_part, number_part = base_part.split('_')[:2]
+    
+    # Extrai dígitos e letras do prefixo
+    prefix_num = ''.join([c for c in prefix_part if c.isdigit()])
+    prefix_letters = ''.join([c for c in prefix_part if c.isalpha()])
+    
+    # Extrai número e letras finais (0001A → 1 e A)
+    well_number = ''.join([c for c in number_part if c.isdigit()])
+    well_letters = ''.join([c for c in number_part if c.isalpha()])
+    
+    # Formata a saída
+    result = f"{prefix_num}_{prefix_letters}_{int(well_number) if well_number else 1}"
+    if well_letters:
+        result += f"_{well_letters}"
+    result += "_PR"
+    
+    return result
+
+
+@register_formatter('RS')
+def format_simple_RS(name):
+    """Regra de nomenclatura dos poços de RS"""
+
+    # Padrão 1: Nomes com 3 caracteres (1MB__0001__SC)
+    if len(name.split('__')[0]) == 3:  # Verifica se as iniciais têm 3 caracteres
+        parts = name.split('__')
+        num_letras = parts[0]          
+        numero = parts[1]            
+    # Padrão 2: Nomes com 4 caracteres (1RCH_0001__SC)
+    else:
+        parts = name.split('_')
+        num_letras = parts[0]         
+        numero = parts[1]              
+    
+    # Extrai dígitos e letras iniciais
+    prefix_num = ''.join([c for c in num_letras if c.isdigit()])  
+    prefix_let = ''.join([c for c in num_letras if c.isalpha()])  
+    
+    return f"{prefix_num}_{prefix_let}_{int(numero)}_RS"
+
+
+@register_formatter('SC')
+def format_simple_SC(name):
+    """Regra de nomenclatura dos poços de SC"""
+
+    # Padrão 1: Nomes com 3 letras (1MB__0001__SC)
+    if len(name.split('__')[0]) == 3:  
+        parts = name.split('__')
+        num_letras = parts[0]          
+        numero = parts[1]           
+    # Padrão 2: Nomes com 4 letras (1RCH_0001__SC)
+    else:
+        parts = name.split('_')
+        num_letras = parts[0]         
+        numero = parts[1]            
+    
+    # Extrai dígitos e letras iniciais
+    prefix_num = ''.join([c for c in num_letras if c.isdigit()])  
+    prefix_let = ''.join([c for c in num_letras if c.isalpha()])  
+    
+    return f"{prefix_num}_{prefix_let}_{int(numero)}_SC"
+
+
+@register_formatter('SP')
+def format_simple_SP(name):
+    """Regra de nomenclatura dos poços de SP"""
+    # Verifica se tem o padrão com 2 letras extras no meio (como 0001DA)
+    if any(c.isalpha() for c in name.split('__')[1][-2:]):
+        # Padrão 3: Nomes como 2CB__0001DA__SP
+        parts = name.split('__')
+        num_letras = parts[0]          
+        numero_com_letras = parts[1]
+        # Separa a parte numérica (0001) das letras finais (DA)
+        numero = numero_com_letras[:-2]  # Pega tudo exceto os últimos 2 caracteres
+        letras_extras = numero_com_letras[-2:]  # Pega os últimos 2 caracteres
+    # Padrão 1: Nomes com 3 letras (1MB__0001__SC)
+    elif len(name.split('__')[0]) == 3:  
+        parts = name.split('__')
+        num_letras = parts[0]          
+        numero = parts[1]           
+        letras_extras = ''  # Não tem letras extras nesse padrão
+    # Padrão 2: Nomes com 4 letras (1RCH_0001__SC)
+    else:
+        parts = name.split('_')
+        num_letras = parts[0]         
+        numero = parts[1]            
+        letras_extras = ''  # Não tem letras extras nesse padrão
+    
+    # Extrai dígitos e letras iniciais
+    prefix_num = ''.join([c for c in num_letras if c.isdigit()])  
+    prefix_let = ''.join([c for c in num_letras if c.isalpha()])  
+    
+    # Adiciona as letras extras se existirem
+    suffix = f"_{letras_extras}" if letras_extras else ""
+    
+    return f"{prefix_num}_{prefix_let}_{int(numero)}{suffix}_SP"
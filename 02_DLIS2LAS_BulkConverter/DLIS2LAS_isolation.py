@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Execução isolada das conversões e quarentena de arquivos DLIS problemáticos.
+
+Cada arquivo é convertido em um processo próprio, com limite de tempo (wall
+clock) e de memória. Um DLIS malformado que trave o dlis.load, estoure a
+memória ou derrube o processo em código nativo afeta só o seu processo: ele é
+encerrado, o arquivo vai para a lista de quarentena com o motivo e o lote
+segue com os demais. Com um ProcessPoolExecutor, ao contrário, um processo
+morto quebra o pool inteiro (BrokenProcessPool) e um travado segura o lote.
+
+O limite de memória usa resource.RLIMIT_AS e só vale em sistemas POSIX; no
+Windows apenas o limite de tempo é aplicado.
+
+Os processos isolados não são daemon, para poderem abrir os seus próprios
+workers (FRAME_WORKERS do motor); o encerramento deles é sempre explícito.
+
+A quarentena é um JSON na pasta de saída. Arquivos em quarentena são pulados
+nas execuções seguintes até que mudem (tamanho/mtime) ou sejam liberados.
+"""
+
+import json
+import multiprocessing
+import os
+import time
+from datetime import datetime
+from multiprocessing.connection import wait
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Nome da lista de quarentena, gravada dentro da pasta de saída
+QUARANTINE_NAME = '.dlis2las_quarantine.json'
+
+# Intervalo, em segundos, entre as consultas a jobs.ready() enquanto o
+# próximo item da fila ainda não está pronto (ex.: cópia do prefetch)
+READY_POLL_INTERVAL = 0.2
+
+# =============================================================================
+# PROCESSOS ISOLADOS
+# =============================================================================
+
+def _limit_memory(memory_limit_mb):
+    """Limita o espaço de endereçamento do processo atual (só POSIX)"""
+    if memory_limit_mb and resource is not None:
+        limit = int(memory_limit_mb * 1024 * 1024)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def _isolated_worker(connection, function, job, args, memory_limit_mb):
+    """Executa function(job, *args) no processo filho e devolve o resultado pelo pipe"""
+    try:
+        _limit_memory(memory_limit_mb)
+        connection.send(('ok', function(job, *args)))
+    except MemoryError:
+        connection.send(('failure', f"limite de memória excedido ({memory_limit_mb} MB)"))
+    except BaseException as e:
+        connection.send(('failure', f"{type(e).__name__}: {e}"))
+    finally:
+        connection.close()
+
+def _stop(process):
+    """Encerra um processo filho e aguarda a sua saída"""
+    if process.is_alive():
+        process.kill()
+    process.join()
+
+def run_isolated(function, jobs, args=(), n_workers=1, timeout=None, memory_limit_mb=None):
+    """
+    Executa function(job, *args) para cada job, cada um em um processo próprio.
+
+    Parâmetros:
+        function: Função de nível de módulo (precisa ser importável pelo filho)
+        jobs (iterable): Itens da fila, executados na ordem. Um gerador é
+            consumido aos poucos, um item a cada processo iniciado (ex.: a fila
+            do DLIS2LAS_prefetch, que entrega cada arquivo já copiado). Se
+            jobs tiver ready(), o próximo item só é pedido quando ready() for
+            verdadeiro; até lá os prazos continuam sendo aplicados e os
+            processos concluídos, recolhidos
+        args (tuple): Argumentos extras passados a function
+        n_workers (int): Processos simultâneos; None usa todos os núcleos
+        timeout (float): Tempo máximo por job, em segundos; None não limita
+        memory_limit_mb (float): Memória máxima por processo (só POSIX)
+
+    Retorno:
+        generator: Tuplas (job, resultado, falha), na ordem de conclusão. Se o
+            processo travar, estourar a memória ou morrer, resultado é None e
+            falha descreve o motivo; senão falha é None
+    """
+    context = multiprocessing.get_context()
+    n_workers = n_workers or os.cpu_count() or 1
+    pending = iter(jobs)
+    ready = getattr(jobs, 'ready', None)
+    exhausted = False
+    running = {}  # receptor do pipe -> (processo, job, prazo)
+
+    try:
+        while True:
+            waiting_item = False
+            while not exhausted and len(running) < n_workers:
+                # Com processos em execução, não bloqueia esperando o próximo item
+                if running and ready is not None and not ready():
+                    waiting_item = True
+                    break
+                job = next(pending, None)
+                if job is None:
+                    exhausted = True
+                    break
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(target=_isolated_worker,
+                                          args=(sender, function, job, args, memory_limit_mb))
+                process.start()
+                sender.close()
+                deadline = time.monotonic() + timeout if timeout else None
+                running[receiver] = (process, job, deadline)
+            if not running:
+                break
+
+            # Acorda quando algum filho responder/morrer ou no prazo mais próximo
+            deadlines = [deadline for _, _, deadline in running.values() if deadline is not None]
+            wait_time = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            if waiting_item:
+                wait_time = min(wait_time, READY_POLL_INTERVAL) if wait_time is not None else READY_POLL_INTERVAL
+            wait(list(running), timeout=wait_time)
+
+            for receiver in list(running):
+                process, job, deadline = running[receiver]
+                if receiver.poll():
+                    # Mensagem do filho, ou EOF se ele morreu sem responder
+                    try:
+                        status, payload = receiver.recv()
+                    except (EOFError, OSError):
+                        process.join()
+                        status, payload = 'failure', f"processo encerrado sem resultado (código de saída {process.exitcode})"
+                    _stop(process)
+                elif deadline is not None and time.monotonic() >= deadline:
+                    _stop(process)
+                    status, payload = 'failure', f"tempo limite de {timeout:g} s excedido"
+                else:
+                    continue
+
+                receiver.close()
+                del running[receiver]
+                if status == 'ok':
+                    yield job, payload, None
+                else:
+                    yield job, None, payload
+    finally:
+        for receiver, (process, _, _) in running.items():
+            _stop(process)
+            receiver.close()
+
+# =============================================================================
+# QUARENTENA
+# =============================================================================
+
+def quarantine_path(output_dir):
+    """Caminho da lista de quarentena dentro da pasta de saída"""
+    return os.path.join(output_dir, QUARANTINE_NAME)
+
+def load_quarantine(output_dir):
+    """Lê a lista de quarentena (DLIS -> motivo, data, tamanho e mtime)"""
+    try:
+        with open(quarantine_path(output_dir), 'r', encoding='utf-8') as file_object:
+            return dict(json.load(file_object))
+    except (OSError, ValueError, TypeError):
+        return {}
+
+def save_quarantine(output_dir, quarantine):
+    """Grava a lista de quarentena de forma atômica"""
+    path = quarantine_path(output_dir)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as file_object:
+        json.dump(quarantine, file_object, indent=1, sort_keys=True, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+def quarantine_file(quarantine, job, reason):
+    """Coloca um arquivo da fila em quarentena com o motivo da falha"""
+    stat = os.stat(job['dlis_path'])
+    quarantine[job['dlis_path']] = {
+        'state': job['state'],
+        'dlis_file': job['dlis_file'],
+        'reason': reason,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    }
+
+def quarantine_reason(quarantine, job):
+    """
+    Motivo da quarentena de um arquivo, ou None se ele não estiver em quarentena.
+
+    Um arquivo alterado desde a falha (tamanho ou mtime diferentes) é liberado
+    para nova tentativa.
+    """
+    entry = quarantine.get(job['dlis_path'])
+    if entry is None:
+        return None
+    stat = os.stat(job['dlis_path'])
+    if stat.st_size != entry['size'] or stat.st_mtime_ns != entry['mtime_ns']:
+        return None
+    return entry['reason']
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Gravador nativo de arquivos LAS 2.0 para a saída dos conversores.
+
+Produz byte a byte o mesmo texto que lasio.LASFile.write() gerava para os
+conversores (cabeçalho VERS/WRAP, ~Well com STRT/STOP/STEP/NULL, ~Curve e
+valores com '%.5f' alinhados à direita em 10 caracteres, NaN escrito como o
+valor de NULL), mas formata a seção ~ASCII em blocos grandes com uma única
+operação de formatação por bloco, em vez de uma chamada Python por valor.
+"""
+
+import numpy as np
+
+# Formato e largura dos valores numéricos no ~ASCII (padrão do lasio para '%.5f')
+LAS_VALUE_FMT = '%.5f'
+LAS_VALUE_WIDTH = 10
+LAS_NULL_VALUE = -9999.25
+
+# Largura das linhas de título de seção (~Version ----...)
+LAS_HEADER_WIDTH = 60
+
+# Linhas formatadas de uma vez na seção ~ASCII
+LAS_BLOCK_ROWS = 10000
+
+# Seção ~Version: (mnemônico, unidade, valor, descrição)
+VERSION_SECTION = [
+    ('VERS', '', 2.0, 'CWLS log ASCII Standard -VERSION 2.0'),
+    ('WRAP', '', 'NO', 'One line per depth step'),
+    ('DLM', '', 'SPACE', 'Column Data Section Delimiter'),
+]
+
+# Seção ~Well padrão; STRT/STOP/STEP são preenchidos na gravação
+WELL_SECTION = [
+    ('STRT', 'm', None, 'START DEPTH'),
+    ('STOP', 'm', None, 'STOP DEPTH'),
+    ('STEP', 'm', None, 'STEP'),
+    ('NULL', '', LAS_NULL_VALUE, 'NULL VALUE'),
+    ('COMP', '', '', 'COMPANY'),
+    ('WELL', '', '', 'WELL'),
+    ('FLD', '', '', 'FIELD'),
+    ('LOC', '', '', 'LOCATION'),
+    ('PROV', '', '', 'PROVINCE'),
+    ('CNTY', '', '', 'COUNTY'),
+    ('STAT', '', '', 'STATE'),
+    ('CTRY', '', '', 'COUNTRY'),
+    ('SRVC', '', '', 'SERVICE COMPANY'),
+    ('DATE', '', '', 'DATE'),
+    ('UWI', '', '', 'UNIQUE WELL ID'),
+    ('API', '', '', 'API NUMBER'),
+]
+
+# =============================================================================
+# CABEÇALHO
+# =============================================================================
+
+def _header_value(value, unit):
+    """Mesma regra do lasio no ~Well: itens com unidade e sem valor são escritos como 0"""
+    if unit and not value and value != 0:
+        value = 0
+    if value is None:
+        value = ''
+    return str(value)
+
+def format_section(title, items):
+    """
+    Formata uma seção do cabeçalho no layout 'MNEM.UNIT  VALOR : DESCRIÇÃO'.
+
+    Parâmetros:
+        title (str): Título da seção (ex.: '~Well')
+        items (list): Tuplas (mnemônico, unidade, valor, descrição)
+
+    Retorno:
+        list: Linhas da seção, começando pela linha de título
+    """
+    lines = [f"{title} ".ljust(LAS_HEADER_WIDTH, '-')]
+    if not items:
+        return lines
+
+    items = [(mnemonic, unit, str(value), descr) for mnemonic, unit, value, descr in items]
+    left_width = max(len(mnemonic) for mnemonic, _, _, _ in items)
+    middle_width = max(len(unit) + 1 + len(value) for _, unit, value, _ in items)
+
+    for mnemonic, unit, value, descr in items:
+        middle = unit + ' ' * (middle_width - len(unit) - len(value)) + value
+        lines.append(f"{mnemonic.ljust(left_width)}.{middle} : {descr}")
+    return lines
+
+def write_las_header(file_object, well, curves, depth_global, params=None):
+    """
+    Grava as seções ~Version, ~Well, ~Curve, ~Params, ~Other e a linha ~ASCII.
+
+    Parâmetros:
+        file_object: Arquivo de saída aberto para escrita
+        well (dict): Itens do ~Well preenchidos pelo conversor (WELL, FLD, COMP);
+            substituem o item padrão, inclusive a descrição
+        curves (list): Tuplas (mnemônico, unidade, descrição), DEPT primeiro
+        depth_global (np.ndarray): Grid de profundidade (para STRT/STOP/STEP)
+        params (list): Itens do ~Params, tuplas (mnemônico, unidade, valor, descrição)
+    """
+    # Mesmos valores e formatação que o lasio calculava a partir do índice
+    strt = LAS_VALUE_FMT % depth_global[0]
+    stop = LAS_VALUE_FMT % depth_global[-1]
+    step = LAS_VALUE_FMT % (depth_global[1] - depth_global[0]) if stop != strt else None
+    depth_items = {'STRT': strt, 'STOP': stop, 'STEP': step}
+
+    well_items = []
+    for mnemonic, unit, value, descr in WELL_SECTION:
+        if mnemonic in depth_items:
+            value = depth_items[mnemonic]
+        elif mnemonic in well:
+            value, descr = well[mnemonic], ''
+        well_items.append((mnemonic, unit, _header_value(value, unit), descr))
+
+    lines = []
+    lines += format_section('~Version', VERSION_SECTION)
+    lines += format_section('~Well', well_items)
+    lines += format_section('~Curve Information', [(name, unit, '', descr) for name, unit, descr in curves])
+    lines += format_section('~Params', params or [])
+    lines += format_section('~Other', [])
+    lines.append('~ASCII '.ljust(LAS_HEADER_WIDTH, '-'))
+
+    file_object.write('\n'.join(lines) + '\n')
+
+# =============================================================================
+# DADOS
+# =============================================================================
+
+def write_las_rows(file_object, block, null_value=LAS_NULL_VALUE):
+    """
+    Anexa um bloco de linhas à seção ~ASCII.
+
+    Parâmetros:
+        file_object: Arquivo de saída aberto para escrita
+        block (np.ndarray): Matriz (n_linhas, n_curvas), com DEPT na coluna 0
+        null_value: Valor de NULL escrito no lugar de NaN
+    """
+    if len(block) == 0:
+        return
+
+    # Uma única formatação para o bloco inteiro em vez de uma por valor
+    row_fmt = f' %{LAS_VALUE_WIDTH}.5f' * block.shape[1] + '\n'
+    text = (row_fmt * len(block)) % tuple(block.ravel().tolist())
+
+    # NaN sai como 'nan' com a mesma largura do NULL justificado
+    null_field = str(null_value).rjust(LAS_VALUE_WIDTH)
+    file_object.write(text.replace('nan'.rjust(LAS_VALUE_WIDTH), null_field))
+
+def write_las(las_path, well, curves, columns, params=None, block_rows=LAS_BLOCK_ROWS):
+    """
+    Grava um arquivo LAS 2.0 completo.
+
+    Parâmetros:
+        las_path (str): Caminho do arquivo LAS de saída
+        well (dict): Itens do ~Well preenchidos pelo conversor (WELL, FLD, COMP)
+        curves (list): Tuplas (mnemônico, unidade, descrição), DEPT primeiro
+        columns (list): Um array por curva, na mesma ordem de curves
+        params (list): Itens do ~Params, tuplas (mnemônico, unidade, valor, descrição)
+        block_rows (int): Linhas formatadas por bloco
+    """
+    depth_global = columns[0]
+    with open(las_path, 'w') as file_object:
+        write_las_header(file_object, well, curves, depth_global, params)
+        for start in range(0, len(depth_global), block_rows):
+            block = np.column_stack([values[start:start + block_rows] for values in columns])
+            write_las_rows(file_object, block)
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Paralelismo dentro de um único arquivo DLIS: frames decodificados e
+reamostrados ao mesmo tempo em vários processos.
+
+Poços com muitos logical files (passadas repetidas, várias corridas) ficam
+por último no lote, convertendo um frame por vez. Aqui cada processo abre o
+DLIS por conta própria, pega o próximo frame da fila compartilhada (os
+maiores primeiro) e emenda o resultado direto nas curvas de saída, que ficam
+em memória compartilhada (multiprocessing.shared_memory): nenhum array volta
+serializado para o processo principal, só contadores de perfil.
+
+Como os frames terminam fora de ordem, a emenda guarda o dono (posição do
+frame na ordem de prioridade) de cada amostra (ver
+DLIS2LAS_resampling.splice_ranked); o resultado é o mesmo da emenda em
+sequência.
+
+Uso:
+    curves = SharedArrays.create({'GR': ((n_rows,), np.float64, np.nan)})
+    try:
+        results = run_frame_workers(worker, (curves.layout,), order, n_workers=4)
+        gr = curves['GR'].copy()
+    finally:
+        curves.release()
+"""
+
+import multiprocessing
+import os
+import queue
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Intervalo, em segundos, entre as verificações de workers vivos enquanto o
+# processo principal espera os resultados
+RESULT_POLL_INTERVAL = 0.5
+
+# =============================================================================
+# ARRAYS EM MEMÓRIA COMPARTILHADA
+# =============================================================================
+
+class SharedArrays:
+    """
+    Arrays NumPy nomeados, cada um em um bloco de memória compartilhada.
+
+    O processo principal cria os blocos (create) e os workers os abrem pelo
+    layout (attach), que é pequeno e serializável: nome -> (bloco, forma, tipo).
+    """
+
+    def __init__(self, blocks, layout, owner):
+        self._blocks = blocks
+        self.layout = layout
+        self._owner = owner
+        self.arrays = {
+            name: np.ndarray(shape, dtype=dtype, buffer=blocks[name].buf)
+            for name, (_, shape, dtype) in layout.items()
+        }
+
+    @classmethod
+    def create(cls, specs):
+        """
+        Cria os blocos e preenche cada array com o valor inicial.
+
+        Parâmetros:
+            specs (dict): Nome -> (forma, tipo, valor inicial)
+        """
+        blocks = {}
+        layout = {}
+        try:
+            for name, (shape, dtype, fill) in specs.items():
+                dtype = np.dtype(dtype)
+                size = max(1, int(np.prod(shape)) * dtype.itemsize)
+                blocks[name] = shared_memory.SharedMemory(create=True, size=size)
+                layout[name] = (blocks[name].name, tuple(shape), dtype.str)
+        except BaseException:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+            raise
+        shared = cls(blocks, layout, owner=True)
+        for name, (_, _, fill) in specs.items():
+            shared.arrays[name][...] = fill
+        return shared
+
+    @classmethod
+    def attach(cls, layout):
+        """Abre, em um worker, os blocos criados pelo processo principal"""
+        blocks = {name: shared_memory.SharedMemory(name=block_name) for name, (block_name, _, _) in layout.items()}
+        return cls(blocks, layout, owner=False)
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def release(self):
+        """Fecha os blocos (e os apaga, no processo que os criou)"""
+        self.arrays.clear()
+        for block in self._blocks.values():
+            block.close()
+            if self._owner:
+                block.unlink()
+        self._blocks.clear()
+
+# =============================================================================
+# FILA DE FRAMES E WORKERS
+# =============================================================================
+
+class FrameQueue:
+    """
+    Fila de frames compartilhada entre os workers.
+
+    Cada worker itera sobre a fila e recebe o próximo frame ainda não pego.
+    A iteração para quando a fila acaba, quando stop() é chamado (falha em
+    outro worker) ou quando o processo principal morre (ex.: morto pelo limite
+    de tempo do DLIS2LAS_isolation), para não deixar workers órfãos.
+    """
+
+    def __init__(self, order, context):
+        self._order = context.Array('i', list(order), lock=False)
+        self._next = context.Value('i', 0)
+        self._parent_pid = os.getpid()
+
+    def __iter__(self):
+        while os.getppid() == self._parent_pid:
+            with self._next.get_lock():
+                index = self._next.value
+                if index >= len(self._order):
+                    return
+                self._next.value = index + 1
+            yield self._order[index]
+
+    def stop(self):
+        """Esvazia a fila: os workers terminam o frame atual e saem"""
+        with self._next.get_lock():
+            self._next.value = len(self._order)
+
+def _frame_worker(worker, tasks, lock, results, args):
+    """Executa worker(tasks, lock, *args) e devolve o retorno (ou a falha) pela fila"""
+    try:
+        results.put(('ok', worker(tasks, lock, *args)))
+    except MemoryError as e:
+        tasks.stop()
+        results.put(('memory', str(e)))
+    except BaseException as e:
+        tasks.stop()
+        results.put(('failure', f"{type(e).__name__}: {e}"))
+
+def run_frame_workers(worker, args, order, n_workers=None):
+    """
+    Executa worker(tasks, lock, *args) em n_workers processos.
+
+    Parâmetros:
+        worker: Função de nível de módulo; percorre tasks (FrameQueue) e usa
+            lock para emendar nos arrays compartilhados
+        args (tuple): Argumentos extras (serializados uma vez por worker)
+        order (list): Índices dos frames, na ordem em que são distribuídos
+        n_workers (int): Processos; None usa todos os núcleos. Nunca mais
+            processos que frames
+
+    Retorno:
+        list: Retorno de worker em cada processo (pequeno: contadores)
+
+    Exceções:
+        MemoryError: Algum worker estourou a memória
+        RuntimeError: Algum worker falhou ou morreu sem responder
+    """
+    context = multiprocessing.get_context()
+    n_workers = max(1, min(n_workers or os.cpu_count() or 1, len(order)))
+    tasks = FrameQueue(order, context)
+    lock = context.Lock()
+    results = context.Queue()
+
+    processes = [
+        context.Process(target=_frame_worker, args=(worker, tasks, lock, results, args), daemon=True)
+        for _ in range(n_workers)
+    ]
+    messages = []
+    try:
+        for process in processes:
+            process.start()
+        # Lê os resultados antes do join: um worker só termina depois que o
+        # seu resultado sai do pipe, então o join antes da leitura pode travar
+        while len(messages) < len(processes):
+            # Vivos medidos antes do get: se nenhum estava vivo e o get não
+            # trouxe nada, não há mais resultados a caminho
+            alive = any(process.is_alive() for process in processes)
+            try:
+                messages.append(results.get(timeout=RESULT_POLL_INTERVAL))
+            except queue.Empty:
+                if not alive:
+                    break
+        for process in processes:
+            process.join()
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.kill()
+                process.join()
+        results.close()
+
+    for status, payload in messages:
+        if status == 'memory':
+            raise MemoryError(payload)
+        if status == 'failure':
+            raise RuntimeError(f"falha na conversão paralela dos frames: {payload}")
+    if len(messages) < len(processes):
+        exit_codes = [process.exitcode for process in processes]
+        raise RuntimeError(f"worker de frames encerrado sem resultado (códigos de saída {exit_codes})")
+    return [payload for _, payload in messages]
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Saída colunar (Parquet) dos conversores, alternativa ao LAS.
+
+As curvas reamostradas vão direto do grid em memória para um arquivo Parquet
+tipado (float64, ou float32 no modo compacto, com DEPT sempre em float64),
+sem formatar nem reler texto: cada coluna NumPy contígua é entregue ao Arrow
+sem cópia. Os metadados do poço lidos do origin do DLIS, as
+unidades das curvas e os arquivos .npy dos canais multidimensionais ficam nos
+metadados do schema.
+
+Requer pyarrow (pip install pyarrow); o modo LAS continua funcionando sem ele.
+"""
+
+import json
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Atributos do origin do DLIS copiados para os metadados do schema
+ORIGIN_ATTRIBUTES = [
+    'well_name', 'well_id', 'field_name', 'company', 'producer_name', 'product',
+    'version', 'programs', 'file_set_name', 'file_id', 'creation_time', 'run_nr',
+    'descent_nr', 'name_space_name',
+]
+
+# Compressão das colunas no arquivo Parquet
+PARQUET_COMPRESSION = 'snappy'
+
+# =============================================================================
+# SCHEMA
+# =============================================================================
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Saída Parquet requer o pacote pyarrow (pip install pyarrow)")
+
+def origin_metadata(origin):
+    """
+    Metadados do poço lidos do origin do DLIS.
+
+    Retorno:
+        dict: Atributo -> texto, só com os atributos preenchidos
+    """
+    metadata = {}
+    for attribute in ORIGIN_ATTRIBUTES:
+        value = getattr(origin, attribute, None)
+        if value is None or value == [] or value == '':
+            continue
+        metadata[attribute] = ', '.join(map(str, value)) if isinstance(value, list) else str(value)
+    return metadata
+
+def parquet_schema(curves, origin, params=None, compact=False):
+    """
+    Schema tipado do arquivo Parquet de um poço.
+
+    Parâmetros:
+        curves (list): Tuplas (mnemônico, unidade, descrição), DEPT primeiro
+        origin: Objeto origin do DLIS (metadados do poço)
+        params (list): Itens extras (mnemônico, unidade, valor, descrição), como
+            as referências aos .npy dos canais multidimensionais
+        compact (bool): Curvas em float32; a profundidade (DEPT) fica em float64
+
+    Retorno:
+        pa.Schema: Uma coluna por curva, com a unidade nos metadados do
+            campo e o origin/params nos metadados do schema
+    """
+    _require_pyarrow()
+    value_type = pa.float32() if compact else pa.float64()
+    fields = [
+        pa.field(name, pa.float64() if i == 0 else value_type, metadata={'unit': unit, 'description': descr})
+        for i, (name, unit, descr) in enumerate(curves)
+    ]
+    metadata = {f"origin.{key}": value for key, value in origin_metadata(origin).items()}
+    if params:
+        metadata['params'] = json.dumps(
+            [{'mnemonic': m, 'unit': u, 'value': v, 'description': d} for m, u, v, d in params]
+        )
+    return pa.schema(fields, metadata=metadata)
+
+# =============================================================================
+# GRAVAÇÃO
+# =============================================================================
+
+def write_parquet(parquet_path, schema, columns, compression=PARQUET_COMPRESSION):
+    """
+    Grava um arquivo Parquet completo.
+
+    Parâmetros:
+        parquet_path (str): Caminho do arquivo de saída
+        schema (pa.Schema): Schema criado por parquet_schema
+        columns (list): Um array contíguo por curva, do tipo do campo no schema
+            (entregue sem cópia)
+    """
+    _require_pyarrow()
+    table = pa.Table.from_arrays([pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                                 schema=schema)
+    pq.write_table(table, parquet_path, compression=compression)
+
+def open_parquet_writer(parquet_path, schema, compression=PARQUET_COMPRESSION):
+    """Abre um gravador Parquet para o modo streaming (um row group por bloco)"""
+    _require_pyarrow()
+    return pq.ParquetWriter(parquet_path, schema, compression=compression)
+
+def write_parquet_rows(writer, block):
+    """
+    Anexa um bloco de linhas como um novo row group.
+
+    Parâmetros:
+        writer (pq.ParquetWriter): Gravador aberto por open_parquet_writer
+        block (np.ndarray): Matriz (n_linhas, n_curvas), com DEPT na coluna 0;
+            as colunas são convertidas para o tipo do campo no schema
+    """
+    if len(block) == 0:
+        return
+    columns = [
+        pa.array(np.ascontiguousarray(block[:, i]), type=field.type) for i, field in enumerate(writer.schema)
+    ]
+    writer.write_table(pa.Table.from_arrays(columns, schema=writer.schema))
@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+"""
+Planejamento (dry run) da conversão em lote DLIS → LAS.
+
+Antes de um lote grande não se sabe quanto tempo ele vai levar nem se algum
+processo vai estourar MEMORY_LIMIT_MB. Este script percorre as mesmas pastas
+de estado do motor e, para cada arquivo, lê só os cabeçalhos dos frames
+(index_min, index_max, spacing, canais e dimensões; nenhuma curva é
+decodificada) para estimar:
+
+    - tamanho do grid de saída (linhas) e número de canais
+    - volume decodificado (bytes dos registros de todos os frames)
+    - tamanho da saída (LAS ou Parquet) e dos .npy dos canais multidimensionais
+    - pico de memória da conversão (modo em memória ou streaming)
+    - nome do LAS gerado pela regra do estado (format_simple_<UF>)
+
+Saídas com o mesmo nome (colisão entre regras de nomenclatura) e arquivos
+cuja regra falha são apontados antes de começar. Com um perfil de conversões
+anteriores (PROFILE_PATH do motor), o volume decodificado vira estimativa de
+tempo, e o plano simula a fila (maiores primeiro) para vários números de
+processos: duração do lote e pior caso de memória simultânea.
+
+As estimativas de memória contam os buffers da conversão, não o interpretador
+nem o índice do dlisio.
+"""
+
+import csv
+import json
+import os
+from dlisio import dlis
+import numpy as np
+
+from DLIS2LAS_BulkConverter_engine import (BASE_PATH, CHUNK_ROWS, COMPACT_FLOAT32, DEPTH_STEP, DLIS_ROOT_DIR,
+                                           FILE_TIMEOUT, LAS_OUTPUT_DIR, MEMORY_LIMIT_MB, N_WORKERS,
+                                           OUTPUT_FORMAT, PROFILE_PATH, collect_array_channels,
+                                           collect_channel_units, depth_range, discover_dlis_files,
+                                           frame_spacing, get_depth_channel, is_data_channel, native_step,
+                                           output_path_for)
+from DLIS2LAS_arrays import channel_shape, is_array_channel
+from DLIS2LAS_isolation import run_isolated
+from DLIS2LAS_laswriter import LAS_BLOCK_ROWS, LAS_VALUE_WIDTH
+from DLIS2LAS_units import depth_scale
+
+# =============================================================================
+# CONFIGURAÇÕES GLOBAIS
+# =============================================================================
+
+# Plano gravado em CSV, uma linha por arquivo DLIS
+PLAN_PATH = os.path.join(BASE_PATH, "dlis2las_plan.csv")
+
+# Perfil de conversões anteriores usado para converter volume em tempo
+# (None: o plano informa só o volume decodificado)
+CALIBRATION_PROFILE_PATH = PROFILE_PATH
+
+# Cópias em float64 de cada valor decodificado durante a reamostragem
+# (np.stack dos canais, conversão de unidades e resultado da interpolação)
+RESAMPLE_COPIES = 3
+
+# Tamanho aproximado das seções de cabeçalho do LAS (~Version, ~Well, ~Curve...)
+LAS_HEADER_BYTES = 4096
+
+# Bytes por valor no bloco em formatação do LAS: o bloco float64, a lista de
+# floats do Python e a tupla (48) e três cópias do texto (molde, formatado e
+# com o NULL no lugar de NaN)
+LAS_WRITE_BYTES_PER_VALUE = 48 + 3 * (LAS_VALUE_WIDTH + 1)
+
+CSV_COLUMNS = ['state', 'dlis_file', 'size_mb', 'las_file', 'collision', 'n_logical_files', 'n_frames',
+               'depth_min', 'depth_max', 'step', 'n_rows', 'n_curves', 'n_array_channels', 'decoded_mb',
+               'output_mb', 'sidecar_mb', 'peak_memory_mb', 'est_seconds', 'error', 'dlis_path']
+
+MB = 1024 * 1024
+
+# =============================================================================
+# ESTIMATIVAS POR ARQUIVO (PROCESSOS ISOLADOS)
+# =============================================================================
+
+def frame_samples(frame, depth_channel, step):
+    """
+    Número de amostras do frame estimado pelo cabeçalho (extensão / espaçamento).
+
+    Frames sem spacing no cabeçalho usam o passo do grid de saída.
+    """
+    if frame.index_min is None or frame.index_max is None:
+        return 0
+    extent = abs(frame.index_max - frame.index_min) * depth_scale(depth_channel)
+    spacing = frame_spacing(frame, depth_channel) or step
+    return int(round(extent / spacing)) + 1
+
+def frame_plan(frame, step, n_rows):
+    """
+    Volume de um frame: bytes decodificados e memória temporária da reamostragem.
+
+    Retorno:
+        dict: 'samples', 'decoded_bytes' (registros do frame inteiro),
+            'grid_rows' (linhas do grid cobertas), 'scalar_values' e
+            'array_values' (valores por amostra dos canais exportados)
+    """
+    depth_channel = get_depth_channel(frame)
+    samples = frame_samples(frame, depth_channel, step)
+    spacing = frame_spacing(frame, depth_channel) or step
+    exported = [channel for channel in frame.channels if is_data_channel(channel.name)]
+    return {
+        'samples': samples,
+        'decoded_bytes': samples * frame.dtype(strict=False).itemsize,
+        'grid_rows': min(n_rows, int(samples * spacing / step) + 1),
+        'scalar_values': sum(1 for channel in exported if not is_array_channel(channel)),
+        'array_values': max((int(np.prod(channel_shape(channel))) for channel in exported
+                             if is_array_channel(channel)), default=0),
+    }
+
+def conversion_memory(frames, n_rows, n_curves, output_format, chunk_rows, value_size):
+    """
+    Pico de memória estimado da conversão de um arquivo, em bytes.
+
+    Modo em memória: curvas completas do grid + o maior frame decodificado e
+    reamostrado + o buffer de gravação. Streaming: colunas de profundidade de
+    todos os frames + um bloco do grid + o trecho do maior frame que cobre um
+    bloco. Os .npy são memmaps e não entram na conta.
+    """
+    row_bytes = 8 + n_curves * value_size
+    if chunk_rows:
+        depth_columns = sum(plan['samples'] * 8 for plan in frames)
+        block = chunk_rows * (n_curves + 1) * 8
+        chunk_peak = 0
+        for plan in frames:
+            # Amostras do frame que caem em um bloco de chunk_rows linhas do grid
+            rows = min(plan['samples'], chunk_rows * plan['samples'] // max(plan['grid_rows'], 1) + 1)
+            record_bytes = plan['decoded_bytes'] // max(plan['samples'], 1)
+            values = max(plan['scalar_values'], plan['array_values'])
+            chunk_peak = max(chunk_peak, rows * (record_bytes + values * 8 * RESAMPLE_COPIES))
+        return depth_columns + 2 * block + chunk_peak
+
+    frame_peak = 0
+    for plan in frames:
+        values = max(plan['scalar_values'], plan['array_values'])
+        frame_peak = max(frame_peak, plan['decoded_bytes'] + plan['samples'] * values * 8 * (RESAMPLE_COPIES - 1)
+                         + plan['grid_rows'] * values * 8)
+    if output_format == 'parquet':
+        # pyarrow monta a tabela com uma cópia das colunas
+        write_buffer = n_rows * row_bytes
+    else:
+        write_buffer = min(n_rows, LAS_BLOCK_ROWS) * (n_curves + 1) * LAS_WRITE_BYTES_PER_VALUE
+    return n_rows * row_bytes + frame_peak + write_buffer
+
+def empty_plan(job, error=None):
+    """Plano sem estimativas (início da leitura ou falha do processo)"""
+    return dict(job, size_mb=job['size'] / MB, las_file=None, collision=None, est_seconds=None, error=error)
+
+def plan_dlis_file(job, las_output_dir, output_format, chunk_rows, depth_step, compact):
+    """
+    Estima a conversão de um arquivo DLIS lendo só os cabeçalhos dos frames.
+
+    Executada dentro do processo isolado de cada arquivo: nunca propaga exceções.
+
+    Retorno:
+        dict: O job com as colunas de CSV_COLUMNS ('error' descreve falhas
+            de leitura ou de nomenclatura)
+    """
+    result = empty_plan(job)
+    try:
+        result['las_file'] = os.path.basename(output_path_for(job, las_output_dir, output_format))
+    except Exception as e:
+        result['error'] = f"regra de nomenclatura: {e}"
+
+    try:
+        with dlis.load(job['dlis_path']) as files:
+            all_files = list(files)
+            global_min, global_max = depth_range(all_files)
+            step = depth_step or native_step(all_files)
+            n_rows = len(np.arange(global_min, global_max + step, step))
+            channel_units = collect_channel_units(all_files)
+            array_channels = collect_array_channels(all_files)
+            frames = [frame_plan(frame, step, n_rows) for lf in all_files for frame in lf.frames
+                      if get_depth_channel(frame)]
+    except Exception as e:
+        result['error'] = str(e)
+        return result
+
+    value_size = 4 if compact else 8
+    n_curves = len(channel_units)
+    array_values = sum(int(np.prod(info['shape'])) for info in array_channels.values())
+    if output_format == 'parquet':
+        output_bytes = n_rows * (8 + n_curves * value_size)
+    else:
+        output_bytes = LAS_HEADER_BYTES + n_rows * ((n_curves + 1) * (LAS_VALUE_WIDTH + 1) + 1)
+
+    result.update({
+        'n_logical_files': len(all_files),
+        'n_frames': len(frames),
+        'depth_min': global_min,
+        'depth_max': global_max,
+        'step': step,
+        'n_rows': n_rows,
+        'n_curves': n_curves,
+        'n_array_channels': len(array_channels),
+        'decoded_mb': sum(plan['decoded_bytes'] for plan in frames) / MB,
+        'output_mb': output_bytes / MB,
+        'sidecar_mb': n_rows * array_values * value_size / MB,
+        'peak_memory_mb': conversion_memory(frames, n_rows, n_curves, output_format, chunk_rows,
+                                            value_size) / MB,
+    })
+    return result
+
+# =============================================================================
+# PLANO DO LOTE (PROCESSO PRINCIPAL)
+# =============================================================================
+
+def seconds_per_decoded_mb(profile_path):
+    """
+    Tempo de conversão por MB decodificado, medido em um perfil anterior.
+
+    Usa as linhas 'total' (tempo de parede) e 'decode' (bytes decodificados)
+    do .jsonl gravado com PROFILE_PATH; None se não houver perfil.
+    """
+    if not profile_path or not os.path.exists(profile_path):
+        return None
+    wall_s = 0.0
+    decoded_bytes = 0
+    with open(profile_path, 'r', encoding='utf-8') as file_object:
+        for line in file_object:
+            record = json.loads(line)
+            if record['stage'] == 'total':
+                wall_s += record['wall_s']
+            elif record['stage'] == 'decode':
+                decoded_bytes += record['bytes_read']
+    return wall_s / (decoded_bytes / MB) if decoded_bytes else None
+
+def find_collisions(plans):
+    """Marca em 'collision' os arquivos cuja saída tem o mesmo nome da de outro arquivo"""
+    by_output = {}
+    for plan in plans:
+        if plan['las_file'] is not None:
+            by_output.setdefault(plan['las_file'], []).append(plan)
+    collisions = {name: group for name, group in by_output.items() if len(group) > 1}
+    for group in collisions.values():
+        for plan in group:
+            others = [other['dlis_path'] for other in group if other is not plan]
+            plan['collision'] = '; '.join(others)
+    return collisions
+
+def simulate_pool(plans, n_workers):
+    """
+    Simula a fila do motor (maiores primeiro, próximo arquivo para o processo livre).
+
+    Retorno:
+        tuple: (duração estimada do lote em segundos, pior caso de memória
+            simultânea em MB: soma dos n_workers maiores picos)
+    """
+    finish = [0.0] * n_workers
+    for plan in plans:
+        slot = finish.index(min(finish))
+        finish[slot] += plan['est_seconds'] or 0.0
+    peaks = sorted((plan['peak_memory_mb'] or 0.0 for plan in plans), reverse=True)
+    return max(finish), sum(peaks[:n_workers])
+
+def worker_counts(n_workers):
+    """Números de processos avaliados no plano: potências de 2 até n_workers"""
+    n_workers = n_workers or os.cpu_count() or 1
+    counts = []
+    count = 1
+    while count < n_workers:
+        counts.append(count)
+        count *= 2
+    return counts + [n_workers]
+
+def write_plan(plans, plan_path):
+    """Grava o plano em CSV, uma linha por arquivo"""
+    with open(plan_path, 'w', newline='', encoding='utf-8') as file_object:
+        writer = csv.DictWriter(file_object, fieldnames=CSV_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        for plan in plans:
+            writer.writerow({key: (round(value, 3) if isinstance(value, float) else value)
+                             for key, value in plan.items()})
+
+def plan_dlis_files(dlis_root=DLIS_ROOT_DIR, las_output_dir=LAS_OUTPUT_DIR, states=None, n_workers=N_WORKERS,
+                    output_format=OUTPUT_FORMAT, chunk_rows=CHUNK_ROWS, depth_step=DEPTH_STEP,
+                    compact=COMPACT_FLOAT32, plan_path=PLAN_PATH, profile_path=CALIBRATION_PROFILE_PATH):
+    """
+    Planeja a conversão de todos os arquivos DLIS sem converter nenhum
+
+    Parâmetros:
+        dlis_root (str): Pasta com uma subpasta por estado
+        las_output_dir (str): Pasta de saída (só para montar os nomes)
+        states (list): Siglas a planejar; None planeja todas as subpastas
+        n_workers (int): Processos usados na leitura dos cabeçalhos e maior
+            número de processos avaliado na simulação da fila
+        output_format, chunk_rows, depth_step, compact: Mesmas opções da
+            conversão (OUTPUT_FORMAT, CHUNK_ROWS, DEPTH_STEP, COMPACT_FLOAT32)
+        plan_path (str): CSV do plano; None não grava
+        profile_path (str): Perfil .jsonl de conversões anteriores para
+            estimar o tempo (ver seconds_per_decoded_mb)
+
+    Retorno:
+        list: Um dicionário por arquivo, na ordem da fila (maiores primeiro)
+    """
+    jobs = discover_dlis_files(dlis_root, states)
+    print(f"\nPlanejando {len(jobs)} arquivos DLIS (só cabeçalhos)")
+
+    plans = []
+    args = (las_output_dir, output_format, chunk_rows, depth_step, compact)
+    for job, result, failure in run_isolated(plan_dlis_file, jobs, args, n_workers, FILE_TIMEOUT, MEMORY_LIMIT_MB):
+        plans.append(result if failure is None else empty_plan(job, failure))
+    order = {job['dlis_path']: i for i, job in enumerate(jobs)}
+    plans.sort(key=lambda plan: order[plan['dlis_path']])
+
+    seconds_per_mb = seconds_per_decoded_mb(profile_path)
+    for plan in plans:
+        decoded_mb = plan.get('decoded_mb')
+        plan['est_seconds'] = decoded_mb * seconds_per_mb if seconds_per_mb and decoded_mb is not None else None
+    collisions = find_collisions(plans)
+
+    if plan_path:
+        write_plan(plans, plan_path)
+    print_plan(plans, collisions, n_workers, seconds_per_mb)
+    return plans
+
+def print_plan(plans, collisions, n_workers, seconds_per_mb):
+    """Exibe o plano por arquivo, as colisões de nome e a simulação da fila"""
+    print(f"\n{'Arquivo':<40} {'LAS':<22} {'Linhas':>9} {'Canais':>6} {'Decod. MB':>10} "
+          f"{'Saída MB':>9} {'Pico MB':>8}")
+    for plan in plans:
+        if plan.get('n_rows') is None:
+            print(f"{plan['dlis_file']:<40} ⚠️ {plan['error']}")
+            continue
+        warning = ' ⚠️ acima de MEMORY_LIMIT_MB' if MEMORY_LIMIT_MB and plan['peak_memory_mb'] > MEMORY_LIMIT_MB else ''
+        print(f"{plan['dlis_file']:<40} {plan['las_file'] or '?':<22} {plan['n_rows']:>9} {plan['n_curves']:>6} "
+              f"{plan['decoded_mb']:>10.1f} {plan['output_mb'] + plan['sidecar_mb']:>9.1f} "
+              f"{plan['peak_memory_mb']:>8.1f}{warning}")
+
+    planned = [plan for plan in plans if plan.get('n_rows') is not None]
+    print(f"\n• Arquivos planejados: {len(planned)} de {len(plans)}")
+    print(f"• Volume decodificado: {sum(plan['decoded_mb'] for plan in planned):.1f} MB")
+    print(f"• Saída estimada: {sum(plan['output_mb'] + plan['sidecar_mb'] for plan in planned):.1f} MB")
+    naming_errors = [plan for plan in plans if (plan['error'] or '').startswith('regra de nomenclatura')]
+    if naming_errors:
+        print(f"• Sem nome de saída: {len(naming_errors)}")
+        for plan in naming_errors:
+            print(f"  - {plan['dlis_path']}: {plan['error']}")
+    if collisions:
+        print(f"• ❌ Colisões de nome: {len(collisions)}")
+        for name, group in collisions.items():
+            print(f"  - {name}: {', '.join(plan['dlis_path'] for plan in group)}")
+
+    if not planned:
+        return
+    print("\nSIMULAÇÃO DA FILA")
+    if seconds_per_mb is None:
+        print("(sem perfil de calibração: defina PROFILE_PATH no motor e converta alguns arquivos para estimar tempo)")
+    for count in worker_counts(n_workers):
+        duration, memory = simulate_pool(planned, count)
+        duration_text = f"{duration / 60:8.1f} min" if seconds_per_mb else "       - "
+        print(f"• {count:>3} processos: {duration_text}, até {memory:,.0f} MB de memória simultânea")
+
+# =============================================================================
+# EXECUÇÃO PRINCIPAL
+# =============================================================================
+
+if __name__ == "__main__":
+    print("\nPLANEJANDO CONVERSÃO DE ARQUIVOS DLIS (DRY RUN)")
+    print(f"Diretório de entrada: {DLIS_ROOT_DIR}")
+    print(f"Plano: {PLAN_PATH}")
+
+    plan_dlis_files()
+
+    print("\nPLANEJAMENTO CONCLUÍDO!")
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Leitura antecipada (prefetch) dos arquivos DLIS da fila para uma pasta local.
+
+Com as entradas em um drive de rede ou sincronizado (OneDrive), cada
+conversão fica parada na leitura do arquivo antes de qualquer trabalho de
+CPU. Aqui, enquanto os arquivos atuais são convertidos, threads de fundo
+copiam os próximos N arquivos da fila para uma pasta de rascunho local; cada
+conversão lê a cópia local (job['read_path']) e a cópia é apagada assim que
+o arquivo termina. O nome, o estado, o cache e a quarentena continuam
+referindo-se ao caminho original (job['dlis_path']).
+
+Uso:
+    prefetcher = ScratchPrefetcher(jobs, depth=2)
+    try:
+        for job in prefetcher:          # espera só a cópia deste arquivo
+            ...                         # converte job['read_path']
+            prefetcher.release(job)
+        # prefetcher.ready() diz se o próximo item já sai sem esperar a cópia
+    finally:
+        prefetcher.close()
+"""
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# Prefixo da pasta de rascunho criada para cada lote
+SCRATCH_PREFIX = 'dlis2las_prefetch_'
+
+class ScratchPrefetcher:
+    """
+    Fila de arquivos com cópia antecipada para uma pasta local.
+
+    Parâmetros:
+        jobs (list): Itens da fila com 'dlis_path', na ordem de conversão
+        depth (int): Quantos arquivos além do atual são copiados antecipadamente
+        scratch_dir (str): Pasta onde a pasta de rascunho é criada; None usa a
+            pasta temporária do sistema
+    """
+
+    def __init__(self, jobs, depth, scratch_dir=None):
+        self.jobs = list(jobs)
+        self.depth = max(0, int(depth))
+        self.scratch_path = tempfile.mkdtemp(prefix=SCRATCH_PREFIX, dir=scratch_dir)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, self.depth), thread_name_prefix='prefetch')
+        self.futures = {}
+        self.position = 0  # índice do próximo item a entregar
+
+    def _copy(self, index, job):
+        """Copia um arquivo da fila para a pasta de rascunho (executado em thread)"""
+        target = os.path.join(self.scratch_path, f"{index:06d}_{os.path.basename(job['dlis_path'])}")
+        shutil.copyfile(job['dlis_path'], target)
+        return target
+
+    def _schedule(self, index):
+        if index < len(self.jobs) and index not in self.futures:
+            self.futures[index] = self.executor.submit(self._copy, index, self.jobs[index])
+
+    def __iter__(self):
+        """Entrega cada item com 'read_path' apontando para a cópia local já pronta"""
+        for index, job in enumerate(self.jobs):
+            # O atual e os próximos depth arquivos ficam copiando em segundo plano
+            for ahead in range(index, index + self.depth + 1):
+                self._schedule(ahead)
+            try:
+                job['read_path'] = self.futures.pop(index).result()
+            except OSError as e:
+                # Sem cópia local (ex.: disco de rascunho cheio): lê o original
+                print(f"⚠️ Prefetch de {job['dlis_path']} falhou ({e}); lendo o arquivo original")
+            self.position = index + 1
+            yield job
+
+    def ready(self):
+        """
+        Indica se o próximo item pode ser entregue sem esperar (cópia concluída
+        ou fila no fim); inicia a cópia dele se ainda não começou.
+        """
+        if self.position >= len(self.jobs):
+            return True
+        self._schedule(self.position)
+        return self.futures[self.position].done()
+
+    def release(self, job):
+        """Apaga a cópia local de um arquivo já convertido"""
+        read_path = job.pop('read_path', None)
+        if read_path is not None:
+            try:
+                os.remove(read_path)
+            except OSError:
+                pass
+
+    def close(self):
+        """Cancela as cópias pendentes e remove a pasta de rascunho"""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        shutil.rmtree(self.scratch_path, ignore_errors=True)
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentação opcional das etapas da conversão DLIS → LAS.
+
+Para cada arquivo convertido são medidos, por etapa (dlis.load, varredura de
+profundidade, decodificação dos frames, reamostragem, emenda, gravação...):
+tempo de parede, bytes lidos/decodificados, amostras produzidas, número de
+chamadas e pico de memória. O pico por etapa vem do tracemalloc (alocações
+feitas pelo Python e pelo NumPy) e o pico do processo de getrusage. O
+tracemalloc deixa trechos com muitas alocações pequenas (formatação do texto
+LAS) bem mais lentos; com trace_memory=False só o tempo, os bytes e as
+amostras são medidos, sem essa distorção.
+
+Cada arquivo gera uma linha JSON por etapa, mais uma linha 'total', anexadas
+ao arquivo .jsonl informado, o que permite agregar um lote inteiro com pandas:
+
+    pd.read_json('dlis2las_profile.jsonl', lines=True).groupby('stage').sum()
+
+Desativada (NULL_PROFILER), a instrumentação não custa nada além de um
+gerenciador de contexto vazio por etapa.
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# =============================================================================
+# MEDIÇÃO
+# =============================================================================
+
+def max_rss_bytes():
+    """Pico de memória residente do processo (None onde getrusage não existe)"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+def _empty_record():
+    """Medições zeradas de uma etapa"""
+    return {'calls': 0, 'wall_s': 0.0, 'bytes_read': 0, 'samples': 0, 'peak_mem_bytes': 0}
+
+class StageProfiler:
+    """
+    Acumula as medições de cada etapa de uma conversão.
+
+    Uso:
+        with profiler.stage('decode') as stage:
+            curves = frame.curves(strict=False)
+            stage['bytes_read'] += curves.nbytes
+    """
+
+    def __init__(self, dlis_path, output_path=None, trace_memory=True):
+        self.dlis_path = dlis_path
+        self.output_path = output_path
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.started = time.perf_counter()
+        self._tracing = trace_memory and not tracemalloc.is_tracing()
+        if self._tracing:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        """Mede um trecho; chamadas repetidas da mesma etapa são somadas"""
+        record = self.stages.setdefault(name, _empty_record())
+        counters = {'bytes_read': 0, 'samples': 0}
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield counters
+        finally:
+            record['wall_s'] += time.perf_counter() - start
+            record['calls'] += 1
+            record['bytes_read'] += int(counters['bytes_read'])
+            record['samples'] += int(counters['samples'])
+            if self.trace_memory:
+                record['peak_mem_bytes'] = max(record['peak_mem_bytes'], tracemalloc.get_traced_memory()[1])
+
+    def merge(self, stages):
+        """
+        Soma as etapas medidas em outro processo (ex.: workers de frames).
+
+        O tempo de parede é somado entre os processos, como tempo de CPU.
+        """
+        for name, other in stages.items():
+            record = self.stages.setdefault(name, _empty_record())
+            for key in ('calls', 'wall_s', 'bytes_read', 'samples'):
+                record[key] += other[key]
+            record['peak_mem_bytes'] = max(record['peak_mem_bytes'], other['peak_mem_bytes'])
+
+    def records(self):
+        """Uma linha por etapa, na ordem da primeira medição, mais a linha 'total'"""
+        common = {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'dlis_path': self.dlis_path,
+            'output_path': self.output_path,
+            'pid': os.getpid(),
+        }
+        lines = [dict(common, stage=name, **record) for name, record in self.stages.items()]
+        lines.append(dict(
+            common,
+            stage='total',
+            calls=1,
+            wall_s=time.perf_counter() - self.started,
+            bytes_read=sum(record['bytes_read'] for record in self.stages.values()),
+            samples=sum(record['samples'] for record in self.stages.values()),
+            peak_mem_bytes=max((record['peak_mem_bytes'] for record in self.stages.values()), default=0),
+            max_rss_bytes=max_rss_bytes(),
+        ))
+        if not self.trace_memory:
+            for line in lines:
+                line['peak_mem_bytes'] = None
+        return lines
+
+    def write(self, profile_path):
+        """Anexa as linhas JSON ao arquivo de perfil (uma única escrita por arquivo)"""
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+        text = ''.join(json.dumps(line, ensure_ascii=False) + '\n' for line in self.records())
+        with open(profile_path, 'a', encoding='utf-8') as file_object:
+            file_object.write(text)
+
+class _NullProfiler:
+    """Profiler desativado: mesmas chamadas, nenhuma medição"""
+
+    @contextmanager
+    def stage(self, name):
+        yield {'bytes_read': 0, 'samples': 0}
+
+    def merge(self, stages):
+        pass
+
+    def write(self, profile_path):
+        pass
+
+NULL_PROFILER = _NullProfiler()
+
+def make_profiler(dlis_path, output_path, profile_path, trace_memory=True):
+    """StageProfiler se profile_path for informado, senão NULL_PROFILER"""
+    return StageProfiler(dlis_path, output_path, trace_memory) if profile_path else NULL_PROFILER
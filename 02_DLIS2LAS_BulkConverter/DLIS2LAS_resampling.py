@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""
+Reamostragem dos frames DLIS para o grid global de profundidade.
+
+Em vez de chamar np.interp uma vez por canal (refazendo a mesma busca binária
+do grid contra a profundidade do frame a cada chamada), os índices vizinhos e
+os pesos de interpolação são calculados uma única vez por frame e aplicados à
+matriz com todos os canais em uma só operação NumPy.
+
+O resultado reproduz np.interp(depth_global, depth_values, canal,
+left=np.nan, right=np.nan) coluna a coluna. Cada frame é interpolado apenas
+na janela do grid coberta pelo seu intervalo de profundidade e emendado
+(splice) nas curvas de saída sem apagar os dados de outras passadas.
+
+Frames com amostragem mais fina que o passo de saída não são interpolados
+ponto a ponto (o que geraria aliasing): cada ponto do grid recebe a média ou
+a mediana das amostras dentro da sua célula [x - passo/2, x + passo/2).
+Lacunas de profundidade maiores que max_gap nunca são preenchidas.
+
+Os valores ausentes do DLIS (-999.25 e o declarado no arquivo) viram NaN
+antes da conversão de unidades e da reamostragem (mask_absent): senão entram
+nas médias dos blocos, são escalados pelos fatores de unidade e, na emenda,
+ocupam o grid no lugar dos dados reais de outra passada.
+"""
+
+import numpy as np
+
+# Regras de prioridade quando passadas (frames/logical files) se sobrepõem:
+# 'first'   - prevalece o primeiro frame lido; os seguintes só preenchem lacunas
+# 'last'    - prevalece o último frame lido onde ele tiver dados
+# 'longest' - prevalece o frame de maior extensão (passada principal sobre repetidas)
+SPLICE_PRIORITIES = ('first', 'last', 'longest')
+
+# Estatísticas aceitas na redução por blocos (frames mais finos que o grid)
+BLOCK_STATISTICS = ('mean', 'median')
+
+# Tolerância relativa para considerar o espaçamento nativo igual ao passo do grid
+SPACING_TOLERANCE = 1e-6
+
+# Valor ausente padrão do DLIS (RP66), gravado no lugar de amostras sem medida
+DLIS_ABSENT_VALUE = -999.25
+
+# =============================================================================
+# VALORES AUSENTES
+# =============================================================================
+
+def mask_absent(data, absent_values=(DLIS_ABSENT_VALUE,)):
+    """
+    Troca os valores ausentes por NaN, no lugar quando possível.
+
+    Parâmetros:
+        data (np.ndarray): Matriz de dados do frame, uma coluna por canal
+        absent_values (iterable): Valores que indicam amostra sem medida
+
+    Retorno:
+        np.ndarray: data com NaN nas amostras ausentes (promovida a float64 se
+            for inteira e tiver algum valor ausente)
+    """
+    absent = None
+    for value in absent_values:
+        hits = data == value
+        absent = hits if absent is None else absent | hits
+    if absent is None or not absent.any():
+        return data
+    if not np.issubdtype(data.dtype, np.floating):
+        data = data.astype(np.float64)
+    data[absent] = np.nan
+    return data
+
+# =============================================================================
+# REAMOSTRAGEM EM LOTE
+# =============================================================================
+
+def interpolation_weights(depth_global, depth_values):
+    """
+    Calcula, uma única vez por frame, os índices e pesos da interpolação linear.
+
+    Frames com direção decrescente (frame.direction == 'DECREASING') são
+    tratados invertendo a ordem das amostras por visão ([::-1]), sem cópia.
+
+    Parâmetros:
+        depth_global (np.ndarray): Grid de saída, crescente
+        depth_values (np.ndarray): Profundidade das amostras do frame
+
+    Retorno:
+        dict: 'reverse' (bool), 'window' (fatia do grid coberta pelo frame),
+            'lower' (índice da amostra imediatamente acima de cada ponto),
+            'offset' (distância até essa amostra), 'step' (distância entre as
+            amostras vizinhas), 'exact' (pontos que coincidem com uma amostra,
+            a menos de SPACING_TOLERANCE do espaçamento) e 'exact_index'
+            (índice dessa amostra)
+    """
+    reverse = len(depth_values) > 1 and depth_values[0] > depth_values[-1]
+    if reverse:
+        depth_values = depth_values[::-1]
+
+    # Janela contígua do grid dentro do intervalo do frame; fora dela o
+    # resultado seria NaN (left/right do np.interp), então nada é calculado
+    start = np.searchsorted(depth_global, depth_values[0], side='left')
+    stop = np.searchsorted(depth_global, depth_values[-1], side='right')
+    window = slice(start, max(start, stop))
+    x = depth_global[window]
+
+    # Maior amostra <= x; o índice é limitado para sempre existir a vizinha de baixo
+    lower = np.clip(np.searchsorted(depth_values, x, side='right') - 1, 0, max(len(depth_values) - 2, 0))
+    upper = np.minimum(lower + 1, len(depth_values) - 1)
+    offset = x - depth_values[lower]
+    step = depth_values[upper] - depth_values[lower]
+
+    # Amostra mais próxima de cada ponto. O grid (np.arange) e a profundidade
+    # convertida divergem nos últimos bits: sem a tolerância, um ponto sobre
+    # uma amostra válida com a vizinha ausente (NaN) seria interpolado para NaN
+    exact_index = np.where(offset <= step / 2, lower, upper)
+    exact = np.abs(x - depth_values[exact_index]) <= SPACING_TOLERANCE * step
+
+    return {
+        'reverse': reverse,
+        'window': window,
+        'lower': lower,
+        'offset': offset,
+        'step': step,
+        'exact': exact,
+        'exact_index': exact_index,
+    }
+
+def resample_window(depth_global, depth_values, data, max_gap=None):
+    """
+    Reamostra todos os canais de um frame apenas na janela do grid que ele cobre.
+
+    Parâmetros:
+        depth_global (np.ndarray): Grid de saída, crescente (n_grid,)
+        depth_values (np.ndarray): Profundidade das amostras do frame (n_amostras,)
+        data (np.ndarray): Matriz com um canal por coluna (n_amostras, n_canais)
+        max_gap (float): Pontos entre amostras vizinhas mais distantes que isso
+            ficam NaN (a lacuna não é interpolada); None interpola sempre
+
+    Retorno:
+        tuple: (window, values) - fatia do grid coberta pelo frame e matriz
+            (n_janela, n_canais) com os valores interpolados nessa fatia
+    """
+    if len(depth_values) == 0:
+        return slice(0, 0), np.empty((0, data.shape[1]))
+
+    weights = interpolation_weights(depth_global, depth_values)
+    if weights['reverse']:
+        data = data[::-1]
+
+    lower = weights['lower']
+    lower_values = data[lower]
+    upper_values = data[np.minimum(lower + 1, len(data) - 1)]
+
+    # Mesma fórmula do np.interp: inclinação * distância + valor da amostra de cima
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (upper_values - lower_values) / weights['step'][:, None]
+        values = slope * weights['offset'][:, None] + lower_values
+
+    # Lacunas maiores que max_gap não são atravessadas pela interpolação
+    if max_gap is not None:
+        values[weights['step'] > max_gap] = np.nan
+
+    # Pontos que caem exatamente sobre uma amostra recebem o valor dela
+    exact = weights['exact']
+    values[exact] = data[weights['exact_index'][exact]]
+
+    return weights['window'], values
+
+def block_window(depth_global, depth_values, data, statistic='mean', step=None):
+    """
+    Reduz um frame mais fino que o grid pela média ou mediana de cada célula.
+
+    Cada ponto x do grid recebe as amostras com profundidade em
+    [x - passo/2, x + passo/2), ignorando NaN. Células sem amostras válidas
+    ficam NaN, então lacunas de profundidade nunca são preenchidas. A média
+    de todos os canais sai de uma única np.add.reduceat sobre as células.
+
+    Parâmetros:
+        depth_global (np.ndarray): Grid de saída, crescente e regular (n_grid,)
+        depth_values (np.ndarray): Profundidade das amostras do frame (n_amostras,)
+        data (np.ndarray): Matriz com um canal por coluna (n_amostras, n_canais)
+        statistic (str): 'mean' ou 'median' (ver BLOCK_STATISTICS)
+        step (float): Passo do grid completo. No modo streaming depth_global é
+            só um bloco do grid, que pode ter uma única linha; None deduz o
+            passo de depth_global
+
+    Retorno:
+        tuple: (window, values), como em resample_window
+    """
+    if statistic not in BLOCK_STATISTICS:
+        raise ValueError(f"Estatística de redução inválida: {statistic} (use {BLOCK_STATISTICS})")
+
+    if len(depth_values) > 1 and depth_values[0] > depth_values[-1]:
+        depth_values = depth_values[::-1]
+        data = data[::-1]
+
+    # Célula do grid de cada amostra; amostras fora do grid são descartadas
+    if step is None:
+        step = depth_global[1] - depth_global[0] if len(depth_global) > 1 else 1.0
+    cells = np.floor((depth_values - depth_global[0]) / step + 0.5).astype(np.int64)
+    inside = (cells >= 0) & (cells < len(depth_global))
+    cells = cells[inside]
+    data = np.asarray(data[inside], dtype=np.float64)
+    if len(cells) == 0:
+        return slice(0, 0), np.empty((0, data.shape[1]))
+
+    # Com a profundidade crescente cada célula é um bloco contíguo de amostras
+    window = slice(int(cells[0]), int(cells[-1]) + 1)
+    starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+    valid = ~np.isnan(data)
+    n_valid = np.add.reduceat(valid, starts, axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if statistic == 'mean':
+            reduced = np.add.reduceat(np.where(valid, data, 0.0), starts, axis=0) / n_valid
+        else:
+            # Ordena cada célula por valor (NaN vão para o fim) e pega o(s) valor(es) do meio
+            reduced = np.empty((len(starts), data.shape[1]))
+            lower = starts[:, None] + np.maximum(n_valid - 1, 0) // 2
+            upper = starts[:, None] + n_valid // 2
+            for j in range(data.shape[1]):
+                ordered = data[np.lexsort((data[:, j], cells)), j]
+                reduced[:, j] = (ordered[lower[:, j]] + ordered[upper[:, j]]) / 2
+    reduced[n_valid == 0] = np.nan
+
+    values = np.full((window.stop - window.start, data.shape[1]), np.nan)
+    values[cells[starts] - window.start] = reduced
+    return window, values
+
+def frame_resampler(depth_global, spacing, statistic='mean', max_gap=None):
+    """
+    Escolhe a reamostragem de um frame conforme o seu espaçamento nativo.
+
+    Parâmetros:
+        depth_global (np.ndarray): Grid de saída, crescente e regular
+        spacing (float): Espaçamento nativo do frame, na unidade do grid
+        statistic (str): Estatística da redução por blocos ('mean', 'median'
+            ou None para sempre interpolar)
+        max_gap (float): Maior lacuna interpolada (ver resample_window), nunca
+            menor que 1,5 vez o espaçamento nativo
+
+    Retorno:
+        function: f(grid, depth_values, data) -> (window, values). Redução por
+            blocos se o frame for mais fino que o grid, senão interpolação linear
+    """
+    step = depth_global[1] - depth_global[0] if len(depth_global) > 1 else None
+    if statistic and step and spacing and spacing < step * (1 - SPACING_TOLERANCE):
+        # O passo vem do grid completo: um bloco de streaming pode ter uma só linha
+        return lambda grid, depth_values, data: block_window(grid, depth_values, data, statistic, step)
+
+    # O espaçamento nativo de um frame esparso nunca é tratado como lacuna
+    if max_gap is not None and spacing:
+        max_gap = max(max_gap, 1.5 * spacing)
+    return lambda grid, depth_values, data: resample_window(grid, depth_values, data, max_gap)
+
+# =============================================================================
+# EMENDA (SPLICE) DAS PASSADAS
+# =============================================================================
+
+def order_frames(frames, priority):
+    """
+    Ordena os frames para a emenda conforme a regra de prioridade.
+
+    Com 'longest' os frames de maior extensão (index_max - index_min, lido do
+    cabeçalho) vêm primeiro; nas demais regras a ordem de leitura é mantida.
+    """
+    if priority not in SPLICE_PRIORITIES:
+        raise ValueError(f"Prioridade de emenda inválida: {priority} (use {SPLICE_PRIORITIES})")
+    if priority == 'longest':
+        return sorted(frames, key=lambda frame: abs(frame.index_max - frame.index_min), reverse=True)
+    return list(frames)
+
+def splice_window(target, window, values, priority):
+    """
+    Emenda os valores de um frame na curva de saída, apenas dentro da janela.
+
+    Parâmetros:
+        target (np.ndarray): Curva de saída no grid global (alterada no lugar)
+        window (slice): Fatia do grid coberta pelo frame
+        values (np.ndarray): Valores reamostrados nessa fatia
+        priority (str): Regra de prioridade (ver SPLICE_PRIORITIES)
+    """
+    segment = target[window]
+    if priority == 'last':
+        # Sobrescreve onde o frame atual tem dados
+        mask = ~np.isnan(values)
+    else:
+        # 'first' e 'longest' (frames já ordenados): só preenche lacunas
+        mask = np.isnan(segment)
+    segment[mask] = values[mask]
+
+def unowned_rank(priority, dtype):
+    """Dono inicial das amostras em splice_ranked: perde para qualquer frame"""
+    return -1 if priority == 'last' else np.iinfo(dtype).max
+
+def splice_ranked(target, owner, window, values, rank, priority):
+    """
+    Emenda independente da ordem de chegada dos frames (conversão paralela).
+
+    owner guarda, para cada amostra, o rank (posição na ordem de order_frames)
+    do frame que a preencheu, inicializado com unowned_rank. O frame atual
+    só substitui amostras de frames de menor prioridade: com 'first' e
+    'longest' prevalece o menor rank com dados, com 'last' o maior. O
+    resultado final é o mesmo de splice_window com os frames em sequência.
+
+    Parâmetros:
+        target (np.ndarray): Curva de saída no grid global (alterada no lugar)
+        owner (np.ndarray): Rank do dono de cada amostra, mesma forma de target
+        window (slice): Fatia do grid coberta pelo frame
+        values (np.ndarray): Valores reamostrados nessa fatia
+        rank (int): Posição do frame na ordem de prioridade
+        priority (str): Regra de prioridade (ver SPLICE_PRIORITIES)
+    """
+    segment = target[window]
+    owners = owner[window]
+    mask = ~np.isnan(values)
+    if priority == 'last':
+        mask &= owners < rank
+    else:
+        mask &= owners > rank
+    segment[mask] = values[mask]
+    owners[mask] = rank
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Leitura parcial de frames DLIS para a conversão em modo streaming.
+
+frame.curves() sempre decodifica o frame inteiro. Aqui são usados os mesmos
+recursos internos do dlisio que ele usa (fdata_index com a posição de cada
+registro FDATA e core.read_fdata), mas restritos a um intervalo de linhas ou a
+uma única coluna, para que a memória dependa do tamanho do bloco e não do
+comprimento do poço.
+"""
+
+import numpy as np
+from dlisio import core
+
+# =============================================================================
+# LEITURA PARCIAL DOS FRAMES
+# =============================================================================
+
+def _read_fdata(frame, indices, dtype, pre_fmt, fmt, post_fmt):
+    """Decodifica os registros FDATA indicados (mesma chamada usada por frame.curves)"""
+    lf = frame.logicalfile
+    return core.read_fdata(
+        pre_fmt,
+        fmt,
+        post_fmt,
+        lf.file,
+        indices,
+        dtype.itemsize,
+        lambda size: np.empty(shape=size, dtype=dtype),
+        lf.error_handler
+    )
+
+def frame_record_indices(frame):
+    """Posição no arquivo de cada registro FDATA (uma linha) do frame"""
+    return frame.logicalfile.fdata_index.get(frame.fingerprint, [])
+
+def read_frame_rows(frame, start, stop):
+    """
+    Decodifica apenas as linhas [start, stop) do frame.
+
+    Retorno:
+        np.ndarray: Array estruturado com os mesmos campos de frame.curves(strict=False)
+    """
+    indices = frame_record_indices(frame)[start:stop]
+    return _read_fdata(frame, indices, frame.dtype(strict=False), '', frame.fmtstr(), '')
+
+def read_frame_column(frame, channel):
+    """
+    Decodifica uma única coluna do frame em todas as linhas.
+
+    Os bytes dos demais canais são apenas pulados (pre_fmt/post_fmt), então só
+    a coluna pedida é alocada.
+    """
+    position = frame.channels.index(channel)
+    pre_fmt = 'i' + ''.join(ch.fmtstr() for ch in frame.channels[:position])
+    post_fmt = ''.join(ch.fmtstr() for ch in frame.channels[position + 1:])
+    dtype = np.dtype([(channel.name, channel.dtype)])
+
+    curves = _read_fdata(frame, frame_record_indices(frame), dtype, pre_fmt, channel.fmtstr(), post_fmt)
+    return curves[channel.name]
+
+def frame_rows_for(depth_values, grid, margin=0.0):
+    """
+    Intervalo de linhas do frame necessário para reamostrar um bloco do grid.
+
+    Inclui a amostra imediatamente acima do primeiro ponto e a imediatamente
+    abaixo do último, de modo que a interpolação no bloco usa exatamente os
+    mesmos vizinhos da interpolação do frame inteiro. Com margin (meio passo
+    na redução por blocos) o intervalo é ampliado para incluir todas as
+    amostras das células das pontas.
+
+    Retorno:
+        tuple: (primeira_linha, última_linha + 1) na ordem original do frame,
+            ou None se o frame não cobre o bloco
+    """
+    n = len(depth_values)
+    if n == 0 or len(grid) == 0:
+        return None
+
+    reverse = n > 1 and depth_values[0] > depth_values[-1]
+    ordered = depth_values[::-1] if reverse else depth_values
+    top, bottom = grid[0] - margin, grid[-1] + margin
+    if bottom < ordered[0] or top > ordered[-1]:
+        return None
+
+    first = max(np.searchsorted(ordered, top, side='right') - 1, 0)
+    last = min(np.searchsorted(ordered, bottom, side='right') + 1, n)
+    if reverse:
+        first, last = n - last, n - first
+    return int(first), int(last)
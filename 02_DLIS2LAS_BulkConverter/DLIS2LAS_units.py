@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+Registro de unidades e conversão vetorizada de profundidade e curvas.
+
+Cada unidade conhecida é registrada uma única vez com sua dimensão e o fator
+(escala, deslocamento) para a unidade base da dimensão. A conversão entre
+duas unidades vira um par (escala, deslocamento), calculado uma vez e
+guardado em cache, aplicado depois como uma única operação NumPy sobre a
+matriz de dados de cada frame: valor_destino = valor * escala + deslocamento.
+
+A profundidade é sempre normalizada para metros (o grid, DEPTH_STEP e
+MAX_GAP estão em metros). Uma unidade de profundidade desconhecida com 'ft'
+no nome é tratada como pé (com aviso); as demais interrompem a conversão do
+arquivo, em vez de serem tomadas por metros. As curvas vão para a unidade alvo do canal
+padronizado em TARGET_UNITS (os mesmos nomes de 03_LAS2IntegratedDF); canais
+sem alvo ficam na unidade da primeira ocorrência, e passadas registradas em
+outra unidade compatível são convertidas para ela. Unidades desconhecidas ou
+incompatíveis passam sem conversão.
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+
+# Unidade de saída da profundidade
+DEPTH_UNIT = 'm'
+
+# Unidade alvo por canal padronizado (ver LAS2DF_channels de 03_LAS2IntegratedDF)
+TARGET_UNITS = {
+    'SONIC': 'us/m',        # Sônico
+    'SLOWNESS': 'us/m',     # Vagarosidade
+    'TEMP_OUT': 'degC',     # Temperatura de saída
+    'TEMP_INTAKE': 'degC',  # Temperatura de entrada
+    'CALI': 'in',           # Caliper
+    'DEN': 'g/cm3',         # Densidade
+    'PRESSURE': 'kPa',      # Pressão
+}
+
+# Mnemônicos do DLIS de cada canal padronizado com unidade alvo; sufixos
+# numéricos de passadas repetidas (DT_1, TOT_2) são ignorados
+STANDARD_CHANNELS = {
+    'DT': 'SONIC',
+    'DTSI': 'SLOWNESS',
+    'TOT': 'TEMP_OUT',
+    'TOTD': 'TEMP_OUT',
+    'ITT': 'TEMP_INTAKE',
+    'CALI': 'CALI',
+    'CAL': 'CALI',
+    'CIL': 'CALI',
+    'CALS': 'CALI',
+    'CAL1': 'CALI',
+    'CALT': 'CALI',
+    'RHOB': 'DEN',
+    'RHOT': 'DEN',
+    'PESS': 'PRESSURE',
+}
+
+# Unidade -> (dimensão, escala, deslocamento) para a base da dimensão:
+# comprimento em m, vagarosidade em s/m, temperatura em K, densidade em kg/m3,
+# pressão em Pa e tempo em s
+UNITS = {
+    'm': ('length', 1.0, 0.0),
+    'cm': ('length', 0.01, 0.0),
+    'mm': ('length', 0.001, 0.0),
+    'km': ('length', 1000.0, 0.0),
+    'ft': ('length', 0.3048, 0.0),
+    'usft': ('length', 1200.0 / 3937.0, 0.0),  # Pé de levantamento dos EUA
+    'in': ('length', 0.0254, 0.0),
+    'us/m': ('slowness', 1e-6, 0.0),
+    'us/ft': ('slowness', 1e-6 / 0.3048, 0.0),
+    's/m': ('slowness', 1.0, 0.0),
+    's/ft': ('slowness', 1.0 / 0.3048, 0.0),
+    'degC': ('temperature', 1.0, 273.15),
+    'degF': ('temperature', 5.0 / 9.0, 273.15 - 32.0 * 5.0 / 9.0),
+    'K': ('temperature', 1.0, 0.0),
+    'g/cm3': ('density', 1000.0, 0.0),
+    'kg/m3': ('density', 1.0, 0.0),
+    'Pa': ('pressure', 1.0, 0.0),
+    'kPa': ('pressure', 1e3, 0.0),
+    'MPa': ('pressure', 1e6, 0.0),
+    'psi': ('pressure', 6894.757293168361, 0.0),
+    'bar': ('pressure', 1e5, 0.0),
+    's': ('time', 1.0, 0.0),
+    'ms': ('time', 1e-3, 0.0),
+    'us': ('time', 1e-6, 0.0),
+}
+
+# Grafias encontradas nos arquivos (em minúsculas, sem espaços) -> unidade registrada
+UNIT_ALIASES = {
+    'meter': 'm', 'meters': 'm', 'metre': 'm', 'metres': 'm',
+    'feet': 'ft', 'foot': 'ft',
+    'ftus': 'usft', 'ft(us)': 'usft', 'us-ft': 'usft', 'us_ft': 'usft', 'ft_us': 'usft',
+    'usfeet': 'usft', 'usfoot': 'usft', 'surveyft': 'usft', 'surveyfoot': 'usft', 'surveyfeet': 'usft',
+    'inch': 'in', 'inches': 'in',
+    'usec/ft': 'us/ft', 'µs/ft': 'us/ft', 'μs/ft': 'us/ft', 'us/f': 'us/ft',
+    'usec/m': 'us/m', 'µs/m': 'us/m', 'μs/m': 'us/m',
+    'degc': 'degC', 'degf': 'degF', 'deg_c': 'degC', 'deg_f': 'degF', '°c': 'degC', '°f': 'degF',
+    'g/cc': 'g/cm3', 'gm/cc': 'g/cm3', 'g/c3': 'g/cm3', 'g/cm³': 'g/cm3',
+    'kg/m³': 'kg/m3',
+    'pa': 'Pa', 'kpa': 'kPa', 'mpa': 'MPa',
+    'msec': 'ms', 'usec': 'us', 'µs': 'us', 'μs': 'us',
+}
+
+# Multiplicador numérico opcional antes da unidade (RP66: "0.1 in", "0.5 ms")
+_SCALED_UNIT = re.compile(r'^\s*([0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?)\s+(\S.*)$')
+
+# Fator que não altera os valores
+IDENTITY = (1.0, 0.0)
+
+# =============================================================================
+# REGISTRO
+# =============================================================================
+
+def _registered_unit(symbol):
+    """Unidade registrada para uma grafia (ou None)"""
+    if symbol in UNITS:
+        return symbol
+    key = symbol.strip().lower().replace(' ', '')
+    if key in UNIT_ALIASES:
+        return UNIT_ALIASES[key]
+    return next((unit for unit in UNITS if unit.lower() == key), None)
+
+@lru_cache(maxsize=None)
+def unit_definition(unit):
+    """
+    Dimensão e fator de uma unidade para a base da sua dimensão.
+
+    Retorno:
+        tuple: (dimensão, escala, deslocamento), ou None se a unidade for
+            vazia ou desconhecida
+    """
+    if not unit:
+        return None
+    multiplier = 1.0
+    match = _SCALED_UNIT.match(unit)
+    if match:
+        multiplier, unit = float(match.group(1)), match.group(2)
+    registered = _registered_unit(unit)
+    if registered is None:
+        return None
+    dimension, scale, offset = UNITS[registered]
+    return dimension, scale * multiplier, offset
+
+@lru_cache(maxsize=None)
+def conversion_factors(source_unit, target_unit):
+    """
+    Fator de conversão entre duas unidades.
+
+    Retorno:
+        tuple: (escala, deslocamento) tal que destino = origem * escala +
+            deslocamento, ou None se alguma unidade for desconhecida ou as
+            dimensões forem diferentes
+    """
+    source = unit_definition(source_unit)
+    target = unit_definition(target_unit)
+    if source is None or target is None or source[0] != target[0]:
+        return None
+    _, source_scale, source_offset = source
+    _, target_scale, target_offset = target
+    return source_scale / target_scale, (source_offset - target_offset) / target_scale
+
+# =============================================================================
+# PROFUNDIDADE E CANAIS
+# =============================================================================
+
+def depth_scale(depth_channel):
+    """
+    Fator que leva o índice de profundidade do frame para metros.
+
+    Unidade vazia é tratada como metros.
+
+    Exceções:
+        ValueError: Unidade desconhecida (ou que não é de comprimento) sem
+            'ft' no nome
+    """
+    return depth_unit_scale(depth_channel.units or None)
+
+@lru_cache(maxsize=None)
+def depth_unit_scale(unit):
+    """Fator de uma unidade de profundidade para metros (ver depth_scale)"""
+    if unit is None:
+        return 1.0
+    factors = conversion_factors(unit, DEPTH_UNIT)
+    if factors is not None:
+        return factors[0]
+    # Mesma regra de antes do registro de unidades: qualquer grafia com 'ft' é pé
+    if 'ft' in unit.lower():
+        print(f"⚠️ Unidade de profundidade desconhecida '{unit}' tratada como pé (ft)")
+        return UNITS['ft'][1]
+    raise ValueError(f"Unidade de profundidade desconhecida: '{unit}'")
+
+def standard_channel(mnemonic):
+    """Canal padronizado de um mnemônico do DLIS (ou None se não tiver unidade alvo)"""
+    return STANDARD_CHANNELS.get(re.sub(r'_\d+$', '', mnemonic))
+
+def output_unit(mnemonic, unit, target_units=TARGET_UNITS):
+    """
+    Unidade de saída de um canal.
+
+    Parâmetros:
+        mnemonic (str): Nome do canal no DLIS
+        unit (str): Unidade da primeira ocorrência do canal
+        target_units (dict): Unidade alvo por canal padronizado
+
+    Retorno:
+        str: A unidade alvo do canal padronizado, se a conversão a partir de
+            unit for conhecida; senão a própria unit
+    """
+    target = target_units.get(standard_channel(mnemonic))
+    if target is not None and conversion_factors(unit or None, target) is not None:
+        return target
+    return unit or ''
+
+def column_factors(source_units, target_units):
+    """
+    Fatores de conversão de cada coluna de uma matriz de dados.
+
+    Parâmetros:
+        source_units (list): Unidade de cada coluna no frame
+        target_units (list): Unidade de saída de cada coluna
+
+    Retorno:
+        tuple: (escalas, deslocamentos) como arrays para broadcast sobre as
+            colunas, ou None se nenhuma coluna precisar de conversão
+    """
+    factors = [
+        (conversion_factors(source or None, target or None) or IDENTITY) if source != target else IDENTITY
+        for source, target in zip(source_units, target_units)
+    ]
+    if all(factor == IDENTITY for factor in factors):
+        return None
+    scales, offsets = zip(*factors)
+    return np.array(scales), np.array(offsets)
+
+def apply_factors(data, factors):
+    """
+    Converte uma matriz (n_amostras, n_colunas) com uma operação por array.
+
+    A matriz é convertida no lugar quando já é float64 (ex.: saída do
+    np.stack das colunas do frame); senão é promovida a float64 antes.
+
+    Parâmetros:
+        data (np.ndarray): Matriz de dados do frame, uma coluna por canal
+        factors (tuple): (escalas, deslocamentos) de column_factors, ou None
+
+    Retorno:
+        np.ndarray: Matriz nas unidades de saída
+    """
+    if factors is None:
+        return data
+    scales, offsets = factors
+    if data.dtype != np.float64:
+        data = data.astype(np.float64)
+    np.multiply(data, scales, out=data)
+    if offsets.any():
+        np.add(data, offsets, out=data)
+    return data
@@ -10,6 +10,8 @@ import lasio
 import pandas as pd
 from tqdm import tqdm
 
+from LAS2DF_prefetch import prefetched
+
 # =============================================================================
 # CONFIGURAÇÕES GLOBAIS
 # =============================================================================
@@ -17,25 +19,37 @@ from tqdm import tqdm
 INPUT_DIR  = "C:/Users/Theresa/OneDrive/PESQUISA/LabMeg_Exxon/PMP_BC_WELL_LOGGING/03_LAS2IntegratedDF/LAS_input"
 OUTPUT_DIR = "C:/Users/Theresa/OneDrive/PESQUISA/LabMeg_Exxon/PMP_BC_WELL_LOGGING/03_LAS2IntegratedDF/DF_output_02"
 
+# Modo compacto: curvas gravadas a partir de float32 (a profundidade, primeira
+# curva do LAS, mantém a precisão original). Use o mesmo valor nas etapas 03 e 04
+COMPACT_FLOAT32 = False
+
+# Leitura antecipada: arquivos copiados para uma pasta local em segundo plano
+# enquanto o atual é processado (0 desativa; ver LAS2DF_prefetch)
+PREFETCH_DEPTH = 2
+
 # =============================================================================
 # FUNÇÕES DE PROCESSAMENTO
 # =============================================================================
 
-def las_to_csv(las_path, output_path):
+def las_to_csv(las_path, output_path, compact=COMPACT_FLOAT32):
     """Converte um arquivo LAS para CSV mantendo os nomes originais"""
     # Cria diretório de saída se não existir
-    os.makedirs(output_path, exist_ok=True)
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
     
     try:
         las = lasio.read(las_path)
         data = {curve.mnemonic: las[curve.mnemonic] for curve in las.curves}
+        if compact:
+            # A primeira curva é o índice de profundidade
+            for mnemonic in list(data)[1:]:
+                data[mnemonic] = data[mnemonic].astype('float32')
         pd.DataFrame(data).to_csv(output_path, index=False)
         return True
     except Exception as e:
         print(f"❌ Erro em {os.path.basename(las_path)}: {str(e)}")
         return False
 
-def process_directory(input_dir, output_dir):
+def process_directory(input_dir, output_dir, compact=COMPACT_FLOAT32, prefetch_depth=PREFETCH_DEPTH):
     """Processa todos os arquivos LAS de um diretório"""
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
@@ -44,11 +58,12 @@ def process_directory(input_dir, output_dir):
     print(f"🔍 Encontrados {len(las_files)} arquivos LAS para conversão")
     
     success_count = 0
-    for las_file in tqdm(las_files, desc="Convertendo"):
-        input_path = os.path.join(input_dir, las_file)
-        output_path = os.path.join(output_dir, f"{os.path.splitext(las_file)[0]}.csv")
+    input_paths = [os.path.join(input_dir, las_file) for las_file in las_files]
+    for input_path, local_path in tqdm(prefetched(input_paths, prefetch_depth), total=len(input_paths),
+                                       desc="Convertendo"):
+        output_path = os.path.join(output_dir, f"{os.path.splitext(os.path.basename(input_path))[0]}.csv")
         
-        if las_to_csv(input_path, output_path):
+        if las_to_csv(local_path, output_path, compact):
             success_count += 1
     
     print(f"\n✅ Conversão concluída: {success_count}/{len(las_files)} arquivos processados com sucesso")
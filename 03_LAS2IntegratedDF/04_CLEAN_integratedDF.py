@@ -8,6 +8,9 @@ import os
 import pandas as pd
 from tqdm import tqdm
 
+from LAS2DF_coverage import CoverageBuilder
+from LAS2DF_prefetch import prefetched
+
 # =============================================================================
 # CONFIGURAÇÕES GLOBAIS
 # =============================================================================
@@ -15,6 +18,23 @@ INPUT_DIR    = r"C:\Users\Theresa\OneDrive\PESQUISA\LabMeg_Exxon\PMP_BC_WELL_LOG
 OUTPUT_PATH  = r"C:\Users\Theresa\OneDrive\PESQUISA\LabMeg_Exxon\PMP_BC_WELL_LOGGING\03_LAS2IntegratedDF\DF_output_04\integrated_data.csv"
 OUTPUT_PATH2 = r"C:\Users\Theresa\OneDrive\PESQUISA\LabMeg_Exxon\PMP_BC_WELL_LOGGING\03_LAS2IntegratedDF\DF_output_04\cleaned_data.csv"
 
+# Modo compacto: curvas em float32 no DataFrame integrado (metade da memória);
+# DEPTH continua em float64 e ID como texto
+COMPACT_FLOAT32 = False
+
+# Leitura antecipada: arquivos copiados para uma pasta local em segundo plano
+# enquanto o atual é processado (0 desativa; ver LAS2DF_prefetch)
+PREFETCH_DEPTH = 2
+
+# Índice de cobertura poço × canal × intervalo de profundidade, montado na
+# consolidação (consultas sem reler os dados; ver LAS2DF_coverage)
+COVERAGE_INDEX_PATH = os.path.join(os.path.dirname(OUTPUT_PATH), "coverage_index.npz")
+
+# Seleção das colunas-alvo pela cobertura: com um valor (ex.: 0.5), as colunas
+# são ID, DEPTH e os canais presentes em pelo menos essa fração dos poços, do
+# mais ao menos comum; None usa a lista fixa TARGET_COLUMNS
+TARGET_MIN_WELL_FRACTION = None
+
 # Lista das colunas desejadas (priorizando as mais completas)
 TARGET_COLUMNS = [
     'ID',
@@ -37,35 +57,78 @@ TARGET_COLUMNS = [
 # =============================================================================
 # FUNÇÕES DE PROCESSAMENTO
 # =============================================================================
-def combine_and_filter_logs(input_dir, output_full_path, output_filtered_path):
-    """Combina e filtra os dados de poço"""
+def read_well_csv(file_path, compact=COMPACT_FLOAT32):
+    """Lê o CSV de um poço; no modo compacto as curvas vêm em float32"""
+    if not compact:
+        return pd.read_csv(file_path)
+    columns = pd.read_csv(file_path, nrows=0).columns
+    return pd.read_csv(file_path, dtype={col: 'float32' for col in columns if col not in ('ID', 'DEPTH')})
+
+def select_target_columns(coverage, min_well_fraction=TARGET_MIN_WELL_FRACTION):
+    """
+    Colunas-alvo da filtragem.
+
+    Parâmetros:
+        coverage (CoverageIndex): Cobertura dos poços consolidados
+        min_well_fraction (float): Fração mínima de poços com o canal; None
+            devolve TARGET_COLUMNS
+
+    Retorno:
+        list: ID, DEPTH e os canais selecionados
+    """
+    if min_well_fraction is None:
+        return TARGET_COLUMNS
+    summary = coverage.channel_summary()
+    channels = summary.index[summary['well_fraction'] >= min_well_fraction]
+    return ['ID', 'DEPTH'] + list(channels)
+
+def combine_and_filter_logs(input_dir, output_full_path, output_filtered_path, compact=COMPACT_FLOAT32,
+                            prefetch_depth=PREFETCH_DEPTH, coverage_path=None,
+                            min_well_fraction=TARGET_MIN_WELL_FRACTION):
+    """
+    Combina e filtra os dados de poço.
+
+    Parâmetros:
+        coverage_path (str): Onde gravar o índice de cobertura (None: não grava)
+        min_well_fraction (float): Seleção das colunas-alvo pela cobertura
+            (ver select_target_columns)
+    """
     csv_files = [f for f in os.listdir(input_dir) if f.endswith('.csv')]
     combined_df = pd.DataFrame()
+    coverage_builder = CoverageBuilder()
     
     print(f"Processando {len(csv_files)} poços...")
     
     # Etapa 1: Consolidação
-    for filename in tqdm(csv_files, desc="Consolidando dados"):
-        file_path = os.path.join(input_dir, filename)
-        df = pd.read_csv(file_path)
-        well_id = os.path.splitext(filename)[0]
+    file_paths = [os.path.join(input_dir, filename) for filename in csv_files]
+    for file_path, local_path in tqdm(prefetched(file_paths, prefetch_depth), total=len(file_paths),
+                                      desc="Consolidando dados"):
+        df = read_well_csv(local_path, compact)
+        well_id = os.path.splitext(os.path.basename(file_path))[0]
         df['ID'] = well_id
+        coverage_builder.add_well(well_id, df)
         combined_df = pd.concat([combined_df, df], ignore_index=True)
     
+    coverage = coverage_builder.build()
+    if coverage_path:
+        coverage.save(coverage_path)
+        print(f"Índice de cobertura salvo em: {coverage_path}")
+    
     # Ordenação geológica
     combined_df.sort_values(by=['ID', 'DEPTH'], inplace=True)
     combined_df.to_csv(output_full_path, index=False)
     
     # Etapa 2: Filtragem das colunas-alvo
     print("\nFiltrando colunas prioritárias...")
-    filtered_df = combined_df.reindex(columns=TARGET_COLUMNS)
+    target_columns = select_target_columns(coverage, min_well_fraction)
+    filtered_df = combined_df.reindex(columns=target_columns)
     
     # Remove colunas que não existiam no DataFrame original
-    existing_cols = [col for col in TARGET_COLUMNS if col in combined_df.columns]
+    existing_cols = [col for col in target_columns if col in combined_df.columns]
     filtered_df = filtered_df[existing_cols]
     
     # Verificação final
-    missing_cols = set(TARGET_COLUMNS) - set(existing_cols)
+    missing_cols = set(target_columns) - set(existing_cols)
     if missing_cols:
         print(f"Aviso: Colunas não encontradas em nenhum poço: {missing_cols}")
     
@@ -74,8 +137,12 @@ def combine_and_filter_logs(input_dir, output_full_path, output_filtered_path):
     
     # Relatório
     print("\n✅ Processamento concluído:")
+    summary = coverage.channel_summary()
     for col in existing_cols:
-        print(f"  → {col}")
+        if col in summary.index:
+            print(f"  → {col} ({summary.at[col, 'well_fraction']:.0%} dos poços)")
+        else:
+            print(f"  → {col}")
     
     return combined_df, filtered_df
 
@@ -93,10 +160,11 @@ if __name__ == "__main__":
     full_df, clean_df = combine_and_filter_logs(
         INPUT_DIR,
         OUTPUT_PATH,
-        OUTPUT_PATH2
+        OUTPUT_PATH2,
+        coverage_path=COVERAGE_INDEX_PATH
     )
 
-df_clean = pd.read_csv(OUTPUT_PATH2)
+    df_clean = pd.read_csv(OUTPUT_PATH2)
 
-for col in df_clean.columns:
-    print(col)
\ No newline at end of file
+    for col in df_clean.columns:
+        print(col)
\ No newline at end of file
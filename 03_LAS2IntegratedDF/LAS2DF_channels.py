@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Padronização dos mnemônicos de canais, compartilhada pelas etapas LAS/CSV.
+
+Um mnemônico é resolvido em três passos:
+    1. tabela de apelidos (ALIASES): 'ILD' -> 'RES_DEEP', 'CAL1' -> 'CALI'...
+    2. nomes já conhecidos ficam como estão: BASE_MNEMONICS ('MINV', 'TEMP'...)
+       e os próprios nomes padronizados ('RES_DEEP', 'WINDOW_1'...)
+    3. sufixo numérico de repetição (_1, _12, ou :1 do lasio) é removido e o
+       restante é resolvido de novo, se for conhecido: 'GR_12' -> 'GR',
+       'LLD_1_2' -> 'RES_LATEROLOG_DEEP'
+
+O que não é reconhecido fica como está e é registrado para revisão
+(unmapped_mnemonics). Os resultados ficam em cache (functools.lru_cache):
+cada nome distinto é resolvido uma vez por processo.
+
+Uso:
+    df.columns = resolve_columns(df.columns)
+    standard = resolve_mnemonic('ILD_2')  # 'RES_DEEP'
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+
+import pandas as pd
+
+# Nomes distintos guardados no cache de resolução
+RESOLVE_CACHE_SIZE = 8192
+
+# Sufixo de repetição: _N (arquivos de origem) ou :N (duplicatas renomeadas pelo lasio)
+SUFFIX_PATTERN = re.compile(r'^(?P<base>.+)[_:](?P<index>\d+)$')
+
+# =============================================================================
+# TABELA DE APELIDOS
+# =============================================================================
+
+ALIASES = {
+    # Profundidade e identificação
+    'DEPT': 'DEPTH',
+    'MD': 'DEPTH',
+    
+    # Raios Gama
+    'GR': 'GR',
+    'GRT': 'GR',
+    'RGSS': 'GR_SHALLOW',
+    'SGR': 'GR_SHALLOW',
+    'CGR': 'GR_COMPENSATED',
+    'RHGR': 'GR_HYDROGEN',
+    'HGR': 'GR_HYDROGEN',
+    
+    # Potencial Espontâneo
+    'SP': 'SP',
+    
+    # Resistividade
+    'ILD': 'RES_DEEP',
+    'RILD': 'RES_DEEP',
+    'ILT': 'RES_DEEP',
+    'RLN': 'RES_MEDIUM',
+    'RSN': 'RES_SHALLOW',
+    'RLL': 'RES_LATEROLOG',
+    'LLD': 'RES_LATEROLOG_DEEP',
+    'LLS': 'RES_LATEROLOG_SHALLOW',
+    'MSFL': 'RES_MICROSPHERICAL',
+    'SFLU': 'RES_UNFOCUSED_SHALLOW',
+    'SFLA': 'RES_FOCUSED_SHALLOW',
+    'SFLT': 'RES_SHALLOW',
+    
+    # Densidade
+    'RHOB': 'DEN',
+    'RHOT': 'DEN',
+    'DRHO': 'DEN_CORR',
+    
+    # Porosidade Neutrônica
+    'NPHI': 'NEUT',
+    'NEUT': 'NEUT',
+    'TNPH': 'NEUT',
+    'NPOR': 'NEUT',
+    
+    # Sônico
+    'DT': 'SONIC',
+    'DTSI': 'SLOWNESS',
+    'TTI': 'SONIC_INT',
+    'TTID': 'SONIC_INT',
+    
+    # Caliper
+    'CALI': 'CALI',
+    'CAL': 'CALI',
+    'CIL': 'CALI',
+    'CALS': 'CALI',
+    'CAL1': 'CALI',
+    'CALT': 'CALI',
+    
+    # Imageamentos e direcionais
+    'DEVI': 'DEVIATION',
+    'AZIM': 'AZIMUTH',
+    'HAZI': 'AZIMUTH',
+    'AZIE': 'AZIMUTH',
+    'DIP': 'DIP',
+    'P1AZ': 'AZIMUTH_P1',
+    'RB': 'R_BULK',
+    'RAD1': 'RADIAL_1',
+    'RAD2': 'RADIAL_2',
+    'RAD3': 'RADIAL_3',
+    'RAD4': 'RADIAL_4',
+    
+    # Pressão e tensão
+    'PESS': 'PRESSURE',
+    'TENS': 'TENSION',
+    
+    # Geoquímica/Espectrometria
+    'POTA': 'POTASSIUM',
+    'THOR': 'THORIUM',
+    'URAN': 'URANIUM',
+    'W1NG': 'WINDOW_1',
+    'W2NG': 'WINDOW_2',
+    'W3NG': 'WINDOW_3',
+    'W4NG': 'WINDOW_4',
+    'W5NG': 'WINDOW_5',
+    
+    # Outros (agrupando por similaridade)
+    'ITT': 'TEMP_INTAKE',
+    'TOT': 'TEMP_OUT',
+    'TOTD': 'TEMP_OUT',
+    'SN': 'NEAR_SONIC',
+    'CILD': 'CALI_DUAL',
+    'ILM': 'RES_MEDIUM',
+    'LL3': 'RES_LATEROLOG_3',
+    'FCNL': 'FOCUSED_CURRENT',
+    'NCNL': 'NEAR_CURRENT',
+    'AMP': 'AMPLITUDE',
+    'SRAT': 'S_RATIO',
+    'NRAT': 'N_RATIO',
+    'PEF': 'PHOTO_EFFECT',
+    'HPEF': 'PHOTO_EFFECT_H',
+}
+
+# Mnemônicos sem apelido que ficam como estão, mas cujas repetições
+# (MINV_1, MINV_2...) são reconhecidas pela regra de sufixo
+BASE_MNEMONICS = frozenset([
+    'MINV', 'MNOR', 'MLL', 'C13', 'C24', 'LITH', 'LL', 'LS', 'LSRH', 'LU', 'LURH',
+    'SS1', 'SS2', 'SS1RH', 'DB1', 'DB2', 'DB3', 'DB4', 'SB1', 'SB2', 'PART', 'CLEX',
+    'SHRP', 'NP', 'HT12', 'HT23', 'HT34', 'HT41', 'CDDS', 'DCX', 'NM13', 'NM24', 'OFLG',
+    'KFLG', 'TIME', 'RGR', 'RWA', 'CS', 'HSTA', 'REFE', 'RC', 'EMEX', 'PP', 'TEMP',
+    'FEP1', 'FEP2', 'RC1', 'RC2', 'FEP', 'CBL', 'FFDC', 'NFDC', 'TT1', 'TT2', 'TT3',
+    'TT4', 'DPAP', 'CL', 'NSDR', 'VDEP', 'EWDR', 'RX0', 'RX', 'DDQR', 'CBFS', 'CBLF',
+    'SMIN', 'SMNO', 'DTL', 'TSPD', 'T1', 'T2', 'T3', 'T4', 'CNST', 'NPHS', 'NPHD',
+    'DPHI', 'PHI', 'P15V', 'M60V', 'P60V', 'VREF', 'SPE', 'FISH', 'HSP', 'ZB', 'ZM',
+    'DZB', 'DZM', 'DQZE', 'DQCA', 'MQZE', 'MQCA', 'SPQZ', 'SPQC', 'PSQ', 'DRCO', 'DXCO',
+    'CCER', 'MRCO', 'MXCO', 'VRES', 'XFRC', 'HDRS', 'HMRS', 'DFL', 'XHDR', 'XHMR',
+    'XDFL', 'HDCN', 'HMCN', 'HDR', 'HDX', 'HMR', 'HMX', 'STEM', 'GND', 'P5V', 'M15V',
+    'LAT', 'LN', 'QUAF', 'S12', 'S23A', 'S34A', 'S4A1', 'S13A', 'DPL1', 'DPL2', 'DB1A',
+    'DB2A', 'DB3A', 'DB4A', 'REV', 'GNOR', 'FNOR', 'FINC', 'EV', 'EI', 'ETIM', 'RLU',
+    'RLS', 'RLIT', 'RSS1', 'RSS2', 'QLS', 'QSS', 'NRHO', 'TNRA', 'RCFT', 'RCNT', 'RLUL',
+    'RLUU', 'RSLL', 'RSLU', 'RSUL', 'RSUU', 'PARI', 'LSHV', 'SSHV', 'FFSS', 'FFLS',
+    'SLDT', 'QRLS', 'QRSS', 'DALP', 'RTNR', 'TALP', 'NUCA', 'ENRA', 'RCEF', 'RCEN',
+    'ENPH', 'CFTC', 'CNTC', 'CFEC', 'CNEC', 'RCAL', 'SA1', 'SA2', 'SA3', 'RHGX', 'BS',
+    'SHVD', 'LHVD', 'RLLL', 'RLLU', 'RHLL', 'RHLU', 'RHLS', 'RHLI', 'RHS1', 'RHS2',
+    'HNRH', 'HDAL', 'HPHN', 'HRHO', 'HDRH', 'HDPH', 'HLL', 'HLU', 'HLS', 'HLIT', 'HSS1',
+    'HSS2', 'RHFT', 'RHNT', 'HTNP', 'HNPO', 'HCFT', 'HCNT', 'HTAL', 'IHV', 'ICV',
+    'HDIR', 'DIPA', 'GRAD', 'DRIF', 'DRAZ', 'RLLD', 'RLLS', 'CILM', 'CMSF', 'XLL3',
+    'FREC', 'HDFL', 'AZAP', 'SPHI', 'STSG', 'CTEM', 'CCSW', 'HV', 'RSPA', 'RSP', 'SPAR',
+    'SPMV', 'DIFF', 'MARK', 'IICS', 'RSFL', 'RILM', 'TOD', 'SSLT', 'SVEL'
+]) - set(ALIASES)
+
+# Nomes padronizados (destino dos apelidos) também são nomes conhecidos
+STANDARD_NAMES = frozenset(ALIASES.values())
+
+# =============================================================================
+# RESOLUÇÃO
+# =============================================================================
+
+# Mnemônicos não reconhecidos -> número de vezes que apareceram
+_unmapped = Counter()
+
+def normalize_mnemonic(mnemonic):
+    """Mnemônico sem espaços nas pontas e em maiúsculas"""
+    return str(mnemonic).strip().upper()
+
+@lru_cache(maxsize=RESOLVE_CACHE_SIZE)
+def _resolve(mnemonic):
+    """
+    Resolve um mnemônico já normalizado.
+
+    Retorno:
+        tuple: (nome padronizado, se o mnemônico foi reconhecido)
+    """
+    if mnemonic in ALIASES:
+        return ALIASES[mnemonic], True
+    if mnemonic in BASE_MNEMONICS or mnemonic in STANDARD_NAMES:
+        return mnemonic, True
+    match = SUFFIX_PATTERN.match(mnemonic)
+    if match:
+        standard, mapped = _resolve(match.group('base'))
+        if mapped:
+            return standard, True
+    return mnemonic, False
+
+def is_mapped(mnemonic):
+    """Indica se o mnemônico é reconhecido (apelido, nome conhecido ou repetição de um deles)"""
+    return _resolve(normalize_mnemonic(mnemonic))[1]
+
+def resolve_mnemonic(mnemonic, collect=True):
+    """
+    Nome padronizado de um mnemônico.
+
+    Parâmetros:
+        mnemonic (str): Mnemônico como está no arquivo
+        collect (bool): Registra o mnemônico em unmapped_mnemonics se ele não
+            for reconhecido
+
+    Retorno:
+        str: Nome padronizado (o próprio mnemônico normalizado, se não reconhecido)
+    """
+    normalized = normalize_mnemonic(mnemonic)
+    standard, mapped = _resolve(normalized)
+    if collect and not mapped:
+        _unmapped[normalized] += 1
+    return standard
+
+def resolve_columns(columns, collect=True):
+    """
+    Resolve todas as colunas de uma vez.
+
+    A normalização é feita sobre o índice inteiro (pandas .str) e cada nome
+    distinto é resolvido uma única vez.
+
+    Parâmetros:
+        columns: Colunas (pd.Index, lista de nomes...)
+        collect (bool): Registra os não reconhecidos (ver resolve_mnemonic)
+
+    Retorno:
+        pd.Index: Nomes padronizados, na mesma ordem (com eventuais repetições)
+    """
+    names = pd.Index(columns).astype(str).str.strip().str.upper()
+    unique = names.unique()
+    return names.map(dict(zip(unique, (resolve_mnemonic(name, collect) for name in unique))))
+
+def unmapped_mnemonics():
+    """
+    Mnemônicos não reconhecidos desde o início do processo (ou do último clear).
+
+    Retorno:
+        Counter: Mnemônico -> número de vezes que apareceu
+    """
+    return Counter(_unmapped)
+
+def clear_unmapped():
+    """Esvazia o registro de mnemônicos não reconhecidos"""
+    _unmapped.clear()
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+Índice de cobertura poço × canal × intervalo de profundidade.
+
+Perguntas como "quais poços têm GR, NEUT e DEN juntos entre 400 e 1200 m"
+não precisam reler os LAS nem o CSV integrado: o índice guarda, para cada
+poço e canal padronizado, os intervalos de profundidade com valores (trechos
+contínuos de linhas não nulas, codificados por run-length) e uma matriz
+poço × canal em bits (np.packbits) para a pré-seleção rápida dos poços.
+
+O índice é montado em uma passada por poço (CoverageBuilder.add_well, chamado
+na consolidação do 04_CLEAN_integratedDF) e gravado em um .npz.
+
+Uso:
+    index = CoverageIndex.load(path)
+    index.wells_with(['GR', 'NEUT', 'DEN'], top=400, base=1200)  # poço -> espessura em comum
+    index.joint_intervals('1_BN_1_SC', ['GR', 'DEN'])            # array (n, 2): topo, base
+    index.channel_summary()                                      # poços e espessura por canal
+"""
+
+import numpy as np
+import pandas as pd
+
+# Colunas que não são canais
+NON_CHANNEL_COLUMNS = ('ID', 'DEPTH')
+
+# =============================================================================
+# INTERVALOS
+# =============================================================================
+
+def run_intervals(depth, valid):
+    """
+    Intervalos de profundidade das sequências de linhas válidas (run-length).
+
+    Parâmetros:
+        depth (np.ndarray): Profundidades em ordem crescente
+        valid (np.ndarray): Máscara das linhas com valor
+
+    Retorno:
+        np.ndarray: (n, 2) com topo e base de cada sequência
+    """
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], valid.astype(np.int8), [0]))))
+    starts, ends = edges[::2], edges[1::2] - 1
+    return np.column_stack((depth[starts], depth[ends]))
+
+def clip_intervals(intervals, top=None, base=None):
+    """Recorta os intervalos na janela [top, base] (None: sem limite)"""
+    top = -np.inf if top is None else top
+    base = np.inf if base is None else base
+    clipped = np.column_stack((np.maximum(intervals[:, 0], top), np.minimum(intervals[:, 1], base)))
+    return clipped[clipped[:, 0] <= clipped[:, 1]]
+
+def intersect_intervals(a, b):
+    """Interseção de duas listas ordenadas de intervalos (n, 2)"""
+    result = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        top, base = max(a[i, 0], b[j, 0]), min(a[i, 1], b[j, 1])
+        if top <= base:
+            result.append((top, base))
+        if a[i, 1] < b[j, 1]:
+            i += 1
+        else:
+            j += 1
+    return np.array(result, dtype=np.float64).reshape(-1, 2)
+
+def thickness(intervals):
+    """Espessura total dos intervalos"""
+    return float((intervals[:, 1] - intervals[:, 0]).sum())
+
+# =============================================================================
+# ÍNDICE
+# =============================================================================
+
+class CoverageIndex:
+    """
+    Cobertura de cada canal em cada poço.
+
+    bits guarda a matriz poço × canal (presença) com 8 canais por byte;
+    os intervalos ficam em dois arrays (topos e bases), com o trecho de cada
+    par (poço, canal) dado por offsets[poço * n_canais + canal] até o
+    offset seguinte.
+    """
+
+    def __init__(self, wells, channels, bits, offsets, tops, bases):
+        self.wells = list(wells)
+        self.channels = list(channels)
+        self.bits = bits
+        self.offsets = offsets
+        self.tops = tops
+        self.bases = bases
+        self._well_index = {well: i for i, well in enumerate(self.wells)}
+        self._channel_index = {channel: i for i, channel in enumerate(self.channels)}
+
+    @classmethod
+    def load(cls, path):
+        """Lê um índice gravado por save"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['wells'].tolist(), data['channels'].tolist(), data['bits'],
+                       data['offsets'], data['tops'], data['bases'])
+
+    def save(self, path):
+        """Grava o índice em um .npz compactado"""
+        np.savez_compressed(path, wells=np.array(self.wells, dtype=str), channels=np.array(self.channels, dtype=str),
+                            bits=self.bits, offsets=self.offsets, tops=self.tops, bases=self.bases)
+
+    def presence(self):
+        """Matriz poço × canal (bool), desempacotada dos bits"""
+        return np.unpackbits(self.bits, axis=1, count=len(self.channels)).astype(bool)
+
+    def wells_with_channels(self, channels):
+        """Poços que têm todos os canais (em qualquer profundidade), pela matriz de bits"""
+        if any(channel not in self._channel_index for channel in channels):
+            return []
+        query = np.zeros(len(self.channels), dtype=bool)
+        query[[self._channel_index[channel] for channel in channels]] = True
+        mask = np.packbits(query)
+        hits = np.flatnonzero(((self.bits & mask) == mask).all(axis=1))
+        return [self.wells[i] for i in hits]
+
+    def intervals(self, well, channel):
+        """Intervalos (n, 2) com valores de um canal em um poço (vazio se não houver)"""
+        if well not in self._well_index or channel not in self._channel_index:
+            return np.empty((0, 2))
+        pair = self._well_index[well] * len(self.channels) + self._channel_index[channel]
+        start, end = self.offsets[pair], self.offsets[pair + 1]
+        return np.column_stack((self.tops[start:end], self.bases[start:end]))
+
+    def joint_intervals(self, well, channels, top=None, base=None):
+        """Intervalos em que todos os canais têm valores ao mesmo tempo, dentro de [top, base]"""
+        joint = None
+        for channel in channels:
+            intervals = clip_intervals(self.intervals(well, channel), top, base)
+            joint = intervals if joint is None else intersect_intervals(joint, intervals)
+            if not len(joint):
+                break
+        return np.empty((0, 2)) if joint is None else joint
+
+    def wells_with(self, channels, top=None, base=None, min_thickness=0.0):
+        """
+        Poços com todos os canais juntos na janela de profundidade.
+
+        Parâmetros:
+            channels (list): Canais padronizados
+            top, base (float): Janela de profundidade (None: sem limite)
+            min_thickness (float): Espessura mínima em comum; base - top
+                exige a janela inteira coberta
+
+        Retorno:
+            dict: Poço -> espessura em que todos os canais têm valores
+        """
+        result = {}
+        for well in self.wells_with_channels(channels):
+            joint = self.joint_intervals(well, channels, top, base)
+            if len(joint) and thickness(joint) >= min_thickness:
+                result[well] = thickness(joint)
+        return result
+
+    def channel_summary(self):
+        """
+        Cobertura de cada canal no conjunto de poços.
+
+        Retorno:
+            pd.DataFrame: Por canal, 'wells' (poços com o canal), 'well_fraction'
+                e 'thickness' (espessura total com valores), do mais ao menos comum
+        """
+        n_pairs = len(self.wells) * len(self.channels)
+        pairs = np.repeat(np.arange(n_pairs), np.diff(self.offsets))
+        pair_thickness = np.bincount(pairs, weights=self.bases - self.tops, minlength=n_pairs)
+        wells = self.presence().sum(axis=0)
+        summary = pd.DataFrame({
+            'wells': wells,
+            'well_fraction': wells / max(1, len(self.wells)),
+            'thickness': pair_thickness.reshape(len(self.wells), len(self.channels)).sum(axis=0),
+        }, index=pd.Index(self.channels, name='channel'))
+        return summary.sort_values('wells', ascending=False, kind='stable')
+
+# =============================================================================
+# MONTAGEM
+# =============================================================================
+
+class CoverageBuilder:
+    """Acumula a cobertura poço a poço e monta o CoverageIndex no final"""
+
+    def __init__(self):
+        self._wells = []
+        self._channels = {}
+        self._runs = []  # (poço, canal, intervalos)
+
+    def add_well(self, well_id, df, depth_column='DEPTH'):
+        """
+        Registra os intervalos com valores de cada canal de um poço.
+
+        Parâmetros:
+            well_id (str): Identificador do poço
+            df (pd.DataFrame): Curvas do poço, com a coluna de profundidade
+        """
+        well = len(self._wells)
+        self._wells.append(well_id)
+        depth = df[depth_column].to_numpy(dtype=np.float64)
+        order = None if np.all(np.diff(depth) >= 0) else np.argsort(depth, kind='stable')
+        if order is not None:
+            depth = depth[order]
+        has_depth = ~np.isnan(depth)
+
+        for column in df.columns:
+            if column in NON_CHANNEL_COLUMNS or column == depth_column:
+                continue
+            valid = df[column].notna().to_numpy()
+            if order is not None:
+                valid = valid[order]
+            valid = valid & has_depth
+            if not valid.any():
+                continue
+            channel = self._channels.setdefault(column, len(self._channels))
+            self._runs.append((well, channel, run_intervals(depth, valid)))
+
+    def build(self):
+        """Monta o índice com os poços registrados até agora"""
+        n_wells, n_channels = len(self._wells), len(self._channels)
+        presence = np.zeros((n_wells, n_channels), dtype=bool)
+        counts = np.zeros(n_wells * n_channels, dtype=np.int64)
+        runs = sorted(self._runs, key=lambda run: run[0] * n_channels + run[1])
+        for well, channel, intervals in runs:
+            presence[well, channel] = True
+            counts[well * n_channels + channel] = len(intervals)
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        intervals = np.concatenate([run[2] for run in runs]) if runs else np.empty((0, 2))
+        return CoverageIndex(self._wells, list(self._channels), np.packbits(presence, axis=1),
+                             offsets, intervals[:, 0].copy(), intervals[:, 1].copy())
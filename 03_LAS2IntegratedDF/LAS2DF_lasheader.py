@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+Leitura rápida dos metadados de um arquivo LAS, sem interpretar a seção ~ASCII.
+
+O relatório de canais só precisa do cabeçalho e, dos dados, da primeira e da
+última profundidade e do número de linhas. lasio.read converte todas as
+amostras do ~ASCII em números; aqui são lidas só as seções ~Version, ~Well e
+~Curve, a primeira linha de dados, a última (lida a partir do fim do arquivo)
+e o número de linhas, contado pelas quebras de linha em blocos de bytes.
+
+Os valores seguem as regras do lasio usadas pelo relatório: mnemônicos
+repetidos viram MNEM:1, MNEM:2..., mnemônico vazio vira UNKNOWN, valores do
+~Well são convertidos para int/float quando possível e, em LAS 1.2, o valor
+do ~Well (exceto STRT/STOP/STEP/NULL) fica no lugar da descrição.
+
+Arquivos com WRAP YES (uma linha de profundidade quebrada em várias linhas
+do arquivo) não são suportados: scan_las_header devolve None e quem chama
+usa o lasio.
+
+Uso:
+    header = scan_las_header(path)
+    header['well']['WELL']['value'], header['first_depth'], header['num_points']
+"""
+
+import math
+
+# Bytes lidos por vez na contagem de linhas
+READ_BLOCK_SIZE = 1 << 20
+
+# Trecho final do arquivo lido para achar a última linha de dados (dobra se
+# não houver nenhuma linha completa nele)
+TAIL_BYTES = 64 * 1024
+
+# Diferença máxima entre STRT/STOP/STEP e os dados (unidade de profundidade)
+DEPTH_TOLERANCE = 1e-3
+
+# Itens do ~Well que ficam na posição do valor também em LAS 1.2
+LAS12_VALUE_ITEMS = ('STRT', 'STOP', 'STEP', 'NULL')
+
+# =============================================================================
+# CABEÇALHO
+# =============================================================================
+
+def _decode(raw_line):
+    """Linha do arquivo em texto (UTF-8, ou Latin-1 nos arquivos antigos)"""
+    try:
+        return raw_line.decode('utf-8').strip()
+    except UnicodeDecodeError:
+        return raw_line.decode('latin-1').strip()
+
+def parse_value(text):
+    """Converte o valor de um item para int ou float quando possível, como o lasio"""
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+def parse_header_line(line):
+    """
+    Separa uma linha de cabeçalho 'MNEM.UNIT  VALOR : DESCRIÇÃO'.
+
+    A unidade começa logo após o primeiro ponto e vai até o primeiro espaço;
+    a descrição vem depois do último ':'.
+
+    Retorno:
+        tuple: (mnemônico, unidade, valor, descrição) como texto
+    """
+    mnemonic, _, rest = line.partition('.')
+    if rest[:1].isspace() or not rest:
+        unit, rest = '', rest
+    else:
+        unit, _, rest = rest.partition(' ')
+    value, colon, descr = rest.rpartition(':')
+    if not colon:
+        value, descr = rest, ''
+    return mnemonic.strip(), unit.strip(), value.strip(), descr.strip()
+
+def _unique_mnemonics(mnemonics):
+    """Renomeia mnemônicos repetidos (MNEM:1, MNEM:2...) e vazios (UNKNOWN), como o lasio"""
+    mnemonics = [mnemonic or 'UNKNOWN' for mnemonic in mnemonics]
+    counts = {}
+    for mnemonic in mnemonics:
+        counts[mnemonic] = counts.get(mnemonic, 0) + 1
+    seen = {}
+    unique = []
+    for mnemonic in mnemonics:
+        if counts[mnemonic] > 1:
+            seen[mnemonic] = seen.get(mnemonic, 0) + 1
+            mnemonic = f"{mnemonic}:{seen[mnemonic]}"
+        unique.append(mnemonic)
+    return unique
+
+def _is_las2(sections):
+    """Versão 2.0 ou posterior (o padrão, se VERS não foi lido ainda)"""
+    version = sections['version'].get('VERS', {}).get('value', 2.0)
+    return not isinstance(version, (int, float)) or version >= 2
+
+def read_header_sections(file_object):
+    """
+    Lê as seções de cabeçalho até a linha ~A, deixando o arquivo no início dos dados.
+
+    Retorno:
+        dict: 'version' e 'well' (mnemônico -> {'unit', 'value', 'descr'}),
+            'curves' (lista de (mnemônico, unidade)) e 'has_data' (se a
+            seção ~ASCII foi encontrada)
+    """
+    sections = {'version': {}, 'well': {}, 'curves': [], 'has_data': False}
+    section = None
+    for raw_line in file_object:
+        line = _decode(raw_line)
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('~'):
+            section = line[1:2].upper()
+            if section == 'A':
+                sections['has_data'] = True
+                break
+            continue
+        if section not in ('V', 'W', 'C'):
+            continue
+
+        mnemonic, unit, value, descr = parse_header_line(line)
+        if section == 'C':
+            sections['curves'].append((mnemonic, unit))
+            continue
+        if section == 'W' and not _is_las2(sections) and mnemonic.upper() not in LAS12_VALUE_ITEMS:
+            value, descr = descr, value
+        key = 'version' if section == 'V' else 'well'
+        sections[key][mnemonic.upper()] = {'unit': unit, 'value': parse_value(value), 'descr': descr}
+
+    names = _unique_mnemonics([mnemonic for mnemonic, _ in sections['curves']])
+    sections['curves'] = [(name, unit) for name, (_, unit) in zip(names, sections['curves'])]
+    return sections
+
+# =============================================================================
+# DADOS
+# =============================================================================
+
+def _is_data_line(line):
+    return bool(line) and not line.startswith('#')
+
+def first_data_line(file_object):
+    """Primeira linha de dados a partir da posição atual (None se não houver)"""
+    for raw_line in file_object:
+        line = _decode(raw_line)
+        if _is_data_line(line):
+            return line
+    return None
+
+def last_data_line(file_object, data_start, size):
+    """Última linha de dados, lida a partir do fim do arquivo"""
+    tail = TAIL_BYTES
+    while True:
+        start = max(data_start, size - tail)
+        file_object.seek(start)
+        lines = file_object.read(size - start).splitlines()
+        # Sem ter chegado ao início dos dados, a primeira linha do trecho pode estar cortada
+        if start > data_start:
+            lines = lines[1:]
+        for raw_line in reversed(lines):
+            line = _decode(raw_line)
+            if _is_data_line(line):
+                return line
+        if start == data_start:
+            return None
+        tail *= 2
+
+def count_data_rows(file_object):
+    """
+    Conta as linhas de dados da posição atual até o fim, sem interpretar os valores.
+
+    Conta as quebras de linha em blocos de bytes e desconta linhas em branco
+    e comentários ('#' no início da linha); uma última linha sem quebra
+    também é contada.
+    """
+    lines = blank = comments = 0
+    previous = b'\n'  # fim da linha ~A
+    while True:
+        block = file_object.read(READ_BLOCK_SIZE)
+        if not block:
+            break
+        lines += block.count(b'\n')
+        # Os últimos bytes do bloco anterior entram para achar padrões na divisa
+        joined = previous[-1:] + block
+        blank += joined.count(b'\n\n')
+        comments += joined.count(b'\n#')
+        blank += (previous[-2:] + block).count(b'\n\r\n')
+        previous = block[-2:] if len(block) >= 2 else (previous + block)[-2:]
+    if previous[-1:] != b'\n':
+        lines += 1
+    return lines - blank - comments
+
+def header_issues(strt, stop, step, first_depth, last_depth, num_points, tolerance=DEPTH_TOLERANCE):
+    """
+    Diferenças entre STRT/STOP/STEP do ~Well e a profundidade dos dados.
+
+    Parâmetros:
+        strt, stop, step: Valores do ~Well (None ou texto são ignorados;
+            STEP 0 indica passo variável e não é verificado)
+        first_depth, last_depth (float): Primeira e última profundidade dos dados
+        num_points (int): Número de linhas de dados
+
+    Retorno:
+        list: Descrição de cada inconsistência (vazia se tudo confere)
+    """
+    def number(value):
+        return float(value) if isinstance(value, (int, float)) and math.isfinite(value) else None
+
+    strt, stop, step = number(strt), number(stop), number(step)
+    issues = []
+    if not num_points:
+        return ['seção ~ASCII sem dados']
+    if strt is not None and abs(strt - first_depth) > tolerance:
+        issues.append(f"STRT {strt:g} ≠ primeira profundidade {first_depth:g}")
+    if stop is not None and abs(stop - last_depth) > tolerance:
+        issues.append(f"STOP {stop:g} ≠ última profundidade {last_depth:g}")
+    if step and num_points > 1:
+        data_step = (last_depth - first_depth) / (num_points - 1)
+        if abs(data_step - step) > tolerance:
+            issues.append(f"STEP {step:g} ≠ passo médio dos dados {data_step:g} ({num_points} linhas)")
+    return issues
+
+# =============================================================================
+# LEITURA COMPLETA
+# =============================================================================
+
+def scan_las_header(path):
+    """
+    Lê os metadados de um LAS sem interpretar as amostras do ~ASCII.
+
+    Parâmetros:
+        path (str): Arquivo LAS
+
+    Retorno:
+        dict: Seções do cabeçalho (ver read_header_sections), 'first_depth',
+            'last_depth', 'num_points' e 'issues' (ver header_issues); None
+            se o arquivo usar WRAP YES ou não tiver ~Curve/~ASCII
+    """
+    with open(path, 'rb') as file_object:
+        header = read_header_sections(file_object)
+        wrap = str(header['version'].get('WRAP', {}).get('value', 'NO')).upper()
+        if wrap.startswith('Y') or not header['curves'] or not header['has_data']:
+            return None
+
+        data_start = file_object.tell()
+        first_line = first_data_line(file_object)
+        file_object.seek(0, 2)
+        size = file_object.tell()
+        last_line = last_data_line(file_object, data_start, size)
+        file_object.seek(data_start)
+        num_points = count_data_rows(file_object) if first_line is not None else 0
+
+    first_depth = float(first_line.split()[0]) if first_line else math.nan
+    last_depth = float(last_line.split()[0]) if last_line else math.nan
+    well = header['well']
+    header.update({
+        'first_depth': first_depth,
+        'last_depth': last_depth,
+        'num_points': num_points,
+        'issues': header_issues(*(well.get(key, {}).get('value') for key in ('STRT', 'STOP', 'STEP')),
+                                first_depth, last_depth, num_points),
+    })
+    return header
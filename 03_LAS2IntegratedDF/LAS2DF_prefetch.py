@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Leitura antecipada (prefetch) dos arquivos de entrada das etapas LAS/CSV.
+
+As pastas de entrada ficam no OneDrive: cada arquivo lido espera o drive
+antes de qualquer processamento. prefetched() entrega os arquivos na ordem,
+enquanto threads de fundo já copiam os próximos N para uma pasta local de
+rascunho; o processamento lê a cópia local, que é apagada quando o laço
+passa para o próximo arquivo. A cópia mantém o nome original do arquivo
+(usado como ID do poço nas etapas seguintes).
+
+Uso:
+    for path, local_path in prefetched(paths, depth=2):
+        df = pd.read_csv(local_path)
+"""
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# Arquivos lidos antecipadamente além do atual (0 desativa: lê direto da origem)
+PREFETCH_DEPTH = 2
+
+def _copy_to_scratch(path, scratch_path, index):
+    """Copia um arquivo para a pasta de rascunho mantendo o nome (executado em thread)"""
+    target_dir = os.path.join(scratch_path, f"{index:06d}")
+    os.makedirs(target_dir)
+    target = os.path.join(target_dir, os.path.basename(path))
+    shutil.copyfile(path, target)
+    return target
+
+def prefetched(paths, depth=PREFETCH_DEPTH, scratch_dir=None):
+    """
+    Percorre os arquivos com cópia antecipada para uma pasta local.
+
+    Parâmetros:
+        paths (list): Arquivos de entrada, na ordem de processamento
+        depth (int): Quantos arquivos além do atual são copiados antecipadamente
+        scratch_dir (str): Onde criar a pasta de rascunho; None usa a pasta
+            temporária do sistema
+
+    Retorno:
+        generator: Tuplas (caminho original, caminho a ler). Sem prefetch, ou
+            se a cópia falhar, o caminho a ler é o próprio original
+    """
+    paths = list(paths)
+    if not depth:
+        for path in paths:
+            yield path, path
+        return
+
+    scratch_path = tempfile.mkdtemp(prefix='las2df_prefetch_', dir=scratch_dir)
+    executor = ThreadPoolExecutor(max_workers=depth, thread_name_prefix='prefetch')
+    futures = {}
+    try:
+        for index, path in enumerate(paths):
+            # O atual e os próximos depth arquivos ficam copiando em segundo plano
+            for ahead in range(index, min(index + depth + 1, len(paths))):
+                if ahead not in futures:
+                    futures[ahead] = executor.submit(_copy_to_scratch, paths[ahead], scratch_path, ahead)
+            try:
+                local_path = futures.pop(index).result()
+            except OSError as e:
+                print(f"⚠️ Prefetch de {os.path.basename(path)} falhou ({e}); lendo o arquivo original")
+                local_path = path
+
+            yield path, local_path
+
+            if local_path != path:
+                shutil.rmtree(os.path.dirname(local_path), ignore_errors=True)
+    finally:
+        # Laço interrompido: cópias ainda não iniciadas são canceladas
+        executor.shutdown(wait=True, cancel_futures=True)
+        shutil.rmtree(scratch_path, ignore_errors=True)
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Cache dos metadados do relatório de arquivos LAS (01_LASreport).
+
+Um arquivo JSON na pasta do relatório guarda, para cada LAS lido com
+sucesso, tamanho, mtime e os metadados extraídos (get_las_metadata). Na
+próxima execução só os arquivos novos ou alterados são lidos de novo; a
+distribuição de canais e as informações por poço são refeitas a partir das
+linhas do cache.
+
+O cache inteiro vale para uma versão: hash do dicionário de padronização de
+canais e do código que lê os metadados. Mudou o mapeamento ou o leitor,
+todos os arquivos são lidos de novo.
+
+Uso:
+    cache = load_cache(output_dir, version)
+    stat = os.stat(path)
+    meta = cached_metadata(cache, path, stat)
+    if meta is None:
+        meta = get_las_metadata(path)
+        record_metadata(cache, path, stat, meta)
+    save_cache(output_dir, cache, paths)
+"""
+
+import hashlib
+import json
+import os
+
+# Nome do cache, gravado dentro da pasta do relatório
+REPORT_CACHE_NAME = '.las_report_cache.json'
+
+# =============================================================================
+# VERSÃO
+# =============================================================================
+
+def metadata_version(config, source_paths=()):
+    """
+    Hash do que define os metadados de um arquivo.
+
+    Parâmetros:
+        config (dict): Parâmetros que alteram os metadados (mapeamento de
+            canais, modo de leitura...)
+        source_paths (list): Arquivos de código do leitor; qualquer mudança
+            neles invalida o cache
+    """
+    digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8'))
+    for path in source_paths:
+        digest.update(os.path.basename(path).encode('utf-8'))
+        with open(path, 'rb') as file_object:
+            digest.update(hashlib.sha256(file_object.read()).hexdigest().encode('utf-8'))
+    return digest.hexdigest()
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+def cache_path(output_dir):
+    """Caminho do cache dentro da pasta do relatório"""
+    return os.path.join(output_dir, REPORT_CACHE_NAME)
+
+def load_cache(output_dir, version):
+    """
+    Lê o cache da pasta do relatório.
+
+    Retorno:
+        dict: 'version' e 'files' (caminho absoluto -> tamanho, mtime e
+            metadados); sem arquivos se não existir, estiver corrompido ou
+            for de outra versão
+    """
+    try:
+        with open(cache_path(output_dir), 'r', encoding='utf-8') as file_object:
+            cache = json.load(file_object)
+        if cache['version'] == version:
+            return {'version': version, 'files': dict(cache['files'])}
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return {'version': version, 'files': {}}
+
+def save_cache(output_dir, cache, paths):
+    """
+    Grava o cache de forma atômica (arquivo temporário + os.replace).
+
+    Parâmetros:
+        paths (list): Arquivos da execução atual; entradas de arquivos que
+            saíram da pasta são descartadas
+    """
+    keep = {os.path.abspath(path) for path in paths}
+    files = {path: entry for path, entry in cache['files'].items() if path in keep}
+    os.makedirs(output_dir, exist_ok=True)
+    path = cache_path(output_dir)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as file_object:
+        json.dump({'version': cache['version'], 'files': files}, file_object, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+def cached_metadata(cache, path, stat):
+    """
+    Metadados do cache, se o arquivo tem o mesmo tamanho e mtime da última leitura.
+
+    Parâmetros:
+        stat (os.stat_result): stat do arquivo, lido antes de qualquer leitura
+
+    Retorno:
+        dict: Metadados como os de get_las_metadata; None se o arquivo é novo
+            ou mudou
+    """
+    entry = cache['files'].get(os.path.abspath(path))
+    if entry is None:
+        return None
+    if stat.st_size != entry['size'] or stat.st_mtime_ns != entry['mtime_ns']:
+        return None
+    metadata = dict(entry['metadata'])
+    metadata['depth_range'] = tuple(metadata['depth_range'])
+    return metadata
+
+def record_metadata(cache, path, stat, metadata):
+    """
+    Registra os metadados de um arquivo lido com sucesso.
+
+    O stat é o de antes da leitura: se o arquivo mudar durante a leitura, a
+    próxima execução verá um mtime diferente e o lerá de novo.
+    """
+    cache['files'][os.path.abspath(path)] = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'metadata': metadata,
+    }
@@ -201,6 +201,7 @@ def process_well_files(directory):
 input_path  = "C:/Users/Theresa/OneDrive/PESQUISA/LabMeg_Exxon/PMP_BC_WELL_LOGGING/A_AGP-PC_2integratedDF/AGP_data/"
 output_path = "C:/Users/Theresa/OneDrive/PESQUISA/LabMeg_Exxon/PMP_BC_WELL_LOGGING/A_AGP-PC_2integratedDF/litologia_pocos.xlsx"
 
-# Processa e exporta
-df = process_well_files(input_path)
-df.to_excel(output_path, index=False)
\ No newline at end of file
+if __name__ == "__main__":
+    # Processa e exporta
+    df = process_well_files(input_path)
+    df.to_excel(output_path, index=False)
\ No newline at end of file
@@ -0,0 +1,682 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark das etapas do pipeline de perfis de poço.
+
+Mede cada etapa isoladamente, sempre com as funções reais do repositório:
+
+    dlis2las     DLIS → LAS (motor em lote de 02_DLIS2LAS_BulkConverter)
+    las_report   relatório de canais (03_LAS2IntegratedDF/01_LASreport.py)
+    las2csv      LAS → CSV (02_LAS2CSV_clean_header.py)
+    standardize  padronização dos nomes de canais (03_CSV_standardised_channels_names.py)
+    integrate    consolidação e filtragem (04_CLEAN_integratedDF.py)
+    agp          leitura dos arquivos AGP de litologia (A_AGP-PC_2integratedDF/AGP2DF.py)
+
+Corpora:
+    samples      os seis DLIS reais de 01_DLIS2LAS_OneByOne/DLIS_input; as
+                 etapas LAS usam os LAS gerados pelo dlis2las
+    wells_<N>    N poços sintéticos: os DLIS reais replicados por links com
+                 nomes novos, LAS e AGP gerados com curvas e litologias
+                 aleatórias (semente fixa, sempre o mesmo conteúdo)
+
+Cada execução de uma etapa roda em um processo novo, então o pico de memória
+(RSS) medido é só o dela, incluindo os processos filhos do motor DLIS. Para
+cada etapa são informados arquivos/s, MB/s de entrada e pico de RSS, e um
+hash das saídas.
+
+Correção:
+    - os LAS do corpus samples são comparados numericamente com os LAS de
+      referência de 01_DLIS2LAS_OneByOne/LAS_output (mesmas curvas, mesmas
+      profundidades, valores dentro da tolerância);
+    - o modo streaming é comparado com o modo em memória, com o último bloco
+      de uma linha só;
+    - dois frames sintéticos sobrepostos, o primeiro com a sobreposição
+      preenchida com -999.25, são emendados em sequência e em paralelo: o
+      valor ausente não pode ocupar o grid nem aparecer na saída;
+    - com BASELINE_PATH apontando para um resultado anterior, cada etapa é
+      comparada com ele: tempo (ganho ou regressão acima de
+      REGRESSION_TOLERANCE) e hash das saídas (um caminho rápido só é aceito
+      se produzir exatamente as mesmas saídas).
+
+O processo termina com código 1 se alguma verificação falhar.
+"""
+
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BULK_CONVERTER_DIR = os.path.join(REPO_ROOT, "02_DLIS2LAS_BulkConverter")
+LAS2DF_DIR = os.path.join(REPO_ROOT, "03_LAS2IntegratedDF")
+sys.path.insert(0, BULK_CONVERTER_DIR)
+sys.path.insert(0, LAS2DF_DIR)
+
+import DLIS2LAS_BulkConverter_engine as engine
+import DLIS2LAS_resampling as resampling
+import LAS2DF_channels as channels
+from DLIS2LAS_laswriter import write_las
+
+# =============================================================================
+# CONFIGURAÇÕES GLOBAIS
+# =============================================================================
+
+SAMPLE_DLIS_DIR = os.path.join(REPO_ROOT, "01_DLIS2LAS_OneByOne", "DLIS_input")
+REFERENCE_LAS_DIR = os.path.join(REPO_ROOT, "01_DLIS2LAS_OneByOne", "LAS_output")
+
+SCRIPTS = {
+    'las_report': os.path.join(LAS2DF_DIR, "01_LASreport.py"),
+    'las2csv': os.path.join(LAS2DF_DIR, "02_LAS2CSV_clean_header.py"),
+    'standardize': os.path.join(LAS2DF_DIR, "03_CSV_standardised_channels_names.py"),
+    'integrate': os.path.join(LAS2DF_DIR, "04_CLEAN_integratedDF.py"),
+    'agp': os.path.join(REPO_ROOT, "A_AGP-PC_2integratedDF", "AGP2DF.py"),
+}
+
+# Pasta de trabalho (corpora gerados e saídas); pode ser apagada a qualquer momento
+WORK_DIR = os.path.join(tempfile.gettempdir(), "pipeline_benchmark")
+
+# Resultado desta execução e, opcionalmente, um resultado anterior para comparação
+RESULTS_PATH = os.path.join(WORK_DIR, "benchmark_results.json")
+BASELINE_PATH = None
+
+# Etapas medidas, na ordem do pipeline
+STAGES = ['dlis2las', 'las_report', 'las2csv', 'standardize', 'integrate', 'agp']
+
+# Corpora sintéticos: número de poços de cada um (ex.: [100, 1000, 10000])
+CORPUS_SIZES = [100]
+
+# Forma dos poços sintéticos: linhas do ~ASCII (passo de 0.2 m) e curvas além de DEPT
+SYNTHETIC_ROWS = 2000
+SYNTHETIC_CURVES = 12
+SYNTHETIC_LAYERS = 40  # camadas de litologia por arquivo AGP
+SYNTHETIC_SEED = 42
+
+# Execuções de cada etapa; vale o menor tempo (o pico de RSS é o maior)
+REPEATS = 3
+
+# Processos do motor DLIS na etapa dlis2las (None = todos os núcleos)
+N_WORKERS = os.cpu_count()
+
+# Tolerância da comparação com os LAS de referência (o LAS grava 5 decimais)
+EQUIVALENCE_RTOL = 1e-6
+EQUIVALENCE_ATOL = 1e-4
+
+# Passos do grid na comparação streaming × em memória (None = espaçamento
+# nativo; 0.5 m força a redução por blocos dos frames de 0,2 m)
+STREAMING_CHECK_STEPS = (None, 0.5)
+
+# Diferença de tempo, em relação ao baseline, tratada como regressão (0.10 = 10 %)
+REGRESSION_TOLERANCE = 0.10
+
+# =============================================================================
+# MEDIÇÃO
+# =============================================================================
+
+def peak_rss_bytes():
+    """Pico de RSS do processo atual e dos filhos já encerrados (None sem getrusage)"""
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux informa em KB, macOS em bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def input_files(path, extension):
+    """Arquivos de entrada de uma pasta (recursivo), ordenados pelo caminho"""
+    found = []
+    for folder, _, names in os.walk(path):
+        found += [os.path.join(folder, name) for name in names if name.lower().endswith(extension)]
+    return sorted(found)
+
+def output_digest(path):
+    """
+    Hash SHA-256 das saídas de uma etapa.
+
+    Parâmetros:
+        path (str): Arquivo ou pasta; numa pasta entram todos os arquivos
+            (nome relativo + conteúdo), exceto os ocultos (manifesto, quarentena)
+    """
+    digest = hashlib.sha256()
+    if os.path.isfile(path):
+        paths = [path]
+        path = os.path.dirname(path)
+    else:
+        paths = [p for p in input_files(path, '') if not os.path.basename(p).startswith('.')]
+    for file_path in paths:
+        digest.update(os.path.relpath(file_path, path).replace(os.sep, '/').encode('utf-8'))
+        with open(file_path, 'rb') as file_object:
+            digest.update(file_object.read())
+    return digest.hexdigest()
+
+def load_script(path, name):
+    """
+    Importa um script do pipeline pelo caminho (os nomes começam com dígitos).
+
+    O módulo fica registrado em sys.modules com o nome dado, para que as suas
+    funções possam ser enviadas a processos de um pool.
+    """
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def reset_dir(path):
+    """Apaga e recria uma pasta de saída"""
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+# =============================================================================
+# ETAPAS
+# =============================================================================
+
+def stage_dlis2las(input_dir, output_dir):
+    engine.process_all_dlis_files(input_dir, output_dir, n_workers=N_WORKERS, use_cache=False)
+    return output_dir
+
+def stage_las_report(input_dir, output_dir):
+    # Nome do arquivo como nome do módulo: processos do pool iniciados por
+    # spawn (Windows) o reimportam pela pasta LAS2DF_DIR
+    name = os.path.splitext(os.path.basename(SCRIPTS['las_report']))[0]
+    module = load_script(SCRIPTS['las_report'], name)
+    module.N_WORKERS = N_WORKERS
+    module.USE_REPORT_CACHE = False
+    module.LAS_INPUT_DIR = input_dir
+    module.OUTPUT_DIR = output_dir
+    module.main()
+    return os.path.join(output_dir, "las_analysis_report.txt")
+
+def stage_las2csv(input_dir, output_dir):
+    load_script(SCRIPTS['las2csv'], 'las2csv').process_directory(input_dir, output_dir)
+    return output_dir
+
+def stage_standardize(input_dir, output_dir):
+    load_script(SCRIPTS['standardize'], 'standardize').process_all_files(input_dir, output_dir)
+    return output_dir
+
+def stage_integrate(input_dir, output_dir):
+    module = load_script(SCRIPTS['integrate'], 'integrate')
+    module.combine_and_filter_logs(input_dir, os.path.join(output_dir, "integrated_data.csv"),
+                                   os.path.join(output_dir, "cleaned_data.csv"))
+    return output_dir
+
+def stage_agp(input_dir, output_dir):
+    df = load_script(SCRIPTS['agp'], 'agp').process_well_files(input_dir)
+    # O script grava em Excel (openpyxl); aqui a tabela vai para CSV, que é determinístico
+    output_path = os.path.join(output_dir, "litologia_pocos.csv")
+    df.to_csv(output_path, index=False)
+    return output_path
+
+STAGE_FUNCTIONS = {
+    'dlis2las': (stage_dlis2las, '.dlis'),
+    'las_report': (stage_las_report, '.las'),
+    'las2csv': (stage_las2csv, '.las'),
+    'standardize': (stage_standardize, '.csv'),
+    'integrate': (stage_integrate, '.csv'),
+    'agp': (stage_agp, '.txt'),
+}
+
+def run_stage(job):
+    """
+    Executa uma etapa no processo de medição e mede tempo, entrada e pico de RSS.
+
+    Parâmetros:
+        job (dict): 'stage', 'input_dir' e 'output_dir'
+
+    Retorno:
+        dict: 'wall_s', 'files', 'bytes', 'max_rss_bytes' e 'digest' das saídas
+    """
+    function, extension = STAGE_FUNCTIONS[job['stage']]
+    files = input_files(job['input_dir'], extension)
+    reset_dir(job['output_dir'])
+
+    # A saída das etapas (prints e barras do tqdm) não entra na medição
+    sink = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(sink), redirect_stderr(sink):
+        output = function(job['input_dir'], job['output_dir'])
+    wall_s = time.perf_counter() - start
+
+    return {
+        'wall_s': wall_s,
+        'files': len(files),
+        'bytes': sum(os.path.getsize(path) for path in files),
+        'max_rss_bytes': peak_rss_bytes(),
+        'digest': output_digest(output),
+    }
+
+def measure_stage(stage, input_dir, output_dir):
+    """
+    Mede uma etapa REPEATS vezes, cada uma em um processo novo.
+
+    Retorno:
+        dict: Melhor tempo, arquivos/s, MB/s, pico de RSS e hash das saídas;
+            'error' se alguma execução falhar ou as saídas mudarem entre execuções
+    """
+    job = {'stage': stage, 'input_dir': input_dir, 'output_dir': output_dir}
+    runs = []
+    for _ in range(REPEATS):
+        # Processo novo a cada execução (não daemon: o motor DLIS cria os seus)
+        try:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                runs.append(pool.submit(run_stage, job).result())
+        except Exception as e:
+            return {'stage': stage, 'error': f"{type(e).__name__}: {e}"}
+
+    best = min(runs, key=lambda run: run['wall_s'])
+    rss = [run['max_rss_bytes'] for run in runs if run['max_rss_bytes'] is not None]
+    record = {
+        'stage': stage,
+        'files': best['files'],
+        'mb': best['bytes'] / 1e6,
+        'wall_s': best['wall_s'],
+        'files_per_s': best['files'] / best['wall_s'] if best['wall_s'] else None,
+        'mb_per_s': best['bytes'] / 1e6 / best['wall_s'] if best['wall_s'] else None,
+        'max_rss_mb': max(rss) / 1e6 if rss else None,
+        'digest': best['digest'],
+        'error': None,
+    }
+    if len({run['digest'] for run in runs}) > 1:
+        record['error'] = "saídas diferentes entre execuções repetidas"
+    return record
+
+# =============================================================================
+# CORPORA
+# =============================================================================
+
+def sample_state(dlis_name):
+    """Sigla do estado de um DLIS de exemplo (ex.: 1MR__0001A_PR_... → PR)"""
+    return os.path.splitext(dlis_name)[0].split('_')[-1].upper()
+
+def link_or_copy(source, target):
+    """Link simbólico para source; cópia onde links não são permitidos (Windows)"""
+    try:
+        os.symlink(source, target)
+    except (OSError, NotImplementedError):
+        shutil.copyfile(source, target)
+
+def prepare_sample_dlis(corpus_dir):
+    """DLIS de exemplo organizados em subpastas de estado, como o motor espera"""
+    dlis_dir = os.path.join(corpus_dir, "dlis")
+    reset_dir(dlis_dir)
+    for name in sorted(os.listdir(SAMPLE_DLIS_DIR)):
+        if name.endswith('.dlis'):
+            state_dir = os.path.join(dlis_dir, sample_state(name))
+            os.makedirs(state_dir, exist_ok=True)
+            link_or_copy(os.path.join(SAMPLE_DLIS_DIR, name), os.path.join(state_dir, name))
+    return dlis_dir
+
+def synthetic_dlis(corpus_dir, n_wells):
+    """
+    N poços DLIS: os exemplos reais em rodízio, com nomes novos na regra de SC.
+
+    O conteúdo se repete, mas cada poço é convertido de fato (cache desligado).
+    """
+    dlis_dir = os.path.join(corpus_dir, "dlis")
+    state_dir = os.path.join(dlis_dir, "SC")
+    reset_dir(state_dir)
+    samples = sorted(name for name in os.listdir(SAMPLE_DLIS_DIR) if name.endswith('.dlis'))
+    for i in range(n_wells):
+        name = f"1BM__{i + 1:04d}__SC_1BM__{i + 1:04d}__SC.dlis"
+        link_or_copy(os.path.join(SAMPLE_DLIS_DIR, samples[i % len(samples)]), os.path.join(state_dir, name))
+    return dlis_dir
+
+def known_mnemonics():
+    """Mnemônicos reconhecidos pela padronização (LAS2DF_channels), com repetições _1 a _9"""
+    names = (set(channels.ALIASES) | channels.BASE_MNEMONICS) - {'DEPT', 'MD'}
+    return {f"{name}_{n}" if n else name for name in names for n in range(10)}
+
+def synthetic_mnemonics(rng, mnemonics):
+    """Mnemônicos de um poço sintético, sorteados entre os mnemônicos reconhecidos"""
+    names = sorted(mnemonics)
+    chosen = rng.choice(len(names), size=SYNTHETIC_CURVES, replace=False)
+    return [names[i] for i in sorted(chosen)]
+
+def synthetic_las(corpus_dir, n_wells):
+    """N poços LAS com curvas aleatórias, trechos nulos e profundidade inicial variável"""
+    las_dir = os.path.join(corpus_dir, "las")
+    reset_dir(las_dir)
+    known = known_mnemonics()
+    rng = np.random.default_rng(SYNTHETIC_SEED)
+
+    for i in range(n_wells):
+        start = round(float(rng.integers(0, 500)) * 0.2, 1)
+        depth = np.round(start + 0.2 * np.arange(SYNTHETIC_ROWS), 5)
+        mnemonics = synthetic_mnemonics(rng, known)
+        columns = [depth]
+        for _ in mnemonics:
+            values = np.cumsum(rng.normal(0.0, 1.0, SYNTHETIC_ROWS)) + rng.uniform(10, 200)
+            # Trecho sem registro, como nas passadas que não cobrem o poço todo
+            gap = int(rng.integers(0, SYNTHETIC_ROWS // 4))
+            values[:gap] = np.nan
+            columns.append(values)
+        curves = [('DEPT', 'm', 'DEPTH')] + [(name, '', name) for name in mnemonics]
+        well = {'WELL': f"SYN-{i + 1:05d}", 'FLD': 'SINTETICO', 'COMP': 'BENCHMARK'}
+        write_las(os.path.join(las_dir, f"SYN_{i + 1:05d}.las"), well, curves, columns)
+    return las_dir
+
+AGP_HEADER = """ POCO           :    {well_id}
+
+ IDENTIFICADOR  :    SF22R44NO25H52D                         BACIA         :   PARANA
+ LATITUDE       :   {latitude:.5f} (  -22  46 44.0)              LONGITUDE      :   {longitude:.5f} (  -48  10 54.4)
+ QUADRICULA     :   SF22R4                                  MESA ROTATIVA  :    {mesa:.1f}
+ B.A.P          :   {bap:.1f}                                   P.F.SONDADOR   :   {total:.1f}
+ PROF.MX.PERF.  :   {total:.1f}                                  METROS PERF.   :   {total:.1f}
+
+ LITOLOGIA -
+"""
+
+def synthetic_agp(corpus_dir, n_wells):
+    """N arquivos AGP com cabeçalho e seção de litologia no leiaute da ANP"""
+    agp_dir = os.path.join(corpus_dir, "agp")
+    reset_dir(agp_dir)
+    rng = np.random.default_rng(SYNTHETIC_SEED)
+    lithologies = ['ARENITO', 'SILTITO', 'FOLHELHO', 'BASALTO', 'DIABASIO', 'CALCARIO']
+
+    for i in range(n_wells):
+        bap = float(rng.uniform(300, 900))
+        bases = np.cumsum(rng.uniform(2, 60, SYNTHETIC_LAYERS)).round(1)
+        lines = [AGP_HEADER.format(well_id=f"1SY  {i + 1:04d}  SC", latitude=rng.uniform(-27, -22),
+                                   longitude=rng.uniform(-54, -48), mesa=bap + 4.3, bap=bap,
+                                   total=bases[-1])]
+        top = 0.0
+        for n, base in enumerate(bases):
+            rock = lithologies[int(rng.integers(len(lithologies)))]
+            if n == 0:
+                lines.append(f"   {top:7.1f} ({bap - top:7.1f})   {base:7.1f} ({bap - base:7.1f})  {n + 1:3d} {rock}\n")
+            else:
+                lines.append(f"                      {base:7.1f} ({bap - base:7.1f})  {n + 1:3d} {rock}\n")
+        lines.append("\n RESUMO DAS ROCHAS\n")
+        with open(os.path.join(agp_dir, f"SY_{i + 1:05d}.txt"), 'w', encoding='latin-1') as file_object:
+            file_object.write(''.join(lines))
+    return agp_dir
+
+# =============================================================================
+# CORREÇÃO
+# =============================================================================
+
+def compare_with_reference(las_dir, reference_dir=REFERENCE_LAS_DIR):
+    """
+    Compara numericamente os LAS gerados com os LAS de referência de mesmo nome.
+
+    Os LAS de referência gravam o valor ausente do DLIS (-999.25) como dado;
+    o conversor o troca por nulo, então na referência ele conta como nulo.
+
+    Retorno:
+        list: Um dicionário por referência ('file', 'ok', 'detail')
+    """
+    import lasio
+
+    checks = []
+    for name in sorted(os.listdir(reference_dir)):
+        if not name.lower().endswith('.las'):
+            continue
+        check = {'file': name, 'ok': False, 'detail': ''}
+        checks.append(check)
+        generated_path = os.path.join(las_dir, name)
+        if not os.path.exists(generated_path):
+            check['detail'] = "LAS não gerado"
+            continue
+
+        reference = lasio.read(os.path.join(reference_dir, name))
+        generated = lasio.read(generated_path)
+        if reference.keys() != generated.keys():
+            check['detail'] = f"curvas diferentes: {reference.keys()} x {generated.keys()}"
+            continue
+        if not np.allclose(reference.index, generated.index, rtol=0, atol=EQUIVALENCE_ATOL):
+            check['detail'] = "grid de profundidade diferente"
+            continue
+
+        differing = []
+        for mnemonic in reference.keys()[1:]:
+            expected, actual = reference[mnemonic], generated[mnemonic]
+            expected = np.where(expected == resampling.DLIS_ABSENT_VALUE, np.nan, expected)
+            if not np.array_equal(np.isnan(expected), np.isnan(actual)):
+                differing.append(f"{mnemonic} (nulos)")
+            elif not np.allclose(expected, actual, rtol=EQUIVALENCE_RTOL, atol=EQUIVALENCE_ATOL, equal_nan=True):
+                differing.append(f"{mnemonic} (máx. {np.nanmax(np.abs(expected - actual)):.3g})")
+        check['ok'] = not differing
+        check['detail'] = ', '.join(differing) or f"{len(reference.keys())} curvas, {len(reference.index)} linhas"
+    return checks
+
+def compare_streaming(corpus_dir, dlis_dir, steps=STREAMING_CHECK_STEPS):
+    """
+    Compara o modo streaming com o modo em memória nos DLIS de exemplo.
+
+    O bloco do streaming tem o número de linhas do grid menos uma, de modo
+    que o último bloco tenha uma única linha (o passo do grid não pode ser
+    deduzido do bloco).
+
+    Retorno:
+        list: Um dicionário por DLIS e passo, como em compare_with_reference
+    """
+    import lasio
+
+    checks = []
+    for step in steps:
+        label = f"passo {step} m" if step else "passo nativo"
+        memory_dir = os.path.join(corpus_dir, "streaming_check", f"{step or 'native'}_memory")
+        stream_dir = os.path.join(corpus_dir, "streaming_check", f"{step or 'native'}_stream")
+        reset_dir(memory_dir)
+        reset_dir(stream_dir)
+        for dlis_path in input_files(dlis_dir, '.dlis'):
+            name = os.path.splitext(os.path.basename(dlis_path))[0] + '.las'
+            memory_path = os.path.join(memory_dir, name)
+            with redirect_stdout(io.StringIO()):
+                engine.process_single_dlis(dlis_path, memory_path, depth_step=step, profile_path=None)
+                if not os.path.exists(memory_path):
+                    continue
+                n_rows = len(lasio.read(memory_path).index)
+                engine.process_single_dlis(dlis_path, os.path.join(stream_dir, name), chunk_rows=max(1, n_rows - 1),
+                                           depth_step=step, profile_path=None)
+        checks += [dict(check, file=f"{check['file']} ({label})") for check in compare_with_reference(stream_dir, memory_dir)]
+    return checks
+
+def check_absent_splice():
+    """
+    Emenda de dois frames sobrepostos, o primeiro com a sobreposição em -999.25.
+
+    Com a prioridade 'first' o primeiro frame só pode ficar com as
+    profundidades em que tem medida; o resto do grid é do segundo frame. Vale
+    para a interpolação (mesmo espaçamento do grid), para a redução por blocos
+    (frame mais fino que o grid), para a emenda em sequência (splice_window) e
+    para a emenda por rank da conversão paralela (splice_ranked).
+
+    Retorno:
+        list: Um dicionário por caso, como em compare_with_reference
+    """
+    # O primeiro frame tem medida até 3,7 m: as células do grid a partir de
+    # 4,0 m ([3,75; 4,25) em diante) só têm -999.25 dele
+    grid = np.arange(0.0, 10.0 + 0.5, 0.5)
+    expected = np.where(grid < 3.75, 1.0, 2.0)
+    checks = []
+    for spacing in (0.5, 0.1):
+        first_depth = np.arange(0.0, 6.0 + spacing / 2, spacing)
+        first_values = np.where(first_depth < 3.74, 1.0, resampling.DLIS_ABSENT_VALUE)
+        second_depth = np.arange(3.0, 10.0 + spacing / 2, spacing)
+        frames = [(first_depth, first_values), (second_depth, np.full(len(second_depth), 2.0))]
+        resample = resampling.frame_resampler(grid, spacing, 'mean', engine.MAX_GAP)
+
+        sequential = np.full(len(grid), np.nan)
+        ranked = np.full(len(grid), np.nan)
+        owner = np.full(len(grid), resampling.unowned_rank('first', np.int32), dtype=np.int32)
+        # Em paralelo os frames chegam fora de ordem
+        for rank, (depth, values) in reversed(list(enumerate(frames))):
+            data = resampling.mask_absent(values[:, None].copy())
+            window, resampled = resample(grid, depth, data)
+            resampling.splice_ranked(ranked, owner, window, resampled[:, 0], rank, 'first')
+        for depth, values in frames:
+            data = resampling.mask_absent(values[:, None].copy())
+            window, resampled = resample(grid, depth, data)
+            resampling.splice_window(sequential, window, resampled[:, 0], 'first')
+
+        for name, result in (('em sequência', sequential), ('em paralelo', ranked)):
+            ok = np.allclose(result, expected)
+            checks.append({
+                'file': f"frames com passo {spacing:g} m, emenda {name}",
+                'ok': bool(ok),
+                'detail': "-999.25 descartado" if ok else f"mín. {np.nanmin(result):.6g}, "
+                                                         f"{int(np.sum(~np.isclose(result, expected)))} linhas erradas",
+            })
+    return checks
+
+def compare_with_baseline(records, baseline):
+    """
+    Compara tempos e saídas com um resultado anterior.
+
+    Retorno:
+        list: Um dicionário por etapa presente nos dois resultados, com
+            'speedup' (>1 mais rápido), 'slower' e 'same_output'
+    """
+    previous = {(r['corpus'], r['stage']): r for r in baseline['records'] if r.get('error') is None}
+    comparisons = []
+    for record in records:
+        before = previous.get((record['corpus'], record['stage']))
+        if before is None or record['error'] is not None:
+            continue
+        comparisons.append({
+            'corpus': record['corpus'],
+            'stage': record['stage'],
+            'speedup': before['wall_s'] / record['wall_s'],
+            'slower': record['wall_s'] > before['wall_s'] * (1 + REGRESSION_TOLERANCE),
+            'same_output': record['digest'] == before['digest'],
+        })
+    return comparisons
+
+# =============================================================================
+# EXECUÇÃO
+# =============================================================================
+
+def benchmark_corpus(corpus, corpus_dir, dlis_dir, las_dir, agp_dir):
+    """Mede as etapas selecionadas em um corpus; as etapas LAS/CSV encadeiam as saídas"""
+    inputs = {
+        'dlis2las': dlis_dir,
+        'las_report': las_dir,
+        'las2csv': las_dir,
+        'standardize': os.path.join(corpus_dir, "out_las2csv"),
+        'integrate': os.path.join(corpus_dir, "out_standardize"),
+        'agp': agp_dir,
+    }
+    records = []
+    for stage in STAGES:
+        if inputs[stage] is None:
+            continue
+        print(f"  • {stage} ...", end=' ', flush=True)
+        record = measure_stage(stage, inputs[stage], os.path.join(corpus_dir, f"out_{stage}"))
+        record['corpus'] = corpus
+        records.append(record)
+        print(record['error'] or f"{record['wall_s']:.2f} s")
+    return records
+
+def print_records(records):
+    """Tabela com o resultado de cada etapa"""
+    print(f"\n{'corpus':<12} {'etapa':<12} {'arquivos':>8} {'MB':>9} {'tempo s':>9} "
+          f"{'arq/s':>9} {'MB/s':>8} {'RSS MB':>8}")
+    for r in records:
+        if r['error'] is not None:
+            print(f"{r['corpus']:<12} {r['stage']:<12} ❌ {r['error']}")
+            continue
+        rss = f"{r['max_rss_mb']:.0f}" if r['max_rss_mb'] is not None else '-'
+        print(f"{r['corpus']:<12} {r['stage']:<12} {r['files']:>8} {r['mb']:>9.1f} {r['wall_s']:>9.2f} "
+              f"{r['files_per_s']:>9.1f} {r['mb_per_s']:>8.2f} {rss:>8}")
+
+def run_benchmark(work_dir=WORK_DIR, corpus_sizes=CORPUS_SIZES, baseline_path=BASELINE_PATH,
+                  results_path=RESULTS_PATH):
+    """
+    Executa o benchmark completo e grava o resultado em JSON.
+
+    Parâmetros:
+        work_dir (str): Pasta dos corpora gerados e das saídas
+        corpus_sizes (list): Número de poços de cada corpus sintético
+        baseline_path (str): Resultado anterior para comparação; None não compara
+        results_path (str): Arquivo JSON do resultado desta execução
+
+    Retorno:
+        bool: True se todas as verificações passaram
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    records = []
+
+    print("\n▶ Corpus samples (DLIS reais)")
+    corpus_dir = os.path.join(work_dir, "samples")
+    dlis_dir = prepare_sample_dlis(corpus_dir)
+    las_dir = os.path.join(corpus_dir, "out_dlis2las")
+    if 'dlis2las' not in STAGES:
+        # As etapas LAS ainda precisam dos LAS convertidos, mesmo sem medir o dlis2las
+        with redirect_stdout(io.StringIO()):
+            stage_dlis2las(dlis_dir, las_dir)
+    records += benchmark_corpus('samples', corpus_dir, dlis_dir, las_dir, None)
+    reference_checks = compare_with_reference(las_dir)
+    streaming_checks = compare_streaming(corpus_dir, dlis_dir)
+    absent_checks = check_absent_splice()
+
+    for n_wells in corpus_sizes:
+        corpus = f"wells_{n_wells}"
+        print(f"\n▶ Corpus {corpus} (gerando {n_wells} poços sintéticos)")
+        corpus_dir = os.path.join(work_dir, corpus)
+        records += benchmark_corpus(corpus, corpus_dir, synthetic_dlis(corpus_dir, n_wells),
+                                    synthetic_las(corpus_dir, n_wells), synthetic_agp(corpus_dir, n_wells))
+
+    print_records(records)
+
+    print("\nEQUIVALÊNCIA COM OS LAS DE REFERÊNCIA")
+    for check in reference_checks:
+        print(f"{'✅' if check['ok'] else '❌'} {check['file']}: {check['detail']}")
+
+    print("\nSTREAMING × EM MEMÓRIA (último bloco com uma linha)")
+    for check in streaming_checks:
+        print(f"{'✅' if check['ok'] else '❌'} {check['file']}: {check['detail']}")
+
+    print("\nVALORES AUSENTES NA EMENDA (-999.25)")
+    for check in absent_checks:
+        print(f"{'✅' if check['ok'] else '❌'} {check['file']}: {check['detail']}")
+
+    comparisons = []
+    if baseline_path:
+        with open(baseline_path, 'r', encoding='utf-8') as file_object:
+            comparisons = compare_with_baseline(records, json.load(file_object))
+        print(f"\nCOMPARAÇÃO COM {baseline_path}")
+        for c in comparisons:
+            status = '❌ mais lento' if c['slower'] else '✅'
+            output = 'mesmas saídas' if c['same_output'] else '❌ saídas diferentes'
+            print(f"{status} {c['corpus']:<12} {c['stage']:<12} {c['speedup']:.2f}x, {output}")
+
+    with open(results_path, 'w', encoding='utf-8') as file_object:
+        json.dump({
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'config': {'repeats': REPEATS, 'n_workers': N_WORKERS, 'synthetic_rows': SYNTHETIC_ROWS,
+                       'synthetic_curves': SYNTHETIC_CURVES, 'corpus_sizes': list(corpus_sizes)},
+            'records': records,
+            'reference_checks': reference_checks,
+            'streaming_checks': streaming_checks,
+            'absent_checks': absent_checks,
+            'baseline': comparisons,
+        }, file_object, indent=1, ensure_ascii=False)
+    print(f"\nResultado salvo em: {results_path}")
+
+    return (all(r['error'] is None for r in records)
+            and all(check['ok'] for check in reference_checks)
+            and all(check['ok'] for check in streaming_checks)
+            and all(check['ok'] for check in absent_checks)
+            and all(c['same_output'] and not c['slower'] for c in comparisons))
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("BENCHMARK DO PIPELINE DE PERFIS DE POÇO")
+    print("=" * 60)
+
+    sys.exit(0 if run_benchmark() else 1)